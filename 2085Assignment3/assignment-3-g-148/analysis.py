@@ -1,214 +1,193 @@
-""" File to aid the analysis of hash tables"""
-
+""" File to aid the analysis of hash tables
+
+Runs every combination of dataset, probing strategy, table size and hash base from a grid in parallel,
+one table per configuration. Every strategy hashes with the same polynomial hash of the given base: linear
+probing uses table_analysis.LinearProbeTable and the others the tables of probe_tables. Results are printed
+as soon as each configuration finishes, and the full report (statistics, wall-clock time and peak memory)
+is written to a CSV or JSON file.
+
+Usage:
+    python analysis.py --output report.csv
+    python analysis.py --datasets indian australian --sizes 20021 --bases 9929 250726 --output report.json
+    python analysis.py --tables linear quadratic double cuckoo --sizes 20021 --bases 9929 --output strategies.csv
+"""
+
+from __future__ import annotations
+
+import argparse
+import csv
+import json
+import os
+import time
+import tracemalloc
+from concurrent.futures import ProcessPoolExecutor, as_completed
+from functools import lru_cache
+from typing import Iterator
+
+from hash_functions import PolynomialHash
+from probe_tables import QuadraticProbeTable, DoubleHashTable, CuckooTable
 from table_analysis import LinearProbeTable
 
-table_sizes = [20021, 402221, 1000081]
-hash_bases = [1, 9929, 250726]
-my_table = LinearProbeTable(1000)
-
-indian_cities_file = open("indian_cities.txt", "r")
-australian_cities_file = open("aust_cities.txt", "r")
-us_cities_file = open("us_cities.txt", "r")
-
-indian_cities = []
-australian_cities = []
-us_cities = []
-
-for line in indian_cities_file:
-  city = line.strip()
-  indian_cities.append(city)
-
-for line in australian_cities_file:
-  city = line.strip()
-  australian_cities.append(city)
-
-for line in us_cities_file:
-  city = line.strip()
-  us_cities.append(city)
-
-indian_cities_file.close()
-australian_cities_file.close()
-us_cities_file.close()
-
-
-# __INDIAN CITIES__
-
-# table_size = 20021, base = 1
-table1 = LinearProbeTable(20021)
-table1.base = 1
-
-# table_size = 402221, base = 1
-table2 = LinearProbeTable(402221)
-table2.base = 1
-
-# table_size = 1000081, base = 1
-table3 = LinearProbeTable(1000081)
-table3.base = 1
-
-# table_size = 20021, base = 9929
-table4 = LinearProbeTable(20021)
-table4.base = 9929
-
-# table_size = 402221, base = 9929
-table5 = LinearProbeTable(402221)
-table5.base = 9929
-
-# table_size = 1000081, base = 9929
-table6 = LinearProbeTable(1000081)
-table6.base = 9929
-
-# table_size = 20021, base = 250726
-table7 = LinearProbeTable(20021)
-table7.base = 250726
-
-# table_size = 402221, base = 250726
-table8 = LinearProbeTable(402221)
-table8.base = 250726
-
-# table_size = 1000081, base = 250726
-table9 = LinearProbeTable(1000081)
-table9.base = 250726
-
-# __AUSTRALIAN CITIES__
-
-# table_size = 20021, base = 1
-table10 = LinearProbeTable(20021)
-table10.base = 1
-
-# table_size = 402221, base = 1
-table11 = LinearProbeTable(402221)
-table11.base = 1
-
-# table_size = 1000081, base = 1
-table12 = LinearProbeTable(1000081)
-table12.base = 1
-
-# table_size = 20021, base = 9929
-table13 = LinearProbeTable(20021)
-table13.base = 9929
-
-# table_size = 402221, base = 9929
-table14 = LinearProbeTable(402221)
-table14.base = 9929
-
-# table_size = 1000081, base = 9929
-table15 = LinearProbeTable(1000081)
-table15.base = 9929
-
-# table_size = 20021, base = 250726
-table16 = LinearProbeTable(20021)
-table16.base = 250726
-
-# table_size = 402221, base = 250726
-table17 = LinearProbeTable(402221)
-table17.base = 250726
-
-# table_size = 1000081, base = 250726
-table18 = LinearProbeTable(1000081)
-table18.base = 250726
-
-# __US CITIES__
-# table_size = 20021, base = 1
-table19 = LinearProbeTable(20021)
-table19.base = 1
-
-# table_size = 402221, base = 1
-table20 = LinearProbeTable(402221)
-table20.base = 1
-
-# table_size = 1000081, base = 1
-table21 = LinearProbeTable(1000081)
-table21.base = 1
-
-# table_size = 20021, base = 9929
-table22 = LinearProbeTable(20021)
-table22.base = 9929
-
-# table_size = 402221, base = 9929
-table23 = LinearProbeTable(402221)
-table23.base = 9929
-
-# table_size = 1000081, base = 9929
-table24 = LinearProbeTable(1000081)
-table24.base = 9929
-
-# table_size = 20021, base = 250726
-table25 = LinearProbeTable(20021)
-table25.base = 250726
-
-# table_size = 402221, base = 250726
-table26 = LinearProbeTable(402221)
-table26.base = 250726
-
-# table_size = 1000081, base = 250726
-table27 = LinearProbeTable(1000081)
-table27.base = 250726
-
-# insert Indian cities into the hashtables
-for city in indian_cities:
-    table1[city] = city # treating city name (data) as key an value
-    table2[city] = city
-    table3[city] = city
-    table4[city] = city
-    table5[city] = city
-    table6[city] = city
-    table7[city] = city
-    table8[city] = city
-    table9[city] = city
-
-# insert Australian cities into the hashtables
-for city in australian_cities:
-    table10[city] = city
-    table11[city] = city
-    table12[city] = city
-    table13[city] = city
-    table14[city] = city
-    table15[city] = city
-    table16[city] = city
-    table17[city] = city
-    table18[city] = city
-
-# insert US cities into the hashtables
-for city in us_cities:
-    table19[city] = city
-    table20[city] = city
-    table21[city] = city
-    table22[city] = city
-    table23[city] = city
-    table24[city] = city
-    table25[city] = city
-    table26[city] = city
-    table27[city] = city
-
-# __INDIAN CITIES__
-print(table1.statistics())
-print(table2.statistics())
-print(table3.statistics())
-print(table4.statistics())
-print(table5.statistics())
-print(table6.statistics())
-print(table7.statistics())
-print(table8.statistics())
-print(table9.statistics())
-
-# __AUSTRALIAN CITIES__
-print(table10.statistics())
-print(table11.statistics())
-print(table12.statistics())
-print(table13.statistics())
-print(table14.statistics())
-print(table15.statistics())
-print(table16.statistics())
-print(table17.statistics())
-print(table18.statistics())
-
-# __US CITIES__
-print(table19.statistics())
-print(table20.statistics())
-print(table21.statistics())
-print(table22.statistics())
-print(table23.statistics())
-print(table24.statistics())
-print(table25.statistics())
-print(table26.statistics())
-print(table27.statistics())
+__author__ = 'Tan Jun Yu'
+__docformat__ = 'reStructuredText'
+
+DATASETS = {
+    "indian": "indian_cities.txt",
+    "australian": "aust_cities.txt",
+    "us": "us_cities.txt",
+}
+TABLE_SIZES = [20021, 402221, 1000081]
+HASH_BASES = [1, 9929, 250726]
+TABLES = {
+    "linear": LinearProbeTable,
+    "quadratic": QuadraticProbeTable,
+    "double": DoubleHashTable,
+    "cuckoo": CuckooTable,
+}
+
+REPORT_FIELDS = ["dataset", "table", "table_size", "base", "keys", "conflict", "total_distance_probed",
+                 "length_longest_probe", "rehashing_count", "seconds", "peak_memory_bytes"]
+
+
+@lru_cache(maxsize=None)
+def load_dataset(filename: str) -> tuple[str, ...]:
+    """
+    Read one city per line from a file next to this module. Cached so each worker process reads
+    every dataset at most once.
+    :param filename: the name of the dataset file
+    :complexity: O(N) where N is the size of the file
+    """
+    with open(os.path.join(os.path.dirname(os.path.abspath(__file__)), filename), "r") as cities_file:
+        return tuple(line.strip() for line in cities_file)
+
+
+def analysis_grid(datasets: list[str], table_sizes: list[int], hash_bases: list[int],
+                  tables: list[str] = ("linear",)) -> list[tuple[str, str, int, int]]:
+    """
+    Returns every (dataset, table, table_size, base) configuration of the grid
+    :complexity: O(D * T * S * B)
+    """
+    return [(dataset, table, table_size, base) for dataset in datasets for table in tables
+            for table_size in table_sizes for base in hash_bases]
+
+
+def make_table(table: str, table_size: int, base: int):
+    """
+    Create an empty table of the given strategy hashing with the polynomial hash of the given base
+    :param table: a key of TABLES
+    :complexity: O(table_size)
+    """
+    if table == "linear":
+        hash_table = LinearProbeTable(table_size)
+        hash_table.base = base
+        return hash_table
+    return TABLES[table](table_size, hash_function=PolynomialHash(base))
+
+
+def run_configuration(dataset: str, table: str, table_size: int, base: int, measure_memory: bool = True) -> dict:
+    """
+    Insert every city of the dataset into a fresh table, treating city name (data) as key an value.
+    The parameters come in the order of the configurations of analysis_grid.
+    :param dataset: a key of DATASETS
+    :param table: a key of TABLES
+    :param table_size: the expected size of the table
+    :param base: the base used by the hash function
+    :param measure_memory: track the peak memory allocated while building the table with tracemalloc,
+                           this slows the run down so the time includes that overhead
+    :returns: one row of the report
+    :complexity: O(N * (L + P)) where N is the number of cities, L the length of the longest city and P the probe length
+    """
+    cities = load_dataset(DATASETS[dataset])
+
+    if measure_memory:
+        tracemalloc.start()
+    start = time.perf_counter()
+
+    hash_table = make_table(table, table_size, base)
+    hash_table.bulk_insert(cities, cities)
+
+    seconds = time.perf_counter() - start
+    peak_memory = None
+    if measure_memory:
+        peak_memory = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+    conflict, total_distance_probed, length_longest_probe, rehashing_count = hash_table.statistics()
+    return {
+        "dataset": dataset,
+        "table": table,
+        "table_size": table_size,
+        "base": base,
+        "keys": len(hash_table),
+        "conflict": conflict,
+        "total_distance_probed": total_distance_probed,
+        "length_longest_probe": length_longest_probe,
+        "rehashing_count": rehashing_count,
+        "seconds": seconds,
+        "peak_memory_bytes": peak_memory,
+    }
+
+
+def run_analysis(configurations: list[tuple[str, str, int, int]], workers: int = None, measure_memory: bool = True) -> Iterator[dict]:
+    """
+    Run every configuration across a pool of processes, yielding each row as soon as it finishes.
+    :param configurations: the (dataset, table, table_size, base) configurations to run
+    :param workers: number of worker processes, defaults to the number of CPUs
+    :param measure_memory: see run_configuration
+    :complexity: O(C * run_configuration) spread over the workers, where C is the number of configurations
+    """
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = [executor.submit(run_configuration, dataset=dataset, table=table, table_size=table_size, base=base,
+                                   measure_memory=measure_memory)
+                   for dataset, table, table_size, base in configurations]
+        for future in as_completed(futures):
+            yield future.result()
+
+
+def write_report(rows: list[dict], path: str) -> None:
+    """
+    Write the rows sorted by configuration to a JSON file if path ends with .json, otherwise to a CSV file
+    :complexity: O(R log R) where R is the number of rows
+    """
+    dataset_order = list(DATASETS)
+    table_order = list(TABLES)
+    rows = sorted(rows, key=lambda row: (dataset_order.index(row["dataset"]), table_order.index(row["table"]),
+                                         row["table_size"], row["base"]))
+
+    if path.endswith(".json"):
+        with open(path, "w") as report_file:
+            json.dump(rows, report_file, indent=2)
+    else:
+        with open(path, "w", newline="") as report_file:
+            writer = csv.DictWriter(report_file, fieldnames=REPORT_FIELDS)
+            writer.writeheader()
+            writer.writerows(rows)
+
+
+def main() -> None:
+    """ Parse the grid from the command line, run it and write the report. """
+    parser = argparse.ArgumentParser(description="Hash table analysis over a grid of datasets, probing strategies, table sizes and bases.")
+    parser.add_argument("--datasets", nargs="+", choices=list(DATASETS), default=list(DATASETS))
+    parser.add_argument("--tables", nargs="+", choices=list(TABLES), default=["linear"])
+    parser.add_argument("--sizes", nargs="+", type=int, default=TABLE_SIZES)
+    parser.add_argument("--bases", nargs="+", type=int, default=HASH_BASES)
+    parser.add_argument("--workers", type=int, default=None, help="number of worker processes (default: number of CPUs)")
+    parser.add_argument("--output", default="analysis_report.csv", help="report file, .json for JSON and CSV otherwise")
+    parser.add_argument("--no-memory", action="store_true", help="do not track peak memory (faster, more accurate times)")
+    args = parser.parse_args()
+
+    rows = []
+    configurations = analysis_grid(args.datasets, args.sizes, args.bases, args.tables)
+    for row in run_analysis(configurations, args.workers, not args.no_memory):
+        rows.append(row)
+        print("{0:>10} {1:<9} size={2:<8} base={3:<7} {4} {5:.3f}s".format(
+            row["dataset"], row["table"], row["table_size"], row["base"],
+            (row["conflict"], row["total_distance_probed"], row["length_longest_probe"], row["rehashing_count"]),
+            row["seconds"]), flush=True)
+
+    write_report(rows, args.output)
+    print("Report written to {0}".format(args.output))
+
+
+if __name__ == "__main__":
+    main()
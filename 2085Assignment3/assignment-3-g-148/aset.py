@@ -3,6 +3,7 @@
 """
 
 from __future__ import annotations
+from typing import Iterator
 from set import *
 from referential_array import ArrayR
 
@@ -34,10 +35,12 @@ class ASet(Set[T]):
 
     def __contains__(self, item: T) -> bool:
         """ True if the set contains the item. """
-        for i in range(self.size):
-            if item == self.array[i]:
-                return True
-        return False
+        return item in self.array[:self.size]
+
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the elements of the set, in the order they were added
+        unless some were removed. """
+        return iter(self.array[:self.size])
 
     def clear(self) -> None:
         """ Makes the set empty. """
@@ -64,22 +67,23 @@ class ASet(Set[T]):
         :pre: the element should be present in the set
         :raises KeyError: if no such element is found.
         """
-        for i in range(self.size):
-            if item == self.array[i]:
-                self.array[i] = self.array[self.size - 1]
-                self.size -= 1
-                break
-        else:
+        try:
+            i = self.array[:self.size].index(item)
+        except ValueError:
             raise KeyError(item)
+        self.array[i] = self.array[self.size - 1]
+        self.size -= 1
 
     def union(self, other: ASet[T]) -> ASet[T]:
         """ Creates a new set equal to the union with another one,
         i.e. the result set should contains the elements of self and other.
         """
         res = ASet(len(self.array) + len(other.array))
-        for the_set in [self, other]:
-            for i in range(len(the_set)):
-                res.add(the_set.array[i])
+        # the elements of self are distinct, so they are copied without checking for duplicates
+        res.array.copy_from(self.array, 0, 0, self.size)
+        res.size = self.size
+        for item in other.array[:other.size]:
+            res.add(item)
         return res
 
     def intersection(self, other: ASet[T]) -> ASet[T]:
@@ -88,9 +92,9 @@ class ASet(Set[T]):
         self *and* other.
         """
         res = ASet(min(len(self), len(other)))
-        for i in range(len(self)):
-            if self.array[i] in other:
-                res.add(self.array[i])
+        for item in self.array[:self.size]:
+            if item in other:
+                res.add(item)
         return res
 
     def difference(self, other: ASet[T]) -> ASet[T]:
@@ -99,16 +103,16 @@ class ASet(Set[T]):
         *are not* in other.
         """
         res = ASet(len(self))
-        for i in range(len(self)):
-            if self.array[i] not in other:
-                res.add(self.array[i])
+        for item in self.array[:self.size]:
+            if item not in other:
+                res.add(item)
         return res
 
     def __str__(self):
         """ Magic method constructing a string representation of the list object. """
         elems = []
-        for i in range(len(self)):
-            elems.append(str(self.array[i]) if type(self.array[i]) != str else "'{0}'".format(self.array[i]))
+        for item in self.array[:self.size]:
+            elems.append(str(item) if type(item) != str else "'{0}'".format(item))
         return '{' + ', '.join(elems) + '}'
     
 if __name__ == '__main__':
@@ -1,11 +1,13 @@
 """ AVL Tree implemented on top of the standard BST. """
+from __future__ import annotations
 
 __author__ = 'Alexey Ignatiev, with edits by Jackson Goerner and Shyam Kamalesh Borkar'
 __docformat__ = 'reStructuredText'
 
 from bst import BinarySearchTree
-from typing import TypeVar, Generic, List
+from typing import TypeVar, Generic, Iterable, Iterator, List
 from node import AVLTreeNode
+import random
 
 K = TypeVar('K')
 I = TypeVar('I')
@@ -16,13 +18,89 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         rotations of Adelson-Velsky and Landis (AVL).
     """
 
-    def __init__(self) -> None:
+    def __init__(self, multimap: bool = False) -> None:
         """
             Initialises an empty Binary Search Tree
+            :param multimap: see BinarySearchTree.__init__
             :complexity: O(1)
         """
 
-        BinarySearchTree.__init__(self)
+        BinarySearchTree.__init__(self, multimap)
+
+    @classmethod
+    def from_sorted(cls, items: Iterable[tuple[K, I]], multimap: bool = False) -> AVLTree[K, I]:
+        """
+            Builds a perfectly balanced tree from (key, item) pairs sorted by key, without any rotation:
+            the middle pair becomes the root and each half builds a sub-tree the same way.
+            :param multimap: see BinarySearchTree.__init__, pairs with equal keys keep their order
+            :raises ValueError: when the keys are not sorted, or not distinct unless multimap is True
+            :complexity: Best and worst case complexity is O(n) where n is the number of pairs
+        """
+        items = list(items)
+        for index in range(1, len(items)):
+            if items[index][0] < items[index - 1][0] or (not multimap and not items[index - 1][0] < items[index][0]):
+                raise ValueError('Keys must be sorted and distinct: {0} before {1}'.format(items[index - 1][0], items[index][0]))
+
+        tree = cls(multimap)
+        tree.root = tree.build_balanced(items, 0, len(items))
+        tree.length = len(items)
+        return tree
+
+    @classmethod
+    def from_unsorted(cls, items: Iterable[tuple[K, I]], multimap: bool = False) -> AVLTree[K, I]:
+        """
+            Builds a perfectly balanced tree from (key, item) pairs in any order, see from_sorted.
+            The sort is stable, so pairs with equal keys keep their order in a multimap.
+            :raises ValueError: when the keys are not distinct, unless multimap is True
+            :complexity: Best and worst case complexity is O(n*log(n)) for the sort where n is the number of pairs
+        """
+        return cls.from_sorted(sorted(items, key=lambda pair: pair[0]), multimap)
+
+    def build_balanced(self, items: List[tuple[K, I]], lo: int, hi: int) -> AVLTreeNode:
+        """
+            Builds the balanced sub-tree of the pairs items[lo:hi] and returns its root.
+            The recursion is only O(log(n)) deep.
+            :complexity: Best and worst case complexity is O(hi - lo)
+        """
+        if lo >= hi:
+            return None
+
+        mid = (lo + hi) // 2
+        current = self.create_node(items[mid][0], items[mid][1])
+        current.left = self.build_balanced(items, lo, mid)
+        current.right = self.build_balanced(items, mid + 1, hi)
+        current.height = max(self.get_height(current.left), self.get_height(current.right)) + 1
+        current.size = hi - lo
+        return current
+
+    def merge(self, other: AVLTree[K, I]) -> AVLTree[K, I]:
+        """
+            Returns a new balanced tree holding the pairs of both trees, merging their in-order walks.
+            Neither tree is modified. The result is a multimap if self is, and then the pairs of self
+            come before the pairs of other with an equal key.
+            :raises ValueError: when both trees have the same key, unless self is a multimap
+            :complexity: Best and worst case complexity is O(n + m) where n and m are the sizes of the trees
+        """
+        merged = []
+        mine = self.nodes_in_order(self.root)
+        theirs = other.nodes_in_order(other.root)
+        current, other_current = next(mine, None), next(theirs, None)
+        while current is not None and other_current is not None:
+            if current.key < other_current.key or (self.multimap and current.key == other_current.key):
+                merged.append((current.key, current.item))
+                current = next(mine, None)
+            elif other_current.key < current.key:
+                merged.append((other_current.key, other_current.item))
+                other_current = next(theirs, None)
+            else:
+                raise ValueError('Merging duplicate key: {0}'.format(current.key))
+
+        for remaining, nodes in ((current, mine), (other_current, theirs)):
+            while remaining is not None:
+                merged.append((remaining.key, remaining.item))
+                remaining = next(nodes, None)
+
+        return type(self).from_sorted(merged, self.multimap)
 
     def get_height(self, current: AVLTreeNode) -> int:
         """
@@ -35,6 +113,17 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             return current.height
         return 0
 
+    def get_size(self, current: AVLTreeNode) -> int:
+        """
+            Get the number of nodes in the sub-tree of a node. Return current.size if current is
+            not None. Otherwise, return 0.
+            :complexity: O(1)
+        """
+
+        if current is not None:
+            return current.size
+        return 0
+
     def get_balance(self, current: AVLTreeNode) -> int:
         """
             Compute the balance factor for the current sub-tree as the value
@@ -46,72 +135,47 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
             return 0
         return self.get_height(current.right) - self.get_height(current.left)
 
-    def insert_aux(self, current: AVLTreeNode, key: K, item: I) -> AVLTreeNode:
+    def create_node(self, key: K, item: I) -> AVLTreeNode:
         """
-            Attempts to insert an item into the AVL tree, it uses the Key to insert it. Rebalancing is done after
-            :param current: the current node in the avl tree
-            :param key: node with key to be inserted
-            :param key: node with item to be inserted
-            :complexity: Best and worst case complexity is O(log(n))
-            where n is the number of trees in the node
+            Creates the node of a newly inserted key
+            :complexity: O(1)
         """
-        if current is None:  # base case: at the leaf
-            current = AVLTreeNode(key, item)
-            self.length += 1
-        elif key < current.key:
-            current.left = self.insert_aux(current.left, key, item)
-        elif key > current.key:
-            current.right = self.insert_aux(current.right, key, item)
-        else:  # key == current.key
-            raise ValueError('Inserting duplicate item')
-
-        current = self.rebalance(current)
+        return AVLTreeNode(key, item)
 
-        # update the height of current
-        current.height = max(self.get_height(current.left), self.get_height(current.right)) + 1
-
-        return current
-
-    def delete_aux(self, current: AVLTreeNode, key: K) -> AVLTreeNode:
-        """
-            Attempts to delete an item from the tree, it uses the Key to
-            determine the node to delete.
-            :param current: the current node in the avl tree
-            :param key: node with key to be deleted
-            :complexity: Best and worst case complexity is O(log(n))
-            where n is the number of trees in the node
-        """
-
-        if current is None:  # key not found
-            raise ValueError('Deleting non-existent item')
-        elif key < current.key:
-            current.left  = self.delete_aux(current.left, key)
-        elif key > current.key:
-            current.right = self.delete_aux(current.right, key)
-        else:  # we found our key => do actual deletion
-            if self.is_leaf(current):
-                self.length -= 1
-                return None
-            elif current.left is None:
-                self.length -= 1
-                return current.right
-            elif current.right is None:
-                self.length -= 1
-                return current.left
-
-            # general case => find a successor
-            succ = self.get_successor(current)
-            current.key  = succ.key
-            current.item = succ.item
-            current.right = self.delete_aux(current.right, succ.key)
-
-        
-        current = self.rebalance(current)
-
-        # update the height of current
-        current.height = max(self.get_height(current.left), self.get_height(current.right)) + 1
-
-        return current
+    def retrace(self, path: List[AVLTreeNode]) -> AVLTreeNode:
+        """
+            Walks back up the path of an insertion or deletion (see BinarySearchTree.insert_aux and delete_aux),
+            rebalancing and updating the height and size of every node. Once a node is not rotated and
+            keeps its height nothing above it needs rebalancing, so only the sizes are updated from there.
+            :param path: the nodes from the root of the sub-tree down to the parent of the change
+            :returns: the new root of the sub-tree
+            :complexity: Best and worst case complexity is O(log(n)) where n is the number of nodes in the tree
+        """
+        balanced = False
+        for index in range(len(path) - 1, -1, -1):
+            current = path[index]
+            current.size = self.get_size(current.left) + self.get_size(current.right) + 1
+            if balanced:
+                continue
+
+            old_height = current.height
+            new_root = self.rebalance(current)
+
+            # update the height of the root of the sub-tree
+            new_root.height = max(self.get_height(new_root.left), self.get_height(new_root.right)) + 1
+
+            if new_root is not current:
+                path[index] = new_root
+                if index > 0:  # link the rotated sub-tree to its parent
+                    parent = path[index - 1]
+                    if parent.left is current:
+                        parent.left = new_root
+                    else:
+                        parent.right = new_root
+            elif new_root.height == old_height:
+                balanced = True
+
+        return path[0]
 
     def left_rotate(self, current: AVLTreeNode) -> AVLTreeNode:
         """
@@ -134,8 +198,12 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         current.right = new_root.left
         new_root.left = current
         
-        new_root.height = max(self.get_height(new_root.right), self.get_height(new_root.left)) + 1
         current.height = max(self.get_height(current.right), self.get_height(current.left)) + 1
+        new_root.height = max(self.get_height(new_root.right), self.get_height(new_root.left)) + 1
+
+        # the sub-tree keeps its nodes, current loses new_root and its right sub-tree
+        new_root.size = current.size
+        current.size = self.get_size(current.left) + self.get_size(current.right) + 1
 
 
         return new_root
@@ -161,8 +229,12 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
         current.left = new_root.right
         new_root.right = current
         
-        new_root.height = max(self.get_height(new_root.right), self.get_height(new_root.left)) + 1
         current.height = max(self.get_height(current.right), self.get_height(current.left)) + 1
+        new_root.height = max(self.get_height(new_root.right), self.get_height(new_root.left)) + 1
+
+        # the sub-tree keeps its nodes, current loses new_root and its left sub-tree
+        new_root.size = current.size
+        current.size = self.get_size(current.left) + self.get_size(current.right) + 1
 
         return new_root
 
@@ -192,36 +264,139 @@ class AVLTree(BinarySearchTree, Generic[K, I]):
 
         return current
 
-    def range_between(self, i: int, j: int) -> List:
+    def select(self, k: int) -> I:
         """
-        Returns a sorted list of all elements in the tree between the ith and jth indices, inclusive.
-        :complexity: Best and worst is O(n) where n is the number of nodes in the avl tree
+        Returns the item with the kth smallest key (from 0), walking down by the sizes of the left sub-trees.
+        :raises IndexError: when k is not between 0 and len(self) - 1
+        :complexity: Best and worst is O(log(n)) where n is the number of nodes in the avl tree
+        """
+        if not 0 <= k < self.length:
+            raise IndexError('Index out of range: {0}'.format(k))
+
+        current = self.root
+        while True:
+            left_size = self.get_size(current.left)
+            if k < left_size:
+                current = current.left
+            elif k > left_size:
+                k -= left_size + 1
+                current = current.right
+            else:
+                return current.item
+
+    def delete_at(self, k: int) -> AVLTreeNode:
         """
+        Deletes the node with the kth smallest key (from 0), walking down by the sizes of the left sub-trees.
+        :returns: the deleted node, detached from the tree
+        :raises IndexError: when k is not between 0 and len(self) - 1
+        :complexity: Best and worst is O(log(n)) where n is the number of nodes in the avl tree
+        """
+        if not 0 <= k < self.length:
+            raise IndexError('Index out of range: {0}'.format(k))
+
+        path = []
+        current = self.root
+        while True:
+            left_size = self.get_size(current.left)
+            if k == left_size:
+                break
+            path.append(current)
+            if k < left_size:
+                current = current.left
+            else:
+                k -= left_size + 1
+                current = current.right
+
+        # remove_node may move the successor's key and item into current, so return a copy of the pair
+        deleted = AVLTreeNode(current.key, current.item)
+        self.root = self.remove_node(path, current)
+        return deleted
+
+    def get_all(self, key: K) -> Iterator[I]:
+        """
+        Yields the items of every node with the given key, in insertion order for a multimap
+        :complexity: Best and worst is O(log(n) + k) where k is the number of items with the key
+        """
+        return self.items_between(key, key)
 
-        sorted_list = self.in_order(self.root)
-        return sorted_list[i:j + 1]
+    def remove_item(self, key: K, item: I) -> None:
+        """
+        Deletes the node holding key and item, which in a multimap may share its key with other nodes.
+        :raises ValueError: when no node holds both
+        :complexity: Best and worst is O(log(n) + k) where k is the number of nodes with the key
+        """
+        first = self.rank(key)
+        for offset, current_item in enumerate(self.get_all(key)):
+            if current_item == item:
+                self.delete_at(first + offset)
+                return
+        raise ValueError('Deleting non-existent item')
+
+    def rank(self, key: K) -> int:
+        """
+        Returns the number of keys in the tree smaller than key, i.e. the index key has or would have
+        in the sorted order. key does not have to be in the tree.
+        :complexity: Best and worst is O(log(n)) where n is the number of nodes in the avl tree
+        """
+        result = 0
+        current = self.root
+        while current is not None:
+            if key <= current.key:
+                current = current.left
+            else:
+                result += self.get_size(current.left) + 1
+                current = current.right
+        return result
+
+    def random_element(self, generator=random) -> I:
+        """
+        Returns the item of a uniformly random node.
+        :param generator: source of the random index, anything with a randint(lo, hi) method including both ends,
+                          e.g. the random module or RandomGen
+        :raises IndexError: when the tree is empty
+        :complexity: Best and worst is O(log(n)) where n is the number of nodes in the avl tree
+        """
+        if self.length == 0:
+            raise IndexError('Cannot choose from an empty tree')
+        return self.select(generator.randint(0, self.length - 1))
 
-    def in_order(self, current: AVLTreeNode) -> List:
-        """ Recursive method to traverse with inorder through the avl tree
-        :param current: the current node of the avl tree
-        :returns: a sorted list of all the items of the tree (sorted based on key values)
-        :complexity: Best and worst is O(n) where n is the number of nodes in the avl tree
+    def range_between(self, i: int, j: int) -> Iterator[I]:
+        """
+        Yields the items between the ith and jth indices (from 0) of the sorted order, inclusive.
+        The walk down to the ith node keeps the nodes whose left sub-tree it enters on a stack,
+        and the in-order walk carries on from that stack, so nothing before the ith node is visited.
+        :pre: 0 <= i
+        :complexity: Best and worst is O(log(n) + k) where n is the number of nodes in the avl tree
+                     and k is the number of items yielded
         """
-        sorted_list = []
-        self.in_order_aux(current, sorted_list)
-        return sorted_list
-    
-    def in_order_aux(self, current: AVLTreeNode, sorted_list: List) -> List:
-        """ Auxilliary Method to traverse with inorder through the avl tree
+        remaining = min(j, self.length - 1) - i + 1
+        stack = []
+        current = self.root
+        while remaining > 0 and current is not None:
+            left_size = self.get_size(current.left)
+            if i < left_size:
+                stack.append(current)
+                current = current.left
+            elif i > left_size:
+                i -= left_size + 1
+                current = current.right
+            else:
+                stack.append(current)
+                break
+
+        while remaining > 0 and len(stack) > 0:
+            current = stack.pop()
+            yield current.item
+            remaining -= 1
+            current = current.right
+            while current is not None:
+                stack.append(current)
+                current = current.left
+
+    def in_order(self, current: AVLTreeNode) -> List:
+        """ Traverse with inorder through the sub-tree of current, see nodes_in_order
         :param current: the current node of the avl tree
         :returns: a sorted list of all the items of the tree (sorted based on key values)
         :complexity: Best and worst is O(n) where n is the number of nodes in the avl tree
         """
-        if current is None:
-            return
-
-        self.in_order_aux(current.left, sorted_list)
-        sorted_list.append(current.item)
-        self.in_order_aux(current.right, sorted_list)
-        return
-
+        return [node.item for node in self.nodes_in_order(current)]
@@ -0,0 +1,162 @@
+"""
+    Bit-based implementation of Set ADT for non-negative integers.
+"""
+
+from __future__ import annotations
+from typing import Iterator
+from set import *
+
+__author__ = 'Tan Jun Yu'
+__docformat__ = 'reStructuredText'
+
+
+class BitSet(Set[int]):
+    """Set ADT of non-negative integers (IDs, indices) stored as one bit per integer of the universe
+    0 .. universe - 1 in a bytearray: bit i & 7 of byte i >> 3 is set when i is in the set.
+    Membership, add and remove touch a single byte, and union, intersection and difference
+    combine whole machine words by converting the bytes to Python ints.
+    The universe grows automatically when a larger integer is added.
+
+    Attributes:
+        * size (int): number of elements in the set
+        * bits (bytearray): the bit of every integer of the universe
+    """
+
+    MIN_CAPACITY = 1
+
+    def __init__(self, capacity: int = 1) -> None:
+        """ Initialization.
+        :param capacity: size of the universe, the set grows past it when needed
+        :complexity: O(capacity)
+        """
+        self.capacity = max(self.MIN_CAPACITY, capacity)
+        Set.__init__(self)
+
+    @classmethod
+    def from_mask(cls, mask: int) -> BitSet:
+        """ Creates the set of the integers whose bit is set in mask
+        :complexity: O(U) where U is the bit length of mask
+        :pre: mask >= 0
+        """
+        res = cls(mask.bit_length())
+        res.bits[:] = mask.to_bytes(len(res.bits), "little")
+        res.size = mask.bit_count()
+        return res
+
+    def mask(self) -> int:
+        """ Returns the set as a Python int whose bit i is set when i is in the set.
+        :complexity: O(U) where U is the size of the universe, in word-sized steps
+        """
+        return int.from_bytes(self.bits, "little")
+
+    @staticmethod
+    def mask_of(other: Set[int], skip_invalid: bool = False) -> int:
+        """ Returns the mask of any set of integers, see mask. A BitSet gives its mask directly, the elements
+        of any other set are added to a BitSet first.
+        :param skip_invalid: leave out the elements that are not non-negative integers instead of raising,
+            for the operations whose result cannot contain them anyway
+        :raises ValueError: if an element is not a non-negative integer and skip_invalid is False
+        :complexity: O(U) for a BitSet, O(N + U) otherwise where N is the size of other and U the size of its universe
+        """
+        if isinstance(other, BitSet):
+            return other.mask()
+        bits = BitSet()
+        for item in other:
+            if not (isinstance(item, int) and item >= 0):
+                if skip_invalid:
+                    continue
+                raise ValueError("BitSet elements must be non-negative integers, got {0!r}".format(item))
+            bits.add(item)
+        return bits.mask()
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the set. """
+        return self.size
+
+    def is_empty(self) -> bool:
+        """ True if the set is empty. """
+        return len(self) == 0
+
+    def __contains__(self, item: int) -> bool:
+        """ True if the set contains the item. Anything but a non-negative integer is never in the set.
+        :complexity: O(1)
+        """
+        if not (isinstance(item, int) and item >= 0):
+            return False
+        byte = item >> 3
+        return byte < len(self.bits) and self.bits[byte] >> (item & 7) & 1 == 1
+
+    def __iter__(self) -> Iterator[int]:
+        """ Iterates over the elements of the set in increasing order.
+        :complexity: O(U + N) for the whole iteration where U is the size of the universe and N the size of the set
+        """
+        for byte_index, byte in enumerate(self.bits):
+            while byte:
+                low_bit = byte & -byte
+                yield (byte_index << 3) + low_bit.bit_length() - 1
+                byte ^= low_bit
+
+    def clear(self) -> None:
+        """ Makes the set empty.
+        :complexity: O(capacity)
+        """
+        self.size = 0
+        self.bits = bytearray((self.capacity + 7) >> 3)
+
+    def add(self, item: int) -> None:
+        """ Adds an element to the set. An element already present in the set is not added again.
+        The universe at least doubles when item is outside of it.
+        :raises ValueError: if the item is negative
+        :complexity: O(1) amortised over the growths of the universe
+        """
+        if item < 0:
+            raise ValueError("BitSet elements must be non-negative, got {0}".format(item))
+        byte = item >> 3
+        if byte >= len(self.bits):
+            self.bits.extend(bytes(max(byte + 1, 2 * len(self.bits)) - len(self.bits)))
+        bit = 1 << (item & 7)
+        if not self.bits[byte] & bit:
+            self.bits[byte] |= bit
+            self.size += 1
+
+    def remove(self, item: int) -> None:
+        """ Removes an element from the set.
+        :pre: the element should be present in the set
+        :raises KeyError: if no such element is found.
+        :complexity: O(1)
+        """
+        if item not in self:
+            raise KeyError(item)
+        self.bits[item >> 3] &= ~(1 << (item & 7)) & 0xFF
+        self.size -= 1
+
+    def union(self, other: Set[int]) -> BitSet:
+        """ Creates a new set equal to the union with another one,
+        i.e. the result set should contains the elements of self and other.
+        :raises ValueError: if other contains anything but non-negative integers
+        :complexity: O(U) where U is the size of the larger universe, in word-sized steps, when other is a BitSet,
+            see mask_of otherwise
+        """
+        return BitSet.from_mask(self.mask() | BitSet.mask_of(other))
+
+    def intersection(self, other: Set[int]) -> BitSet:
+        """ Creates a new set equal to the intersection with another one,
+        i.e. the result set should contain the elements that are both in
+        self *and* other.
+        :complexity: O(U) where U is the size of the larger universe, in word-sized steps, when other is a BitSet,
+            see mask_of otherwise
+        """
+        return BitSet.from_mask(self.mask() & BitSet.mask_of(other, skip_invalid=True))
+
+    def difference(self, other: Set[int]) -> BitSet:
+        """ Creates a new set equal to the difference with another one,
+        i.e. the result set should contain the elements of self that
+        *are not* in other.
+        :complexity: O(U) where U is the size of the larger universe, in word-sized steps, when other is a BitSet,
+            see mask_of otherwise
+        """
+        return BitSet.from_mask(self.mask() & ~BitSet.mask_of(other, skip_invalid=True))
+
+    def __str__(self):
+        """ Magic method constructing a string representation of the set object. """
+        return '{' + ', '.join(map(str, self)) + '}'
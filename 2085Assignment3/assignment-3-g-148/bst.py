@@ -8,8 +8,7 @@ from __future__ import annotations
 __author__ = 'Brendon Taylor, modified by Alexey Ignatiev, further modified by Jackson Goerner and Shyam Kamalesh Borkar'
 __docformat__ = 'reStructuredText'
 
-from typing import TypeVar, Generic
-from linked_stack import LinkedStack
+from typing import TypeVar, Generic, Iterator
 from node import TreeNode
 import sys
 
@@ -20,51 +19,21 @@ I = TypeVar('I')
 T = TypeVar('T')
 
 
-class BSTInOrderIterator:
-    """ In-order iterator for the binary search tree.
-        Performs stack-based BST traversal.
-    """
-
-    def __init__(self, root: TreeNode[K, I]) -> None:
-        """ Iterator initialiser. """
-
-        self.stack = LinkedStack()
-        self.current = root
-
-    def __iter__(self) -> BSTInOrderIterator:
-        """ Standard __iter__() method for initialisers. Returns itself. """
-
-        return self
-
-    def __next__(self) -> K:
-        """ The main body of the iterator.
-            Returns keys of the BST one by one respecting the in-order.
-        """
-
-        while self.current:
-            self.stack.push(self.current)
-            self.current = self.current.left
-
-        if self.stack.is_empty():
-            raise StopIteration
-
-        result = self.stack.pop()
-        self.current = result.right
-
-        return result.key
-
-
 class BinarySearchTree(Generic[K, I]):
     """ Basic binary search tree. """
 
-    def __init__(self) -> None:
+    def __init__(self, multimap: bool = False) -> None:
         """
             Initialises an empty Binary Search Tree
+            :param multimap: whether several nodes may have the same key. Equal keys are kept in the order
+                             they were inserted: a new key goes after (to the right of) the keys equal to it.
+                             Looking up or deleting by key then uses any node with that key.
             :complexity: O(1)
         """
 
         self.root = None
         self.length = 0
+        self.multimap = multimap
 
     def is_empty(self) -> bool:
         """
@@ -90,9 +59,62 @@ class BinarySearchTree(Generic[K, I]):
         else:
             return True
 
-    def __iter__(self) -> BSTInOrderIterator:
-        """ Create an in-order iterator. """
-        return BSTInOrderIterator(self.root)
+    def __iter__(self) -> Iterator[K]:
+        """ Iterates over the keys in increasing order, see nodes_in_order. """
+        return (current.key for current in self.nodes_in_order(self.root))
+
+    def __reversed__(self) -> Iterator[K]:
+        """ Iterates over the keys in decreasing order, see nodes_in_order. """
+        return (current.key for current in self.nodes_in_order(self.root, reverse=True))
+
+    def nodes_in_order(self, current: TreeNode, reverse: bool = False) -> Iterator[TreeNode]:
+        """
+            Yields the nodes of the sub-tree of current in increasing order of their keys, or decreasing
+            order if reverse is True. The pending nodes are kept on a list used as a stack, so at most
+            one entry per level of the tree is held and nothing is allocated per node.
+            :complexity: O(1) amortised per node yielded, O(D) memory where D is the depth of the tree
+        """
+        stack = []
+        while current is not None or len(stack) > 0:
+            while current is not None:
+                stack.append(current)
+                current = current.right if reverse else current.left
+            current = stack.pop()
+            yield current
+            current = current.left if reverse else current.right
+
+    def iter_items(self, reverse: bool = False) -> Iterator[I]:
+        """
+            Yields the items of the tree in increasing order of their keys, or decreasing order if reverse is True
+            :complexity: see nodes_in_order
+        """
+        return (current.item for current in self.nodes_in_order(self.root, reverse))
+
+    def items_between(self, lo_key: K, hi_key: K) -> Iterator[I]:
+        """
+            Yields the items whose keys are between lo_key and hi_key (inclusive) in increasing order of key.
+            The walk down to lo_key keeps the nodes whose key is at least lo_key on a stack, and the
+            in-order walk carries on from there until a key is larger than hi_key.
+            :complexity: O(CompK * (D + k)) where D is the depth of the tree and k the number of items yielded
+        """
+        stack = []
+        current = self.root
+        while current is not None:
+            if current.key < lo_key:
+                current = current.right
+            else:
+                stack.append(current)
+                current = current.left
+
+        while len(stack) > 0:
+            current = stack.pop()
+            if current.key > hi_key:
+                return
+            yield current.item
+            current = current.right
+            while current is not None:
+                stack.append(current)
+                current = current.left
 
     def __getitem__(self, key: K) -> I:
         """
@@ -107,70 +129,132 @@ class BinarySearchTree(Generic[K, I]):
         return self.get_tree_node_by_key_aux(self.root, key)
 
     def get_tree_node_by_key_aux(self, current: TreeNode, key: K) -> TreeNode:
-        if current is None:  # base case: empty
-            raise KeyError('Key not found: {0}'.format(key))
-        elif key == current.key:  # base case: found
-            return current
-        elif key < current.key:
-            return self.get_tree_node_by_key_aux(current.left, key)
-        else:  # key > current.key
-            return self.get_tree_node_by_key_aux(current.right, key)
+        """
+            Walks down from current to the node with the given key
+            :raises KeyError: when the key is not in the sub-tree
+            :complexity: see __getitem__(self, key: K) -> I
+        """
+        while current is not None:
+            if key == current.key:  # found
+                return current
+            elif key < current.key:
+                current = current.left
+            else:  # key > current.key
+                current = current.right
+        raise KeyError('Key not found: {0}'.format(key))
 
     def __setitem__(self, key: K, item: I) -> None:
         self.root = self.insert_aux(self.root, key, item)
 
+    def create_node(self, key: K, item: I) -> TreeNode:
+        """
+            Creates the node of a newly inserted key
+            :complexity: O(1)
+        """
+        return TreeNode(key, item)
+
     def insert_aux(self, current: TreeNode, key: K, item: I) -> TreeNode:
         """
-            Attempts to insert an item into the tree, it uses the Key to insert it
+            Attempts to insert an item into the sub-tree rooted at current, it uses the Key to insert it.
+            The walk down is iterative: the nodes visited are kept on a path stack, which retrace then
+            walks back up, so the depth of the tree is not limited by the recursion limit.
+            :returns: the new root of the sub-tree
+            :raises ValueError: when the key is already in the tree, unless the tree is a multimap
             :complexity best: O(CompK) inserts the item at the root.
             :complexity worst: O(CompK * D) inserting at the bottom of the tree
             where D is the depth of the tree
             CompK is the complexity of comparing the keys
         """
-        if current is None:  # base case: at the leaf
-            current = TreeNode(key, item)
-            self.length += 1
-        elif key < current.key:
-            current.left = self.insert_aux(current.left, key, item)
-        elif key > current.key:
-            current.right = self.insert_aux(current.right, key, item)
-        else:  # key == current.key
-            raise ValueError('Inserting duplicate item')
-        return current
+        path = []
+        node = current
+        while node is not None:
+            if key < node.key:
+                path.append(node)
+                node = node.left
+            elif key > node.key or self.multimap:  # an equal key goes after the existing ones
+                path.append(node)
+                node = node.right
+            else:  # key == node.key
+                raise ValueError('Inserting duplicate item')
+
+        node = self.create_node(key, item)
+        self.length += 1
+        if len(path) == 0:  # the sub-tree was empty
+            return node
+
+        parent = path[-1]
+        if key < parent.key:
+            parent.left = node
+        else:
+            parent.right = node
+        return self.retrace(path)
 
     def __delitem__(self, key: K) -> None:
         self.root = self.delete_aux(self.root, key)
 
     def delete_aux(self, current: TreeNode, key: K) -> TreeNode:
         """
-            Attempts to delete an item from the tree, it uses the Key to
-            determine the node to delete.
+            Attempts to delete an item from the sub-tree rooted at current, it uses the Key to
+            determine the node to delete. A node with two children takes the key and item of its
+            successor, and the successor's node is removed instead.
+            The walk down is iterative, see insert_aux.
+            :returns: the new root of the sub-tree
+            :raises ValueError: when the key is not in the tree
+            :complexity: O(CompK * D) where D is the depth of the tree
         """
+        path = []
+        node = current
+        while node is not None and key != node.key:
+            path.append(node)
+            if key < node.key:
+                node = node.left
+            else:
+                node = node.right
 
-        if current is None:  # key not found
+        if node is None:  # key not found
             raise ValueError('Deleting non-existent item')
-        elif key < current.key:
-            current.left  = self.delete_aux(current.left, key)
-        elif key > current.key:
-            current.right = self.delete_aux(current.right, key)
-        else:  # we found our key => do actual deletion
-            if self.is_leaf(current):
-                self.length -= 1
-                return None
-            elif current.left is None:
-                self.length -= 1
-                return current.right
-            elif current.right is None:
-                self.length -= 1
-                return current.left
-
-            # general case => find a successor
-            succ = self.get_successor(current)
-            current.key  = succ.key
-            current.item = succ.item
-            current.right = self.delete_aux(current.right, succ.key)
+        return self.remove_node(path, node)
 
-        return current
+    def remove_node(self, path: list[TreeNode], node: TreeNode) -> TreeNode:
+        """
+            Removes node from the sub-tree rooted at path[0] (or at node when path is empty).
+            :param path: the nodes from the root of the sub-tree down to the parent of node
+            :returns: the new root of the sub-tree
+            :complexity: O(D) where D is the depth of the tree
+        """
+        if node.left is not None and node.right is not None:
+            # general case => find a successor, it has no left child
+            path.append(node)
+            succ = node.right
+            while succ.left is not None:
+                path.append(succ)
+                succ = succ.left
+            node.key = succ.key
+            node.item = succ.item
+            node = succ
+
+        # node has at most one child, which takes its place
+        replacement = node.left if node.left is not None else node.right
+        self.length -= 1
+        if len(path) == 0:  # deleting the root of the sub-tree
+            return replacement
+
+        parent = path[-1]
+        if parent.left is node:
+            parent.left = replacement
+        else:
+            parent.right = replacement
+        return self.retrace(path)
+
+    def retrace(self, path: list[TreeNode]) -> TreeNode:
+        """
+            Called after a node below path[-1] was inserted or removed, with the nodes from the root
+            of the sub-tree being changed (path[0]) down to the parent of the change.
+            Subclasses walk back up the path to restore their invariants.
+            :returns: the new root of the sub-tree
+            :complexity: O(1)
+        """
+        return path[0]
 
     def get_successor(self, current: TreeNode) -> TreeNode:
         """
@@ -197,9 +281,11 @@ class BinarySearchTree(Generic[K, I]):
             where D is the depth of the subtree under current.
         """
         
-        if (current is None) or (current.left is None):
-            return current
-        return self.get_minimal(current.left)
+        if current is None:
+            return None
+        while current.left is not None:
+            current = current.left
+        return current
 
 
     def is_leaf(self, current: TreeNode) -> bool:
@@ -229,30 +315,82 @@ class BinarySearchTree(Generic[K, I]):
 
     
 
-    def find_max_and_remove(self):
-        '''
-        Find the node with the maximum key and delete that node before returning it
-        Used in : select_food_and_cave method of Player class
-        :complexity : Worst: O(Depth) + O(delete) where O(delete) is also O(Depth). Thus, worst-case complexity is O(Depth). O(log n) for balanced tree and O(n) for unbalanced tree
-                            where n is the number of nodes.
-                      Best: O(1) when the root node is the node with the maximum key
-        '''
-        return self.find_max_and_remove_aux(self.root)
+    def peek_min(self) -> TreeNode:
+        """
+            Returns the node with the smallest key without removing it
+            :raises IndexError: when the tree is empty
+            :complexity: O(D) where D is the depth of the tree
+        """
+        if self.root is None:
+            raise IndexError('peek from an empty tree')
+        return self.get_minimal(self.root)
 
-    def find_max_and_remove_aux(self,current: TreeNode):
+    def peek_max(self) -> TreeNode:
+        """
+            Returns the node with the largest key without removing it
+            :raises IndexError: when the tree is empty
+            :complexity: O(D) where D is the depth of the tree
+        """
+        if self.root is None:
+            raise IndexError('peek from an empty tree')
+        current = self.root
+        while current.right is not None:
+            current = current.right
+        return current
+
+    def pop_min(self) -> TreeNode:
+        """
+            Removes and returns the node with the smallest key, see pop_extreme
+            :raises IndexError: when the tree is empty
+        """
+        return self.pop_extreme(largest=False)
+
+    def pop_max(self) -> TreeNode:
+        """
+            Removes and returns the node with the largest key, see pop_extreme
+            :raises IndexError: when the tree is empty
+        """
+        return self.pop_extreme(largest=True)
+
+    def pop_extreme(self, largest: bool) -> TreeNode:
+        """
+            Removes and returns the node with the largest (or smallest) key in a single walk down:
+            the extreme node has no child on that side, so its other child takes its place and retrace
+            walks back up the path, without searching for the key again from the root.
+            The returned node is detached from the tree (its children are None).
+            :raises IndexError: when the tree is empty
+            :complexity: O(D) where D is the depth of the tree, O(log n) for an AVL tree
+        """
+        if self.root is None:
+            raise IndexError('pop from an empty tree')
+
+        path = []
+        current = self.root
+        while (current.right if largest else current.left) is not None:
+            path.append(current)
+            current = current.right if largest else current.left
+
+        replacement = current.left if largest else current.right
+        self.length -= 1
+        if len(path) == 0:
+            self.root = replacement
+        else:
+            if largest:
+                path[-1].right = replacement
+            else:
+                path[-1].left = replacement
+            self.root = self.retrace(path)
+
+        current.left = None
+        current.right = None
+        return current
+
+    def find_max_and_remove(self) -> TreeNode:
         '''
-        Auxilliary function to find the max node and remove it.
-        :param current: the current node of the tree
-        :complexity : Worst: O(Depth) + O(delete) where O(delete) is also O(Depth). Thus, worst-case complexity is O(Depth). O(log n) for balanced tree and O(n) for unbalanced tree
-                            where n is the number of nodes.
-                      Best: O(1) when the root node is the node with maximum key
+        Find the node with the maximum key and delete that node before returning it
+        :returns: the node, None if the tree is empty
+        :complexity : see pop_max
         '''
-        
-        if current is None:
+        if self.root is None:
             return None
-        else:
-            if current.right is None:
-                del self[current.key]
-                return current
-            else:
-                return self.find_max_and_remove_aux(current.right)
+        return self.pop_max()
@@ -0,0 +1,73 @@
+"""
+Vectorised polynomial hashing of a batch of string keys.
+
+The keys are encoded into a padded uint32 code point matrix (one row per key) and Horner's rule is
+run one column at a time over every key that is still long enough, so a whole batch costs
+O(longest key) NumPy operations instead of O(total characters) interpreter steps.
+NumPy is optional, when it is not installed HAS_NUMPY is False and the hash tables keep hashing
+one key at a time.
+"""
+from __future__ import annotations
+
+__author__ = 'Tan Jun Yu'
+__docformat__ = 'reStructuredText'
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
+
+# Largest value an int64 intermediate can hold, used to decide if the products can overflow
+INT64_MAX = 2 ** 63 - 1
+MAX_CODE_POINT = 0x10FFFF
+
+
+def encode_keys(keys: list[str]) -> tuple:
+    """
+        Encode the keys into a padded code point matrix with the rows sorted by decreasing key length.
+        :param keys: the keys to encode
+        :returns: (codes, lengths, order) where codes[r] holds the code points of keys[order[r]]
+                  padded with zeros and lengths is sorted in decreasing order
+        :pre: HAS_NUMPY
+        :complexity: O(N * L) where N is the number of keys and L the length of the longest key
+    """
+    lengths = np.fromiter((len(key) for key in keys), dtype=np.int64, count=len(keys))
+    order = np.argsort(-lengths, kind='stable')
+    longest = int(lengths[order[0]]) if len(keys) > 0 else 0
+    # Fixed width unicode strings are stored as UCS-4, so viewing them as uint32 gives the code points
+    codes = np.array(keys, dtype='<U{0}'.format(max(1, longest))).view(np.uint32).reshape(len(keys), max(1, longest))
+    return codes[order], lengths[order], order
+
+
+def polynomial_hash(keys: list[str], tablesize: int, multipliers: list[int]) -> list[int] | None:
+    """
+        Hash every key with value = (ord(key[j]) + multipliers[j] * value) % tablesize.
+        :param keys: the keys to hash
+        :param tablesize: the modulus of the hash
+        :param multipliers: the multiplier used for the j-th character, at least as long as the longest key
+        :returns: the list of hash values in the order of keys, or None when NumPy is not installed or the
+                  intermediate products could overflow an int64
+        :complexity: O(N * L) where N is the number of keys and L the length of the longest key
+    """
+    if not HAS_NUMPY:
+        return None
+    if len(keys) == 0:
+        return []
+    if max(multipliers, default=0) * (tablesize - 1) + MAX_CODE_POINT > INT64_MAX:
+        return None
+
+    codes, lengths, order = encode_keys(keys)
+    values = np.zeros(len(keys), dtype=np.int64)
+    # Rows are sorted by decreasing length, so the keys still being hashed at column j are the first active[j] rows
+    active = len(keys) - np.cumsum(np.bincount(lengths, minlength=codes.shape[1] + 1))
+    for column in range(codes.shape[1]):
+        rows = int(active[column])
+        if rows == 0:
+            break
+        values[:rows] = (codes[:rows, column].astype(np.int64) + multipliers[column] * values[:rows]) % tablesize
+
+    result = np.empty(len(keys), dtype=np.int64)
+    result[order] = values
+    return result.tolist()
@@ -2,8 +2,11 @@
 Game functionality used by the players. Both Solo and Multiplayer mode functionalities have been created and added.
 """
 from __future__ import annotations
+import math
 from constants import EPSILON
+from hash_table import LinearProbeTable
 from heap import MaxHeap
+from hset import HSet
 
 from player import Player
 from trader import HardTrader, RandomTrader, RangeTrader, Trader
@@ -132,21 +135,48 @@ class Game:
         (You may have to call Material.random_material more than <amount> times.)
 
         :param amount: the amount of materials to be set in the game 
-        :complexity: Best-case = Worst-case = O(amount * N), where N is the number of materials in self.materials
+        :complexity: Best-case = O(amount + N), Worst-case = O(amount * N) when every lookup in the hash tables probes every material, where N is the number of materials in self.materials
         """
+        #names of the Game's materials, and their mining rates grouped by bucket of width EPSILON: two mining rates less than EPSILON apart
+        #are always in the same or in adjacent buckets, so a new material is only compared with the materials of three buckets
+        material_names = HSet.from_iterable(material.name for material in self.materials)
+        rate_buckets = LinearProbeTable(max(amount, len(self.materials)), hash_function="builtin")
+        for material in self.materials:
+            self.add_to_rate_bucket(rate_buckets, material.mining_rate)
+
         while len(self.materials) < amount:
             new_material = Material.random_material()
-            similar_material = False 
+            similar_material = new_material.name in material_names
 
-            #iterating through the Game's material list to check for existing materials with same name or mining rate
-            for material in self.materials:
-                if (new_material.name == material.name) or (abs(new_material.mining_rate - material.mining_rate) < EPSILON):
-                    similar_material = True  
+            #checking the neighbouring buckets for an existing material with the same mining rate
+            bucket = math.floor(new_material.mining_rate / EPSILON)
+            for neighbour in (bucket - 1, bucket, bucket + 1):
+                if similar_material:
                     break
-            
+                if neighbour in rate_buckets:
+                    for mining_rate in rate_buckets[neighbour]:
+                        if abs(new_material.mining_rate - mining_rate) < EPSILON:
+                            similar_material = True
+                            break
+
             #add the randomly generated material only if similar material doesn't already exist in the self.materials list
             if not similar_material:
                 self.materials.append(new_material)
+                material_names.add(new_material.name)
+                self.add_to_rate_bucket(rate_buckets, new_material.mining_rate)
+
+    @staticmethod
+    def add_to_rate_bucket(rate_buckets: LinearProbeTable[list[float]], mining_rate: float) -> None:
+        """
+        Adds a mining rate to its bucket of width EPSILON in rate_buckets, see generate_random_materials
+
+        :complexity: expected O(1)
+        """
+        bucket = math.floor(mining_rate / EPSILON)
+        if bucket in rate_buckets:
+            rate_buckets[bucket].append(mining_rate)
+        else:
+            rate_buckets[bucket] = [mining_rate]
 
 
     def generate_random_caves(self, amount: int) -> None:
@@ -156,21 +186,16 @@ class Game:
         (You may have to call Cave.random_cave more than <amount> times.)
 
         :param amount: the amount of caves to be set in the game 
-        :complexity: Best-case = Worst-case = O(amount * N), where N is the number of caves in self.caves
+        :complexity: Best-case = O(amount + N), Worst-case = O(amount * N) when every lookup in the set probes every cave name, where N is the number of caves in self.caves
         """
+        cave_names = HSet.from_iterable(cave.name for cave in self.caves)
         while len(self.caves) < amount:
             new_cave = Cave.random_cave(self.materials)
-            similar_cave = False 
-
-            #iterating through the Game's caves list to check for existing caves with same name
-            for cave in self.caves:
-                if (new_cave.name == cave.name):
-                    similar_cave = True
-                    break
 
             #add the randomly generated cave only if a cave with the same name does not exist in the self.caves list
-            if not similar_cave:
+            if new_cave.name not in cave_names:
                 self.caves.append(new_cave)
+                cave_names.add(new_cave.name)
 
 
     def generate_random_traders(self, amount: int) -> None:
@@ -462,24 +487,24 @@ class MultiplayerGame(Game):
         :returns: a list containing the food items or None depending on whether the player bought the Food, a list containing the temporary balances of every player, 
                   a list containing the caves (and the quantity mined from them) visited by each player or None if no Food was bought by the player.
 
-        :complexity: Best-Case: O(M + T + C + C + P) = O(M + T + C + P). This case happens only when the best cases of both the get_max() and add() functions of MaxHeap are met.
-                     In a scenario where after getting the max item from the heap, the last element of the heap does not sink to any position i.e. O(sink) = O(1) and also while 
-                     adding an item to the heap, no the element does not rise to any position i.e. O(rise) = O(1), only then the complexity of this function would be O(M + T + C + P).
+        :complexity: Best-Case: O(M + T + C + C + P) = O(M + T + C + P). This case happens only when the best case of the replace_top() function of MaxHeap is met.
+                     In a scenario where after replacing the max item of the heap by the recalculated one, the element does not sink to any position i.e. O(sink) = O(1),
+                     only then the complexity of this function would be O(M + T + C + P).
 
-                     Worst_Case: O(M + T + C + C + P*(log C + log C)) = O(M + T + 2*C + 2*P*log C) = O(M + T + C + P*log C)     [since constants are ignored in Big-O complexity]
+                     Worst_Case: O(M + T + C + C + P*log C) = O(M + T + 2*C + P*log C) = O(M + T + C + P*log C)     [since constants are ignored in Big-O complexity]
 
                      The complexity of the materials for loop (line 636) is O(M). Complexity of traders for loop (line 641) is O(T). Complexity of caves for loop (line 650) is O(C).
                      Complexity of players for loop (line 671) is O(P). A bottom-up heap is created in this function for which the complexity is always O(N) where N is the number of 
-                     nodes to be added in the heap. Since a maximum of C nodes (length of self.caves) will be added to the heap, its complexity is O(C). The complexities of the get_max()
-                     and add() functions of the heap are O(log C) * O(comparison) but since the comparison in this heap is done between keys of float types, O(comparison) = O(1). Thus, the
-                     complexity of these functions becomes O(log C). All the other functions called in this function have a worst-case complexity of O(1). Based on these complexities, the 
+                     nodes to be added in the heap. Since a maximum of C nodes (length of self.caves) will be added to the heap, its complexity is O(C). The complexity of the replace_top()
+                     function of the heap is O(log C) * O(comparison) but since the comparison in this heap is done between keys of float types, O(comparison) = O(1). Thus, the
+                     complexity of this function becomes O(log C). All the other functions called in this function have a worst-case complexity of O(1). Based on these complexities, the 
                      overall complexity of tis function becomes O(M + T + C + P*log C)
 
         :approach: The primary purpose of this function is to select the cave which upon being mined, returns the highest emralds based on the trader's existing deals. So the approach was chosen
                    to calculate the emerald return for each cave and arrange these caves in a Max Heap by using their emerald returns as keys. The cave with the highest emerald return would be
-                   placed at the top of the heap. Hence, for every player, the topmost item is extracted from the heap using the get_max() function. Following this, the chosen cave is added back to
-                   the heap after the player has mined a certain quantity of material from the cave. Even when the cave is added back, the heap sets its position based on its new key by rising 
-                   it up to the appropriate position. The traders loop (line 641) which is executed before the caves loop (line 650) sets the selling price for each material in the game based on 
+                   placed at the top of the heap. Hence, for every player, the topmost item is read from the heap using the peek_max() function. Following this, the chosen cave is replaced at the top of
+                   the heap by itself with its new key after the player has mined a certain quantity of material from the cave, which takes a single sink rather than a get_max() and an add(). The heap sets its position based on its new key by sinking
+                   it down to the appropriate position. The traders loop (line 641) which is executed before the caves loop (line 650) sets the selling price for each material in the game based on 
                    the deals generated. This material price is then used to calculate the emrald returns of each cave in the calculate_cave_returns function. The emerald return of the caves was 
                    calculated without any data from the players as the multiplayer mode only offers a single food to all the players. Hence, the food price for all players will be the same which 
                    can thus be used to calculate the amount of material mined from each cave. 
@@ -569,8 +594,8 @@ class MultiplayerGame(Game):
                   1st iteration: Player = Player("Rachit", 50)
                   Since player balance (50) > food price (19), player Rachit will be able to mine a cave
                   food_selected = [Cooked Chicken Cuts]
-                    Best cave returned from get_max() is Castle Karstaag Ruins since it is at the top of the heap. 
-                    Current structure of the heap = [(3.487518355359765, Glacial Cave)]
+                    Best cave returned from peek_max() is Castle Karstaag Ruins since it is at the top of the heap. 
+                    Current structure of the heap = [(7.255369928400955, Castle Karstaag Ruins), (3.487518355359765, Glacial Cave)]
 
                     best_cave_return = (7.255369928400955, Castle Karstaag Ruins)
                     optimal emarald return (opt_emerald_return) = 7.255369928400955
@@ -584,15 +609,15 @@ class MultiplayerGame(Game):
                     new_emerald_return = 7.255369928400955
                     new_mined_quantity = 0.906921241050119
 
-                    Finally, the cave is added back to the heap making the structure of the heap to be [(7.255369928400955, Castle Karstaag Ruins), (3.487518355359765, Glacial Cave)]
+                    Finally, the top of the heap is replaced by the cave with its new return, making the structure of the heap to be [(7.255369928400955, Castle Karstaag Ruins), (3.487518355359765, Glacial Cave)]
                     since Castle Karstaag Ruins still has a higher emerald return (higher value of key) it will be placed at the top of the heap
 
 
                   2nd iteration: Player = Player("Jun Yu", 50)
                   Since player balance (50) > food price (19), player Jun Yu will be able to mine a cave
                   food_selected = [Cooked Chicken Cuts, Cooked Chicken Cuts]
-                    Best cave returned from get_max() is Castle Karstaag Ruins since it is at the top of the heap. 
-                    Current structure of the heap = [(3.487518355359765, Glacial Cave)]
+                    Best cave returned from peek_max() is Castle Karstaag Ruins since it is at the top of the heap. 
+                    Current structure of the heap = [(7.255369928400955, Castle Karstaag Ruins), (3.487518355359765, Glacial Cave)]
 
                     best_cave_return = (7.255369928400955, Castle Karstaag Ruins)
                     optimal emarald return (opt_emerald_return) = 7.255369928400955
@@ -606,7 +631,7 @@ class MultiplayerGame(Game):
                     new_emerald_return = 7.255369928400955
                     new_mined_quantity = 0.906921241050119
 
-                    Finally, the cave is added back to the heap making the structure of the heap to be [(7.255369928400955, Castle Karstaag Ruins), (3.487518355359765, Glacial Cave)]
+                    Finally, the top of the heap is replaced by the cave with its new return, making the structure of the heap to be [(7.255369928400955, Castle Karstaag Ruins), (3.487518355359765, Glacial Cave)]
                     since Castle Karstaag Ruins still has a higher emerald return (higher value of key) it will be placed at the top of the heap
 
 
@@ -679,8 +704,7 @@ class MultiplayerGame(Game):
                 food_selected.append(food)
                 temp_balance -= food.price  
 
-                #complexity of get_max() is O(log C)*O(comparison) but since comparison is between float types, O(comparison) = O(1)
-                best_cave_return = caves_heap.get_max() #O(log C)
+                best_cave_return = caves_heap.peek_max() #O(1), the cave stays at the top until its new return is known
                 opt_emerald_return = best_cave_return[0]
                 most_optimal_cave = best_cave_return[1]
                 opt_mined_quantity = most_optimal_cave.get_mined_quantity()
@@ -694,8 +718,8 @@ class MultiplayerGame(Game):
                 new_emerald_return, new_mined_quantity = self.calculate_cave_returns(most_optimal_cave, food)  #recalculating emerald returns for selected cave
                 most_optimal_cave.set_mined_quantity(new_mined_quantity)
 
-                 #complexiy of add() is O(log C)*O(comparison) but since comparison is between float types, O(comparison) = O(1)
-                caves_heap.add((new_emerald_return, most_optimal_cave)) #O(log C)
+                #complexity of replace_top() is O(log C)*O(comparison) but since comparison is between float types, O(comparison) = O(1)
+                caves_heap.replace_top((new_emerald_return, most_optimal_cave)) #O(log C), a single sink instead of get_max() and add()
         
         return food_selected, balance, visited_caves
 
@@ -0,0 +1,112 @@
+""" Benchmark of the hash functions registered in hash_functions
+
+For every dataset and hash function, times hashing every city one key at a time (ns/key), counts the
+keys whose home slot is already taken by another key, and builds a hash_table.LinearProbeTable with the
+hash function to report its probe statistics. The results are printed ranked by speed and by total
+distance probed.
+
+Usage:
+    python hash_benchmark.py
+    python hash_benchmark.py --datasets us --functions universal polynomial:9929 fnv1a builtin --load 0.25
+"""
+
+from __future__ import annotations
+
+import argparse
+import time
+
+from analysis import DATASETS, load_dataset
+from hash_functions import HASH_FUNCTIONS, HashFunction, make_hash_function
+from hash_table import LinearProbeTable
+from primes import next_prime
+
+__author__ = 'Tan Jun Yu'
+__docformat__ = 'reStructuredText'
+
+DEFAULT_FUNCTIONS = ["universal", "polynomial:31", "polynomial:9929", "rolling:31", "fnv1a", "builtin"]
+
+
+def parse_hash_function(spec: str) -> HashFunction:
+    """
+    Create a hash function from a name with an optional base, e.g. "fnv1a" or "polynomial:9929"
+    :raises KeyError: if no hash function is registered under the name
+    """
+    name, _, base = spec.partition(":")
+    if base:
+        return make_hash_function(name, base=int(base))
+    return make_hash_function(name)
+
+
+def benchmark_hash_function(hash_function: HashFunction, keys: tuple[str, ...], tablesize: int, repeats: int = 3) -> dict:
+    """
+    Measure the speed and quality of a hash function on a set of keys
+    :param hash_function: the hash function to benchmark
+    :param keys: the keys to hash
+    :param tablesize: the size of the table the keys are hashed into
+    :param repeats: the hashing time is the best of this many runs
+    :returns: one row of the report
+    :complexity: O(repeats * N * L + N * P) where N is the number of keys, L the length of the longest key and P the probe length
+    """
+    best = None
+    positions = None
+    for _ in range(max(1, repeats)):
+        start = time.perf_counter_ns()
+        positions = [hash_function(key, tablesize) for key in keys]
+        elapsed = time.perf_counter_ns() - start
+        best = elapsed if best is None else min(best, elapsed)
+
+    table = LinearProbeTable(tablesize, tablesize_override=tablesize, hash_function=hash_function)
+    table.bulk_insert(keys, keys)
+    conflict, total_distance_probed, length_longest_probe, rehashing_count = table.statistics()
+
+    return {
+        "hash_function": str(hash_function),
+        "keys": len(keys),
+        "tablesize": tablesize,
+        "ns_per_key": best / len(keys) if len(keys) > 0 else 0.0,
+        "home_collisions": len(keys) - len(set(positions)),
+        "conflict": conflict,
+        "total_distance_probed": total_distance_probed,
+        "length_longest_probe": length_longest_probe,
+        "rehashing_count": rehashing_count,
+    }
+
+
+def rank(rows: list[dict], field: str) -> list[dict]:
+    """
+    Returns the rows sorted by increasing field, ties broken by hash function name
+    :complexity: O(R log R) where R is the number of rows
+    """
+    return sorted(rows, key=lambda row: (row[field], row["hash_function"]))
+
+
+def print_ranking(dataset: str, rows: list[dict]) -> None:
+    """ Print the rows of one dataset ranked by speed, then by total distance probed. """
+    for field in ("ns_per_key", "total_distance_probed"):
+        print("{0} ({1} keys, tablesize {2}) ranked by {3}:".format(dataset, rows[0]["keys"], rows[0]["tablesize"], field))
+        for position, row in enumerate(rank(rows, field), 1):
+            print("  {0}. {1:<16} {2:8.1f} ns/key  home collisions={3:<6} conflict={4:<6} probed={5:<8} longest={6}".format(
+                position, row["hash_function"], row["ns_per_key"], row["home_collisions"], row["conflict"],
+                row["total_distance_probed"], row["length_longest_probe"]))
+
+
+def main() -> None:
+    """ Parse the benchmark from the command line, run it and print the rankings. """
+    parser = argparse.ArgumentParser(description="Rank the registered hash functions by speed and probe statistics.")
+    parser.add_argument("--datasets", nargs="+", choices=list(DATASETS), default=list(DATASETS))
+    parser.add_argument("--functions", nargs="+", default=DEFAULT_FUNCTIONS,
+                        help="hash functions as name or name:base, registered names: " + ", ".join(HASH_FUNCTIONS))
+    parser.add_argument("--load", type=float, default=0.4, help="load factor of the table, the tablesize is the next prime after keys / load")
+    parser.add_argument("--repeats", type=int, default=3, help="the hashing time is the best of this many runs")
+    args = parser.parse_args()
+
+    hash_functions = [parse_hash_function(spec) for spec in args.functions]
+    for dataset in args.datasets:
+        keys = load_dataset(DATASETS[dataset])
+        tablesize = next_prime(int(len(keys) / args.load) + 1)
+        rows = [benchmark_hash_function(hash_function, keys, tablesize, args.repeats) for hash_function in hash_functions]
+        print_ranking(dataset, rows)
+
+
+if __name__ == "__main__":
+    main()
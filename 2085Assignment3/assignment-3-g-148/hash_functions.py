@@ -0,0 +1,208 @@
+"""
+Registry of named hash functions that a LinearProbeTable can be built with.
+
+Every hash function maps a key and a tablesize to a position in [0, tablesize). Hash functions are
+looked up by name with make_hash_function, and new ones can be added with register_hash_function.
+"""
+from __future__ import annotations
+
+__author__ = 'Tan Jun Yu'
+__docformat__ = 'reStructuredText'
+
+from abc import ABC, abstractmethod
+from operator import mul
+
+from bulk_hash import polynomial_hash
+
+
+class HashFunction(ABC):
+    """ Abstract hash function mapping string keys to positions of a table. """
+
+    name = None
+
+    @abstractmethod
+    def __call__(self, key: str, tablesize: int) -> int:
+        """ Returns the position of the key in a table of size tablesize. """
+        pass
+
+    def bulk(self, keys: list[str], tablesize: int) -> list[int]:
+        """
+        Returns the position of every key. Hash functions that can be vectorised override this.
+        :complexity: O(N * hash) where N is the number of keys
+        """
+        return [self(key, tablesize) for key in keys]
+
+    def __str__(self) -> str:
+        """ Returns the name of the hash function. """
+        return self.name
+
+
+class UniversalHash(HashFunction):
+    """
+    The universal-style polynomial hash used by hash_table.LinearProbeTable, whose multiplier
+    changes at every character (a = 31415 updated by b = 27183).
+    """
+
+    name = "universal"
+
+    def __call__(self, key: str, tablesize: int) -> int:
+        """
+        :complexity: Best Case = Worst Case = O(len(key))
+        """
+        value = 0
+        a = 31415
+        b = 27183
+        for char in key:
+            value = (ord(char) + a*value) % tablesize
+            a = a*b % (tablesize-1)
+        return value
+
+    def bulk(self, keys: list[str], tablesize: int) -> list[int]:
+        """
+        Hash every key at once with NumPy when it is installed.
+        :complexity: O(N * L) where N is the number of keys and L the length of the longest key
+        """
+        multipliers = []
+        a = 31415
+        for _ in range(max((len(key) for key in keys), default=0)):
+            multipliers.append(a)
+            a = a*27183 % (tablesize-1)
+        hashes = polynomial_hash(keys, tablesize, multipliers)
+        return hashes if hashes is not None else HashFunction.bulk(self, keys, tablesize)
+
+
+class PolynomialHash(HashFunction):
+    """ Polynomial hash with a static base evaluated with Horner's rule, as used by table_analysis. """
+
+    name = "polynomial"
+
+    def __init__(self, base: int = 31) -> None:
+        """
+        :param base: the base of the polynomial
+        """
+        self.base = base
+
+    def __call__(self, key: str, tablesize: int) -> int:
+        """
+        :complexity: Best Case = Worst Case = O(len(key))
+        """
+        value = 0
+        for char in key:
+            value = (value * self.base + ord(char)) % tablesize
+        return value
+
+    def bulk(self, keys: list[str], tablesize: int) -> list[int]:
+        """
+        Hash every key at once with NumPy when it is installed.
+        :complexity: O(N * L) where N is the number of keys and L the length of the longest key
+        """
+        longest = max((len(key) for key in keys), default=0)
+        hashes = polynomial_hash(keys, tablesize, [self.base] * longest)
+        return hashes if hashes is not None else HashFunction.bulk(self, keys, tablesize)
+
+    def __str__(self) -> str:
+        """ Returns the name of the hash function with its base. """
+        return "{0}({1})".format(self.name, self.base)
+
+
+class FNV1aHash(HashFunction):
+    """ 64-bit FNV-1a over the UTF-8 bytes of the key, reduced mod tablesize. """
+
+    name = "fnv1a"
+
+    OFFSET_BASIS = 0xcbf29ce484222325
+    PRIME = 0x100000001b3
+    MASK = 0xffffffffffffffff
+
+    def __call__(self, key: str, tablesize: int) -> int:
+        """
+        :complexity: Best Case = Worst Case = O(len(key))
+        """
+        value = self.OFFSET_BASIS
+        for byte in key.encode("utf-8"):
+            value = ((value ^ byte) * self.PRIME) & self.MASK
+        return value % tablesize
+
+
+class RollingHash(HashFunction):
+    """
+    Polynomial hash sum(ord(key[i]) * base^(n-1-i)) mod tablesize using a table of precomputed powers of the base,
+    so every character costs one multiplication by a cached power instead of a dependent Horner step.
+    Gives the same positions as PolynomialHash with the same base.
+    """
+
+    name = "rolling"
+
+    def __init__(self, base: int = 31) -> None:
+        """
+        :param base: the base of the polynomial
+        """
+        self.base = base
+        # tablesize -> [base^0, base^1, ...] mod tablesize, extended as longer keys are hashed
+        self.powers = {}
+
+    def _powers(self, tablesize: int, length: int) -> list[int]:
+        """
+        Returns the powers of the base mod tablesize, at least length of them
+        :complexity: Best Case = O(1) when enough powers are cached, Worst Case = O(length)
+        """
+        powers = self.powers.get(tablesize)
+        if powers is None:
+            powers = self.powers[tablesize] = [1 % tablesize]
+        while len(powers) < length:
+            powers.append(powers[-1] * self.base % tablesize)
+        return powers
+
+    def __call__(self, key: str, tablesize: int) -> int:
+        """
+        :complexity: Best Case = Worst Case = O(len(key))
+        """
+        # The last character is multiplied by base^0, so the key is read backwards against the powers
+        return sum(map(mul, map(ord, reversed(key)), self._powers(tablesize, len(key)))) % tablesize
+
+    def __str__(self) -> str:
+        """ Returns the name of the hash function with its base. """
+        return "{0}({1})".format(self.name, self.base)
+
+
+class BuiltinHash(HashFunction):
+    """
+    Python's builtin hash reduced mod tablesize. Strings cache their hash so this is the fastest
+    strategy, but it is randomised per process unless PYTHONHASHSEED is set.
+    """
+
+    name = "builtin"
+
+    def __call__(self, key: str, tablesize: int) -> int:
+        """
+        :complexity: Best Case = O(1) when the key's hash is cached, Worst Case = O(len(key))
+        """
+        return hash(key) % tablesize
+
+
+HASH_FUNCTIONS = {}
+
+
+def register_hash_function(name: str, factory: type) -> None:
+    """
+    Register a hash function class (or any callable returning a HashFunction) under a name
+    :raises ValueError: if the name is already registered
+    """
+    if name in HASH_FUNCTIONS:
+        raise ValueError("Hash function {0} is already registered".format(name))
+    HASH_FUNCTIONS[name] = factory
+
+
+def make_hash_function(name: str, **params) -> HashFunction:
+    """
+    Create the hash function registered under name
+    :param params: the parameters of the hash function, e.g. base for polynomial and rolling
+    :raises KeyError: if no hash function is registered under name
+    """
+    if name not in HASH_FUNCTIONS:
+        raise KeyError("Unknown hash function {0}, expected one of {1}".format(name, ", ".join(HASH_FUNCTIONS)))
+    return HASH_FUNCTIONS[name](**params)
+
+
+for hash_function in (UniversalHash, PolynomialHash, FNV1aHash, RollingHash, BuiltinHash):
+    register_hash_function(hash_function.name, hash_function)
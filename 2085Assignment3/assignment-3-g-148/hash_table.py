@@ -1,9 +1,14 @@
 """ Hash Table ADT
 
-Defines a Hash Table using Linear Probing for conflict resolution.
+Defines the abstract base of the open addressing hash tables, a Hash Table using Linear Probing
+for conflict resolution, a Robin Hood hashing variant of it and a variant storing its slots in parallel arrays.
+The other probing strategies are in probe_tables.
+A Linear Probe Table can be saved to a binary snapshot and loaded back, optionally memory-mapped.
 """
 from __future__ import annotations
-from primes import LargestPrimeIterator
+from primes import is_prime, next_prime, growth_prime
+from bulk_hash import polynomial_hash
+from hash_functions import HASH_FUNCTIONS, HashFunction, make_hash_function
 
 __author__ = 'Brendon Taylor. Modified by Graeme Gange, Alexey Ignatiev, Jackson Goerner , Tan Jun Yu'
 __docformat__ = 'reStructuredText'
@@ -11,60 +16,132 @@ __modified__ = '21/05/2020'
 __since__ = '14/05/2020'
 
 
-from referential_array import ArrayR
-from typing import TypeVar, Generic
+from referential_array import ArrayR, ArrayF
+from array import array
+from abc import ABC, abstractmethod
+from typing import TypeVar, Generic, Iterable, NamedTuple
+import math
+import mmap as mmap_module
+import pickle
+import struct
+import sys
+import time
 T = TypeVar('T')
 
+# Snapshot layout (little endian):
+#   header: magic, version, flags, migration_step, tablesize, count, conflict, total_distance_probed,
+#           length_longest_probe, rehashing_count, tombstones, compaction_count, hash function name and base,
+#           minimum_tablesize, max_load_factor, growth_factor and min_load_factor (0 for no shrinking)
+#   slot index: tablesize fixed-width (key_offset, key_length, value_offset, value_length) records
+#   string heap: the UTF-8 keys and pickled values the slot index points into
+SNAPSHOT_MAGIC = b"LPTS"
+SNAPSHOT_VERSION = 2
+SNAPSHOT_HEADER = struct.Struct("<4sHHI8Q32sqQ3d")
+SNAPSHOT_SLOT = struct.Struct("<QIQI")
+# key_length of the slots holding no item
+SNAPSHOT_EMPTY = 0xFFFFFFFF
+SNAPSHOT_TOMBSTONE = 0xFFFFFFFE
+# flags
+SNAPSHOT_INCREMENTAL_REHASH = 1
 
 
-class LinearProbeTable(Generic[T]):
+class TableStatistics(tuple):
     """
-        Linear Probe Table.
+        The (conflict, total_distance_probed, length_longest_probe, rehashing_count) tuple returned by statistics().
+        Any extra counters are stored as attributes so unpacking the four values keeps working.
+    """
+
+    def __new__(cls, conflict: int, total_distance_probed: int, length_longest_probe: int, rehashing_count: int, **extra) -> TableStatistics:
+        """
+            Creates the statistics tuple and attaches the extra counters as attributes
+            :complexity: O(E) where E is the number of extra counters
+        """
+        statistics = tuple.__new__(cls, (conflict, total_distance_probed, length_longest_probe, rehashing_count))
+        statistics.__dict__.update(extra)
+        return statistics
+
+
+class RehashRecord(NamedTuple):
+    """ One resize of a table, as recorded in its rehash_log. """
+    old_tablesize: int
+    new_tablesize: int
+    count: int          # number of items moved to the new table
+    seconds: float
+    reason: str         # "grow", "reserve", "shrink" or "migrate" for the start of an incremental rehash
+
+
+class ProbeTable(ABC, Generic[T]):
+    """
+        Abstract open addressing hash table. Holds what every probing strategy shares: the tablesize and count,
+        the hash functions, the statistics counters and the resize policy. Subclasses decide where a key goes
+        by implementing the probe, and how the items are stored and moved to a resized table.
+
+        The statistics mean the same for every strategy: an insert that could not use the first slot it
+        looked at is a conflict, the number of further slots it had to look at is its probe distance,
+        total_distance_probed sums the distances and length_longest_probe is the longest one.
 
         attributes:
             count: number of elements in the hash table
             table: used to represent our internal array
             tablesize: current size of the hash table
+            tombstones: number of slots of table marking a deleted item
+            compaction_count: number of times the table was compacted to clear its tombstones
+            hash_function: the hash_functions.HashFunction used by hash, None for the default hash of this class
+            max_load_factor: the table grows when an insert finds more than this fraction of it in use
+            growth_factor: the table grows to the largest prime under growth_factor times its size
+            min_load_factor: the table shrinks when a delete leaves less than this fraction of it in use,
+                             None to never shrink
+            minimum_tablesize: the table never shrinks below this size, its initial or reserved size
+            rehash_log: a RehashRecord for every resize of the table
     """
 
+    # Marker left in the slot of a deleted item so probe sequences running through it are not cut short
+    TOMBSTONE = object()
+
+    # Fraction of the table that can hold tombstones before it is compacted
+    MAX_TOMBSTONE_RATIO = 0.25
+
+    # Default resize policy: grow to about twice the size once more than half of the table is used
+    MAX_LOAD_FACTOR = 0.5
+    GROWTH_FACTOR = 2
+
     def check_prime(self,num : int) -> bool:
         '''
         Function to check if the num is prime . Returns True or False
         :param num : the number to be checked if it is prime or not 
         :complexity: best : O(1) when num is less than or equal to 1
-                     worst: O(N) where N is num since the for loop is depending on the num 
+                     worst: O(log(num)^3) from the Miller-Rabin test in primes.is_prime
         '''
-        if num > 1:
-        # Iterate from 2 to n / 2
-            for i in range(2, int(num/2)+1):
-            # If num is divisible by any number between
-            # 2 and n / 2, it is not prime
-                if (num % i) == 0:
-                    return False
-            else:
-                return True
-        else:
-            return False
-
+        return is_prime(num)
 
-    def __init__(self, expected_size: int, tablesize_override: int = -1) -> None:
+    def __init__(self, expected_size: int, tablesize_override: int = -1, hash_function: str | HashFunction = None,
+                 max_load_factor: float = MAX_LOAD_FACTOR, growth_factor: float = GROWTH_FACTOR, min_load_factor: float = None) -> None:
         """
             Initialiser.
+            :param hash_function: the name of a hash function registered in hash_functions, or a HashFunction,
+                                  used instead of the default hash
+            :param max_load_factor: the fraction of the table in use above which an insert grows the table
+            :param growth_factor: how much bigger the table gets when it grows
+            :param min_load_factor: the fraction of the table in use below which a delete shrinks the table,
+                                    None to never shrink
+            :raises ValueError: when max_load_factor is not in (0, 1), growth_factor is not greater than 1, or
+                                min_load_factor is not in (0, max_load_factor / growth_factor) which would make
+                                a table shrink right back after growing
         """
+        if not 0 < max_load_factor < 1:
+            raise ValueError("max_load_factor must be between 0 and 1")
+        if growth_factor <= 1:
+            raise ValueError("growth_factor must be greater than 1")
+        if min_load_factor is not None and not 0 < min_load_factor < max_load_factor / growth_factor:
+            raise ValueError("min_load_factor must be between 0 and max_load_factor / growth_factor")
+
         self.count = 0
         self.tablesize = None
 
         
         if tablesize_override == -1 :
-            # if expected_size is prime number, set the table_size to expected_size
-            if self.check_prime(expected_size) :
-                self.tablesize = expected_size
-            # if expected_size is not prime number
-            else : 
-                # Increment the expected_size by 1 untill it becomes a prime number then only set it as the table_size
-                while not self.check_prime(expected_size):
-                    expected_size += 1
-                self.tablesize = expected_size    
+            # Use the smallest prime greater than or equal to expected_size as the table_size
+            self.tablesize = next_prime(expected_size)
         else : 
             # Set the table_size to tablesize_override if tablesize_override is not -1
             self.tablesize = tablesize_override
@@ -77,13 +154,30 @@ class LinearProbeTable(Generic[T]):
         self.length_longest_probe = 0
         self.rehashing_count = 0
 
+        # Deletion state
+        self.tombstones = 0
+        self.compaction_count = 0
+
+        # Resize policy
+        self.max_load_factor = max_load_factor
+        self.growth_factor = growth_factor
+        self.min_load_factor = min_load_factor
+        self.minimum_tablesize = self.tablesize
+        self.rehash_log = []
+
+        if isinstance(hash_function, str):
+            hash_function = make_hash_function(hash_function)
+        self.hash_function = hash_function
 
     def hash(self, key: str) -> int:
         """
         Hash a key for insertion into the hashtable.
         :param key : the key to hash
-        :Time complexity : Best Case = Worst Case = O(len(key))
+        :Time complexity : Best Case = Worst Case = O(len(key)) for the default hash
         """
+        if self.hash_function is not None:
+            return self.hash_function(key, self.tablesize)
+
         value = 0
         a = 31415
         b = 27183
@@ -93,82 +187,153 @@ class LinearProbeTable(Generic[T]):
 
         return value
 
-    def statistics(self) -> tuple:
+    def _hash_multipliers(self, length: int) -> list[int]:
+        """
+        Returns the value of a used by self.hash for each of the first length characters of a key
+        :Time complexity : Best Case = Worst Case = O(length)
+        """
+        multipliers = []
+        a = 31415
+        b = 27183
+        for _ in range(length):
+            multipliers.append(a)
+            a = a*b %(self.tablesize-1)
+        return multipliers
+
+    def bulk_hash(self, keys: list[str]) -> list[int]:
+        """
+        Hash a batch of keys at once, giving the same values as calling self.hash on every key.
+        The batch is hashed with NumPy when it is installed and self.hash has not been replaced,
+        otherwise every key goes through self.hash. A table built with a hash_function hashes the batch
+        with its bulk method.
+        :param keys: the keys to hash
+        :Time complexity : Best Case = Worst Case = O(N * L) where N is the number of keys and L is the length of the longest key,
+                           but only O(L) NumPy operations when the batch is vectorised
+        """
+        if 'hash' not in self.__dict__ and type(self).hash is ProbeTable.hash:
+            if self.hash_function is not None:
+                return self.hash_function.bulk(keys, self.tablesize)
+            longest = max((len(key) for key in keys), default=0)
+            hashes = polynomial_hash(keys, self.tablesize, self._hash_multipliers(longest))
+            if hashes is not None:
+                return hashes
+        return [self.hash(key) for key in keys]
+
+    def statistics(self) -> TableStatistics:
+        """
+        Return the number of conflicts,total distance probed,length of longest probe and number of times the table is rehashed.
+        The migration progress of an incremental rehash (fraction of old slots already moved, 1.0 when no migration
+        is in progress) is available as the migration_progress attribute of the result, and the number of tombstones
+        in the table and of compactions as the tombstones and compaction_count attributes.
+        The current load factor and the total time spent resizing are the load_factor and rehash_seconds attributes.
+        :Time complexity : Best Case = O(1), Worst Case = O(R) where R is the number of resizes
+        """
+        return TableStatistics(self.conflict,self.total_distance_probed,self.length_longest_probe,self.rehashing_count,
+                               migration_progress=self.migration_progress(), tombstones=self.tombstones,
+                               compaction_count=self.compaction_count, **self._policy_statistics())
+
+    def _policy_statistics(self) -> dict:
+        """
+        Returns the load_factor and rehash_seconds extras of statistics()
+        :Time complexity : Best Case = O(1), Worst Case = O(R) where R is the number of resizes
+        """
+        return {"load_factor": self.count / self.tablesize,
+                "rehash_seconds": sum(record.seconds for record in self.rehash_log)}
+
+    def _growth_threshold(self) -> int:
         """
-        Return the number of conflicts,total distance probed,length of longest probe and number of times the table is rehashed
+        Returns the largest count the table can hold without the next insert growing it
         :Time complexity : Best Case = Worst Case = O(1)
         """
-        return (self.conflict,self.total_distance_probed,self.length_longest_probe,self.rehashing_count)
+        return int(self.tablesize * self.max_load_factor)
 
-    def __len__(self) -> int:
+    def _needs_growth(self) -> bool:
         """
-            Returns number of elements in the hash table
-            :complexity: O(1)
+        Returns whether an insert has to grow the table first
+        :Time complexity : Best Case = Worst Case = O(1)
         """
-        return self.count
+        return self.count > self._growth_threshold()
 
-    def _linear_probe(self, key: str, is_insert: bool) -> int:
+    def _tablesize_for(self, items: float) -> int:
         """
-            Find the correct position for this key in the hash table using linear probing
-            :complexity best: O(K) first position is empty
-                            where K is the size of the key
-            :complexity worst: O(K + N) when we've searched the entire table
-                            where N is the tablesize
-            :raises KeyError: When a position can't be found
+        Returns the smallest prime tablesize holding items with a load of at most max_load_factor
+        :Time complexity : see primes.next_prime
         """
-        position = self.hash(key)  # get the position using hash
+        return next_prime(max(2, math.ceil(items / self.max_load_factor)))
 
-        conflict_counted = False
+    def _grown_tablesize(self) -> int:
+        """
+        Returns the size the table grows to: the largest prime under growth_factor times the largest prime
+        under the tablesize, or bigger if that would not leave room for one more item
+        :Time complexity : Best Case = O(1) when the sizes are cached, see primes.growth_prime
+        """
+        grown = growth_prime(self.tablesize, self.growth_factor) if self.tablesize > 2 else 0
+        return max(grown, self._tablesize_for(self.count + 1))
 
-        distance_probed_current = 0
+    def reserve(self, items: int) -> None:
+        """
+        Resize the table straight to a prime size that holds items without growing, and never shrink below it.
+        Does nothing if the table is already big enough.
+        :param items: the number of items the table will hold
+        :Time complexity : O(N) where N is the new tablesize if the table is resized, see _rehash
+        """
+        tablesize = self._tablesize_for(items)
+        self.minimum_tablesize = max(self.minimum_tablesize, tablesize)
+        if tablesize > self.tablesize:
+            self._rehash(tablesize, "reserve")
 
-        if is_insert and self.is_full():
-            raise KeyError(key)
+    def _maybe_shrink(self) -> None:
+        """
+        Shrink the table if less than min_load_factor of it is in use. The table shrinks to the size it
+        would have just after growing, but not below minimum_tablesize.
+        :Time complexity : Best Case = O(1) when the table does not shrink, otherwise see _rehash
+        """
+        if self.min_load_factor is None or self.count >= self.tablesize * self.min_load_factor:
+            return
+        tablesize = max(self.minimum_tablesize, self._tablesize_for(self.count * self.growth_factor))
+        if tablesize < self.tablesize:
+            self._rehash(tablesize, "shrink")
 
-        for _ in range(len(self.table)):  # start traversing
-            if self.table[position] is None:  # found empty slot
-                if is_insert:
-                    return position
-                else:
-                    raise KeyError(key)  # so the key is not in
-            elif self.table[position][0] == key:  # found key
-                return position
-            else:  # there is something but not the key, try next
-                if is_insert :
-                    if conflict_counted == False :
-                        self.conflict += 1
-                        conflict_counted = True
+    def migration_progress(self) -> float:
+        """
+        Return the fraction of the old table already migrated by an incremental rehash, 1.0 when none is in progress
+        :Time complexity : Best Case = Worst Case = O(1)
+        """
+        return 1.0
 
-                    self.total_distance_probed += 1
-                    distance_probed_current += 1
-                    
-                    # Find the longest distance probed 
-                    if distance_probed_current > self.length_longest_probe :
-                        self.length_longest_probe = distance_probed_current
+    def __len__(self) -> int:
+        """
+            Returns number of elements in the hash table
+            :complexity: O(1)
+        """
+        return self.count
 
-                position = (position + 1) % len(self.table)
+    def _record_probe(self, distance: int) -> None:
+        """
+            Update the conflict and probe statistics for an insert that probed distance slots past its hash
+            :complexity: O(1)
+        """
+        if distance > 0:
+            self.conflict += 1
+            self.total_distance_probed += distance
 
-        raise KeyError(key)
+            # Find the longest distance probed
+            if distance > self.length_longest_probe:
+                self.length_longest_probe = distance
 
+    @abstractmethod
     def keys(self) -> list[str]:
         """
             Returns all keys in the hash table.
         """
-        res = []
-        for x in range(len(self.table)):
-            if self.table[x] is not None:
-                res.append(self.table[x][0])
-        return res
+        pass
 
+    @abstractmethod
     def values(self) -> list[T]:
         """
             Returns all values in the hash table.
         """
-        res = []
-        for x in range(len(self.table)):
-            if self.table[x] is not None:
-                res.append(self.table[x][1])
-        return res
+        pass
 
     def __contains__(self, key: str) -> bool:
         """
@@ -182,32 +347,28 @@ class LinearProbeTable(Generic[T]):
         else:
             return True
 
+    @abstractmethod
     def __getitem__(self, key: str) -> T:
         """
             Get the item at a certain key
-            :see: #self._linear_probe(key: str, is_insert: bool)
             :raises KeyError: when the item doesn't exist
         """
-        position = self._linear_probe(key, False)
-        return self.table[position][1]
+        pass
 
+    @abstractmethod
     def __setitem__(self, key: str, data: T) -> None:
         """
-            Set an (key, data) pair in our hash table
-            :see: #self._linear_probe(key: str, is_insert: bool)
-            :see: #self.__contains__(key: str)
+            Set an (key, data) pair in our hash table, growing the table first if _needs_growth
         """
+        pass
 
-        # Rehash the table if the the number of items in the hash table is greater than half of its capacity
-        if self.count > ( self.tablesize // 2):
-            self._rehash()
-        
-        position = self._linear_probe(key, True)
-
-        if self.table[position] is None:
-            self.count += 1
-
-        self.table[position] = (key, data)
+    @abstractmethod
+    def __delitem__(self, key: str) -> None:
+        """
+            Delete the item with the given key
+            :raises KeyError: when the item doesn't exist
+        """
+        pass
 
     def is_empty(self):
         """
@@ -230,35 +391,83 @@ class LinearProbeTable(Generic[T]):
         """
         self[key] = data
 
-    def _rehash(self) -> None:
+    def bulk_insert(self, keys: Iterable[str], values: Iterable[T]) -> None:
         """
-            Need to resize table and reinsert all values
-            Time complexity : Best = Worst = O(len(self.table) + len(self.table) + next() ) where O(next) is O(n^2). 
-            Thus overall complexity is  O(len(self.table) + len(self.table) + O(n^2)) where n is the value of self.tablesize
+            Set every (key, value) pair, hashing the keys in batches with self.bulk_hash.
+            Items are placed exactly as if they were set one at a time, so the positions and the statistics
+            counters are the same. A batch only covers the inserts that can happen before the next rehash,
+            the rest of the keys are hashed again against the new tablesize, as they are if an insert resizes
+            the table by itself.
+            :param keys: the keys to set
+            :param values: the values to set, in the same order as keys
+            :raises ValueError: when keys and values have different lengths
+            :complexity: O(N * (L + P)) where N is the number of keys, L is the length of the longest key and P is the probe length
         """
-        self.rehashing_count += 1
-        self.count = 0
+        keys = list(keys)
+        values = list(values)
+        if len(keys) != len(values):
+            raise ValueError("keys and values must have the same length")
 
-        # Find the next biggest prime number with the upper bound of twice the value of the current table size 
-        prime_iterator = LargestPrimeIterator(self.tablesize,2)
-        next_1 = next(prime_iterator)
-        new_table_size = next(prime_iterator)
+        start = 0
+        while start < len(keys):
+            # At least this many inserts can happen before the rehash check of __setitem__ triggers
+            batch_size = max(1, self._growth_threshold() - self.count + 1)
+            batch = keys[start:start + batch_size]
+            tablesize = self.tablesize
+            for position in self.bulk_hash(batch):
+                if self._needs_growth():
+                    self._rehash()
+                    break   # the remaining hashes were computed for the old tablesize
+                self._insert_hashed(keys[start], values[start], position)
+                start += 1
+                if self.tablesize != tablesize:
+                    break
 
-        new_table = ArrayR(new_table_size)
-        
-        temp = []
-        # Copy all the items from the previous hash table to temp array
-        for item in self.table:
-            if item is not None:
-                temp.append(item)
+    @abstractmethod
+    def _insert_hashed(self, key: str, data: T, position: int) -> None:
+        """
+            Set an (key, data) pair whose hash (as returned by bulk_hash) has already been computed
+        """
+        pass
 
-        self.table = new_table
-        self.tablesize = new_table_size
+    @classmethod
+    def from_iterable(cls, items: Iterable[tuple[str, T]], expected_size: int = None, **kwargs) -> ProbeTable[T]:
+        """
+            Build a table from (key, value) pairs using bulk_insert
+            :param items: the (key, value) pairs to insert
+            :param expected_size: the expected size passed to the initialiser, defaults to the number of items
+            :param kwargs: any other argument of the initialiser
+            :see: #self.bulk_insert(keys: Iterable[str], values: Iterable[T])
+        """
+        items = list(items)
+        table = cls(len(items) if expected_size is None else expected_size, **kwargs)
+        table.bulk_insert([item[0] for item in items], [item[1] for item in items])
+        return table
 
-        # Insert back all the items from the previous hash table to the new hash table after resizing 
-        for data in temp :
-            if data is not None:
-                self[data[0]] = data[1]
+    def _rehash(self, new_table_size: int = None, reason: str = "grow") -> None:
+        """
+            Need to resize table and reinsert all values. The resize is timed and recorded in rehash_log.
+            :param new_table_size: the size to resize to, defaults to _grown_tablesize()
+            :param reason: the reason recorded in rehash_log
+            Time complexity : Best = Worst = O(_resize + growth_prime()) where growth_prime() is O(1) once the size is cached
+            and O(sqrt(n)) for the segmented sieve otherwise, where n is the value of self.tablesize
+        """
+        self.rehashing_count += 1
+        start = time.perf_counter()
+        old_table_size = self.tablesize
+        if new_table_size is None:
+            new_table_size = self._grown_tablesize()
+
+        self._resize(new_table_size)
+
+        self.rehash_log.append(RehashRecord(old_table_size, new_table_size, self.count, time.perf_counter() - start, reason))
+
+    @abstractmethod
+    def _resize(self, new_table_size: int) -> None:
+        """
+            Move every item into a new table of size new_table_size
+        """
+        pass
 
     def __str__(self) -> str:
         """
@@ -267,8 +476,1081 @@ class LinearProbeTable(Generic[T]):
             :complexity: O(N) where N is the table size
         """
         result = ""
-        for item in self.table:
-            if item is not None:
-                (key, value) = item
-                result += "(" + str(key) + "," + str(value) + ")\n"
+        for key, value in zip(self.keys(), self.values()):
+            result += "(" + str(key) + "," + str(value) + ")\n"
         return result
+
+
+class LinearProbeTable(ProbeTable[T]):
+    """
+        Linear Probe Table.
+
+        attributes:
+            count: number of elements in the hash table
+            table: used to represent our internal array
+            tablesize: current size of the hash table
+            incremental_rehash: whether the table migrates to the bigger table a few slots at a time
+            migration_step: number of old slots migrated on every __setitem__/__getitem__ when rehashing incrementally
+            old_table: the table being migrated from, None when no migration is in progress
+            old_tablesize: size of old_table
+            migration_position: index of the next slot of old_table to migrate
+            see ProbeTable for the attributes shared with the other probing strategies
+    """
+
+    # Number of old slots moved per operation, a rehash needs at least two per insert to finish before the next one
+    MIGRATION_STEP = 4
+
+    def __init__(self, expected_size: int, tablesize_override: int = -1, incremental_rehash: bool = False, migration_step: int = MIGRATION_STEP,
+                 hash_function: str | HashFunction = None, max_load_factor: float = ProbeTable.MAX_LOAD_FACTOR,
+                 growth_factor: float = ProbeTable.GROWTH_FACTOR, min_load_factor: float = None) -> None:
+        """
+            Initialiser.
+            :param incremental_rehash: if True, a resize keeps the old and new tables side by side and migrates
+                                       migration_step slots on every __setitem__/__getitem__ instead of
+                                       reinserting every item at once
+            :see: ProbeTable.__init__ for the other parameters
+        """
+        ProbeTable.__init__(self, expected_size, tablesize_override, hash_function, max_load_factor, growth_factor, min_load_factor)
+
+        # Incremental rehashing state
+        self.incremental_rehash = incremental_rehash
+        self.migration_step = max(1, migration_step)
+        self.old_table = None
+        self.old_tablesize = 0
+        self.migration_position = 0
+
+    def migration_progress(self) -> float:
+        """
+        Return the fraction of the old table already migrated, 1.0 when no incremental rehash is in progress
+        :Time complexity : Best Case = Worst Case = O(1)
+        """
+        if self.old_table is None:
+            return 1.0
+        return self.migration_position / self.old_tablesize
+
+    def is_migrating(self) -> bool:
+        """
+        Returns whether an incremental rehash is in progress
+        :complexity: O(1)
+        """
+        return self.old_table is not None
+
+    def _linear_probe(self, key: str, is_insert: bool, position: int = None) -> int:
+        """
+            Find the correct position for this key in the hash table using linear probing.
+            Tombstones are skipped, an insert of a new key reuses the first tombstone it went past.
+            :param position: the hash of the key if it has already been computed
+            :complexity best: O(K) first position is empty
+                            where K is the size of the key
+            :complexity worst: O(K + N) when we've searched the entire table
+                            where N is the tablesize
+            :raises KeyError: When a position can't be found
+        """
+        if position is None:
+            position = self.hash(key)  # get the position using hash
+
+        if is_insert and self.is_full():
+            raise KeyError(key)
+
+        first_tombstone = None
+        tombstone_distance = 0
+
+        for distance in range(len(self.table)):  # start traversing
+            item = self.table[position]
+            if item is None:  # found empty slot
+                if is_insert:
+                    if first_tombstone is not None:
+                        # the key is not in the table, reuse the first deleted slot
+                        self._record_probe(tombstone_distance)
+                        return first_tombstone
+                    self._record_probe(distance)
+                    return position
+                else:
+                    raise KeyError(key)  # so the key is not in
+            elif item is self.TOMBSTONE:  # deleted item, the key may still be further along
+                if first_tombstone is None:
+                    first_tombstone = position
+                    tombstone_distance = distance
+            elif item[0] == key:  # found key
+                if is_insert:
+                    self._record_probe(distance)
+                return position
+
+            # there is something but not the key, try next
+            position = (position + 1) % len(self.table)
+
+        if is_insert and first_tombstone is not None:
+            self._record_probe(tombstone_distance)
+            return first_tombstone
+        raise KeyError(key)
+
+    def _old_table_probe(self, key: str) -> int:
+        """
+            Find the position of the key in the old table of an incremental rehash
+            :pre: an incremental rehash is in progress
+            :complexity best: O(K) first position is empty
+                            where K is the size of the key
+            :complexity worst: O(K + N) when we've searched the entire old table
+                            where N is the old tablesize
+            :raises KeyError: When the key is not in the old table
+        """
+        # Probe the old table by hashing against the old size
+        table, tablesize = self.table, self.tablesize
+        self.table, self.tablesize = self.old_table, self.old_tablesize
+        try:
+            return self._linear_probe(key, False)
+        finally:
+            self.table, self.tablesize = table, tablesize
+
+    def _start_migration(self) -> None:
+        """
+            Start an incremental rehash: allocate the bigger table and keep the current one as the old table.
+            Any migration still in progress is finished first.
+            :complexity: O(N) to allocate the new table where N is the new tablesize
+        """
+        self._finish_migration()
+        self.rehashing_count += 1
+        start = time.perf_counter()
+
+        new_table_size = self._grown_tablesize()
+
+        self.old_table = self.table
+        self.old_tablesize = self.tablesize
+        self.migration_position = 0
+
+        self.table = ArrayR(new_table_size)
+        self.tablesize = new_table_size
+        self.tombstones = 0     # tombstones left in the old table are skipped by the migration
+
+        # Only the allocation is timed, moving the items is spread over the following operations
+        self.rehash_log.append(RehashRecord(self.old_tablesize, new_table_size, self.count,
+                                            time.perf_counter() - start, "migrate"))
+
+    def _migrate(self, slots: int) -> None:
+        """
+            Move the items of the next slots of the old table into the new table. Items whose key was already
+            set in the new table are skipped since the new table holds the latest value.
+            The old table is dropped once every slot has been migrated.
+            :param slots: the maximum number of old slots to migrate
+            :complexity: O(slots * (K + N)) where K is the size of the key and N is the tablesize
+        """
+        if self.old_table is None:
+            return
+
+        end = min(self.old_tablesize, self.migration_position + slots)
+        for item in self.old_table[self.migration_position:end]:
+            if item is not None and item is not self.TOMBSTONE:
+                position = self._linear_probe(item[0], True)
+                if self.table[position] is None:
+                    self.table[position] = item
+                elif self.table[position] is self.TOMBSTONE:
+                    self.table[position] = item
+                    self.tombstones -= 1
+        self.migration_position = end
+
+        if self.migration_position == self.old_tablesize:
+            self.old_table = None
+            self.old_tablesize = 0
+            self.migration_position = 0
+
+    def _finish_migration(self) -> None:
+        """
+            Migrate every remaining slot of an incremental rehash
+            :complexity: O(M * (K + N)) where M is the number of old slots left
+        """
+        if self.old_table is not None:
+            self._migrate(self.old_tablesize - self.migration_position)
+
+    def keys(self) -> list[str]:
+        """
+            Returns all keys in the hash table.
+        """
+        self._finish_migration()
+        return [item[0] for item in self.table if item is not None and item is not self.TOMBSTONE]
+
+    def values(self) -> list[T]:
+        """
+            Returns all values in the hash table.
+        """
+        self._finish_migration()
+        return [item[1] for item in self.table if item is not None and item is not self.TOMBSTONE]
+
+    def __getitem__(self, key: str) -> T:
+        """
+            Get the item at a certain key
+            :see: #self._linear_probe(key: str, is_insert: bool)
+            :raises KeyError: when the item doesn't exist
+        """
+        if self.incremental_rehash:
+            self._migrate(self.migration_step)
+
+        try:
+            position = self._linear_probe(key, False)
+        except KeyError:
+            # During an incremental rehash the key may not have been migrated yet
+            if self.old_table is None:
+                raise
+            position = self._old_table_probe(key)
+            return self.old_table[position][1]
+        return self.table[position][1]
+
+    def __setitem__(self, key: str, data: T) -> None:
+        """
+            Set an (key, data) pair in our hash table
+            :see: #self._linear_probe(key: str, is_insert: bool)
+            :see: #self.__contains__(key: str)
+        """
+
+        if self.incremental_rehash:
+            self._migrate(self.migration_step)
+
+        # Rehash the table if the the number of items in the hash table is greater than max_load_factor of its capacity
+        if self._needs_growth():
+            if self.incremental_rehash:
+                self._start_migration()
+            else:
+                self._rehash()
+        
+        position = self._linear_probe(key, True)
+        self._place(position, key, data)
+
+    def _place(self, position: int, key: str, data: T) -> None:
+        """
+            Store the (key, data) pair at the position returned by an insert probe, updating the count
+            and the number of tombstones.
+            :complexity: O(1) when no migration is in progress, otherwise see _in_old_table
+        """
+        item = self.table[position]
+        if item is None or item is self.TOMBSTONE:
+            # The key is new unless it is still waiting in the old table of an incremental rehash
+            if not self._in_old_table(key):
+                self.count += 1
+            if item is self.TOMBSTONE:
+                self.tombstones -= 1
+
+        self.table[position] = (key, data)
+
+    def __delitem__(self, key: str) -> None:
+        """
+            Delete the item with the given key, leaving a tombstone in its slot. Once more than
+            MAX_TOMBSTONE_RATIO of the table holds tombstones the table is compacted.
+            During an incremental rehash the key is deleted from both tables.
+            :see: #self._linear_probe(key: str, is_insert: bool)
+            :raises KeyError: when the item doesn't exist
+        """
+        found = False
+        try:
+            position = self._linear_probe(key, False)
+        except KeyError:
+            pass
+        else:
+            self.table[position] = self.TOMBSTONE
+            self.tombstones += 1
+            found = True
+
+        if self.old_table is not None:
+            try:
+                position = self._old_table_probe(key)
+            except KeyError:
+                pass
+            else:
+                self.old_table[position] = self.TOMBSTONE
+                found = True
+
+        if not found:
+            raise KeyError(key)
+        self.count -= 1
+
+        if self.tombstones > self.MAX_TOMBSTONE_RATIO * self.tablesize:
+            self._compact()
+        self._maybe_shrink()
+
+    def _compact(self) -> None:
+        """
+            Clear every tombstone by reinserting the items into the same array, keeping the tablesize
+            Time complexity : Best = Worst = O(N) where N is the tablesize
+        """
+        self._finish_migration()
+        self.compaction_count += 1
+
+        temp = [item for item in self.table if item is not None and item is not self.TOMBSTONE]
+        self.table.fill(None)
+
+        self.count = 0
+        self.tombstones = 0
+        keys = [data[0] for data in temp]
+        for data, position in zip(temp, self.bulk_hash(keys)):
+            self._insert_hashed(data[0], data[1], position)
+
+    def _in_old_table(self, key: str) -> bool:
+        """
+            Checks to see if the key is in the old table of an incremental rehash
+            :complexity: O(1) when no migration is in progress, otherwise see _old_table_probe
+        """
+        if self.old_table is None:
+            return False
+        try:
+            self._old_table_probe(key)
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def bulk_insert(self, keys: Iterable[str], values: Iterable[T]) -> None:
+        """
+            Set every (key, value) pair, tables rehashing incrementally insert one item at a time
+            :see: ProbeTable.bulk_insert
+        """
+        if not self.incremental_rehash:
+            ProbeTable.bulk_insert(self, keys, values)
+            return
+
+        keys = list(keys)
+        values = list(values)
+        if len(keys) != len(values):
+            raise ValueError("keys and values must have the same length")
+        for key, value in zip(keys, values):
+            self[key] = value
+
+    def _insert_hashed(self, key: str, data: T, position: int) -> None:
+        """
+            Set an (key, data) pair whose hash has already been computed
+            :see: #self._linear_probe(key: str, is_insert: bool, position: int)
+        """
+        position = self._linear_probe(key, True, position)
+        self._place(position, key, data)
+
+    def _resize(self, new_table_size: int) -> None:
+        """
+            Move every item into a new table of size new_table_size
+            Any incremental rehash in progress is finished first.
+            Time complexity : Best = Worst = O(N + M) where N is the old and M the new tablesize
+        """
+        self._finish_migration()
+        self.count = 0
+        self.tombstones = 0
+
+        new_table = ArrayR(new_table_size)
+        
+        temp = []
+        # Copy all the items from the previous hash table to temp array
+        for item in self.table:
+            if item is not None and item is not self.TOMBSTONE:
+                temp.append(item)
+
+        self.table = new_table
+        self.tablesize = new_table_size
+
+        # Insert back all the items from the previous hash table to the new hash table after resizing 
+        keys = [data[0] for data in temp]
+        for data, position in zip(temp, self.bulk_hash(keys)):
+            self._insert_hashed(data[0], data[1], position)
+
+    def _hash_function_spec(self) -> tuple[str, int]:
+        """
+            Returns the (name, base) of the hash function to record in a snapshot, ("", 0) for the default hash
+            :raises ValueError: when the hash cannot be recreated on load, i.e. it was replaced on the instance
+                                or the hash function is not registered in hash_functions
+        """
+        if 'hash' in self.__dict__:
+            raise ValueError("cannot save a table whose hash method was replaced")
+        if self.hash_function is None:
+            return "", 0
+        if HASH_FUNCTIONS.get(self.hash_function.name) is not type(self.hash_function):
+            raise ValueError("cannot save a table using the unregistered hash function " + str(self.hash_function))
+        return self.hash_function.name, getattr(self.hash_function, "base", 0)
+
+    def save(self, path: str) -> None:
+        """
+            Write the table to a binary snapshot: a header with the tablesize, count and statistics counters,
+            a fixed-width index of every slot and a heap holding the UTF-8 keys and pickled values.
+            Items keep their positions, so loading needs no hashing.
+            Any incremental rehash in progress is finished first.
+            :param path: the file to write
+            :raises TypeError: for subclasses storing extra per-slot state
+            :raises ValueError: see _hash_function_spec
+            :complexity: O(N + S) where N is the tablesize and S the total size of the keys and values
+        """
+        if type(self) not in (LinearProbeTable, MappedProbeTable):
+            raise TypeError("snapshots only support LinearProbeTable, not " + type(self).__name__)
+        hash_name, hash_base = self._hash_function_spec()
+        self._finish_migration()
+
+        index = bytearray(SNAPSHOT_SLOT.size * self.tablesize)
+        heap = bytearray()
+        for position in range(self.tablesize):
+            item = self.table[position]
+            if item is None:
+                record = (0, SNAPSHOT_EMPTY, 0, 0)
+            elif item is self.TOMBSTONE:
+                record = (0, SNAPSHOT_TOMBSTONE, 0, 0)
+            else:
+                key = item[0].encode("utf-8", "surrogatepass")
+                value = pickle.dumps(item[1], pickle.HIGHEST_PROTOCOL)
+                record = (len(heap), len(key), len(heap) + len(key), len(value))
+                heap += key
+                heap += value
+            SNAPSHOT_SLOT.pack_into(index, position * SNAPSHOT_SLOT.size, *record)
+
+        flags = SNAPSHOT_INCREMENTAL_REHASH if self.incremental_rehash else 0
+        header = SNAPSHOT_HEADER.pack(SNAPSHOT_MAGIC, SNAPSHOT_VERSION, flags, self.migration_step,
+                                      self.tablesize, self.count, self.conflict, self.total_distance_probed,
+                                      self.length_longest_probe, self.rehashing_count, self.tombstones,
+                                      self.compaction_count, hash_name.encode("ascii"), hash_base, self.minimum_tablesize,
+                                      self.max_load_factor, self.growth_factor, self.min_load_factor or 0.0)
+        with open(path, "wb") as snapshot_file:
+            snapshot_file.write(header)
+            snapshot_file.write(index)
+            snapshot_file.write(heap)
+
+    @classmethod
+    def load(cls, path: str, mmap: bool = True) -> LinearProbeTable[T]:
+        """
+            Load a table written by save.
+            With mmap the file is memory-mapped and a MappedProbeTable is returned: lookups read the slot index
+            and the keys straight from the mapping and only unpickle the value that was asked for, so loading
+            costs the same whatever the size of the table. The items are copied into memory the first time the
+            table is modified.
+            Without mmap the file is read and every item is unpickled into a LinearProbeTable.
+            :param path: the file to read
+            :raises ValueError: when the file is not a snapshot
+            :complexity: O(1) with mmap, otherwise O(N + S) where N is the tablesize and S the size of the file
+        """
+        with open(path, "rb") as snapshot_file:
+            if mmap:
+                buffer = mmap_module.mmap(snapshot_file.fileno(), 0, access=mmap_module.ACCESS_READ)
+            else:
+                buffer = snapshot_file.read()
+        if len(buffer) < SNAPSHOT_HEADER.size:
+            raise ValueError(path + " is not a hash table snapshot")
+
+        (magic, version, flags, migration_step, tablesize, count, conflict, total_distance_probed, length_longest_probe,
+         rehashing_count, tombstones, compaction_count, hash_name, hash_base, minimum_tablesize, max_load_factor, growth_factor,
+         min_load_factor) = SNAPSHOT_HEADER.unpack_from(buffer, 0)
+        if magic != SNAPSHOT_MAGIC or version != SNAPSHOT_VERSION:
+            raise ValueError(path + " is not a hash table snapshot")
+
+        hash_name = hash_name.rstrip(b"\0").decode("ascii")
+        hash_function = None
+        if hash_name:
+            hash_function = make_hash_function(hash_name, base=hash_base) if hash_base else make_hash_function(hash_name)
+
+        # Start from the smallest table, its slots are replaced by the snapshot
+        table_class = MappedProbeTable if mmap else LinearProbeTable
+        table = table_class(1, tablesize_override=1, incremental_rehash=bool(flags & SNAPSHOT_INCREMENTAL_REHASH),
+                            migration_step=migration_step, hash_function=hash_function, max_load_factor=max_load_factor,
+                            growth_factor=growth_factor, min_load_factor=min_load_factor or None)
+        table.tablesize = tablesize
+        table.count = count
+        table.conflict = conflict
+        table.total_distance_probed = total_distance_probed
+        table.length_longest_probe = length_longest_probe
+        table.rehashing_count = rehashing_count
+        table.tombstones = tombstones
+        table.compaction_count = compaction_count
+        table.minimum_tablesize = minimum_tablesize
+
+        slots = SnapshotSlots(buffer, tablesize)
+        if mmap:
+            table.table = slots
+        else:
+            table.table = ArrayR.from_iterable(slots)
+        return table
+
+    def __str__(self) -> str:
+        """
+            Returns all they key/value pairs in our hash table (no particular
+            order).
+            :complexity: O(N) where N is the table size
+        """
+        self._finish_migration()
+        result = ""
+        for item in self.table:
+            if item is not None and item is not self.TOMBSTONE:
+                (key, value) = item
+                result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
+
+class RobinHoodProbeTable(LinearProbeTable[T]):
+    """
+        Linear Probe Table using Robin Hood hashing.
+        On insert, an item that has probed further than the item occupying a slot takes that slot and the
+        displaced item continues probing, which keeps every probe sequence short. Lookups stop as soon as
+        they reach an item closer to its home slot than the key would be, and deletion shifts the following
+        items back instead of leaving a gap.
+
+        attributes:
+            distances: probe sequence length of the item in each slot (its distance from its home slot), 0 when empty
+            total_probe_length: sum of the probe sequence lengths of every item in the table
+    """
+
+    # The distances are stored unboxed as signed 64 bit integers
+    DISTANCE_TYPECODE = 'q'
+
+    def __init__(self, expected_size: int, tablesize_override: int = -1, hash_function: str | HashFunction = None,
+                 max_load_factor: float = LinearProbeTable.MAX_LOAD_FACTOR, growth_factor: float = LinearProbeTable.GROWTH_FACTOR,
+                 min_load_factor: float = None) -> None:
+        """
+            Initialiser.
+            :param hash_function: see LinearProbeTable
+            :param max_load_factor: see LinearProbeTable
+            :param growth_factor: see LinearProbeTable
+            :param min_load_factor: see LinearProbeTable
+        """
+        LinearProbeTable.__init__(self, expected_size, tablesize_override, hash_function=hash_function, max_load_factor=max_load_factor,
+                                  growth_factor=growth_factor, min_load_factor=min_load_factor)
+        self.distances = ArrayF(self.tablesize, self.DISTANCE_TYPECODE)
+        self.total_probe_length = 0
+
+    def statistics(self) -> TableStatistics:
+        """
+        Return the number of conflicts,total distance probed,length of longest probe and number of times the table is rehashed.
+        The mean probe sequence length of the items currently in the table is available as the average_probe_length attribute.
+        :Time complexity : Best Case = Worst Case = O(1)
+        """
+        average_probe_length = self.total_probe_length / self.count if self.count > 0 else 0.0
+        return TableStatistics(self.conflict,self.total_distance_probed,self.length_longest_probe,self.rehashing_count,
+                               migration_progress=1.0, tombstones=0, compaction_count=0,
+                               average_probe_length=average_probe_length, **self._policy_statistics())
+
+    def _linear_probe(self, key: str, is_insert: bool, position: int = None) -> int:
+        """
+            Find the position of this key in the hash table. The probe stops early once it reaches an empty slot
+            or an item with a shorter probe sequence than the key would have at that point.
+            Insertions do not use this method since they may displace items, see _insert_hashed.
+            :param position: the hash of the key if it has already been computed
+            :complexity best: O(K) first position is empty
+                            where K is the size of the key
+            :complexity worst: O(K + D) where D is the longest probe sequence length in the table
+            :raises KeyError: When the key is not in the table
+        """
+        if position is None:
+            position = self.hash(key)  # get the position using hash
+
+        for distance in range(len(self.table)):
+            item = self.table[position]
+            if item is None or self.distances[position] < distance:  # the key would have been placed here
+                raise KeyError(key)
+            elif item[0] == key:  # found key
+                return position
+            position = (position + 1) % len(self.table)
+
+        raise KeyError(key)
+
+    def __setitem__(self, key: str, data: T) -> None:
+        """
+            Set an (key, data) pair in our hash table
+            :see: #self._insert_hashed(key: str, data: T, position: int)
+        """
+
+        # Rehash the table if the the number of items in the hash table is greater than max_load_factor of its capacity
+        if self._needs_growth():
+            self._rehash()
+
+        self._insert_hashed(key, data, self.hash(key))
+
+    def _insert_hashed(self, key: str, data: T, position: int) -> None:
+        """
+            Set an (key, data) pair whose hash has already been computed using Robin Hood insertion:
+            whenever the item being placed has probed further than the item in the current slot, they swap
+            and the displaced item carries on probing.
+            :complexity best: O(1) the home slot is empty
+            :complexity worst: O(N) where N is the tablesize
+            :raises KeyError: When the table is full
+        """
+        if self.is_full():
+            raise KeyError(key)
+
+        item = (key, data)
+        distance = 0
+        displaced = False   # once an item has been displaced the carried key cannot already be in the table
+
+        for _ in range(len(self.table)):
+            current = self.table[position]
+            if current is None:  # found empty slot
+                self.table[position] = item
+                self.distances[position] = distance
+                self.count += 1
+                self.total_probe_length += distance
+                break
+            elif not displaced and current[0] == key:  # found key, replace its data
+                self.table[position] = item
+                break
+            elif self.distances[position] < distance:  # the current item is closer to home, take its slot
+                self.table[position], item = item, current
+                self.distances[position], distance = distance, self.distances[position]
+                self.total_probe_length += self.distances[position] - distance
+                displaced = True
+
+            # there is something but not the key, try next
+            if distance == 0 and not displaced:
+                self.conflict += 1
+            self.total_distance_probed += 1
+            distance += 1
+
+            # Find the longest probe sequence
+            if distance > self.length_longest_probe:
+                self.length_longest_probe = distance
+
+            position = (position + 1) % len(self.table)
+
+    def __delitem__(self, key: str) -> None:
+        """
+            Delete the item with the given key using backward-shift deletion: every following item that is not
+            in its home slot moves back one slot, so no tombstone is needed.
+            :complexity best: O(K) the next slot is empty or holds an item in its home slot
+                            where K is the size of the key
+            :complexity worst: O(K + N) where N is the tablesize
+            :raises KeyError: when the item doesn't exist
+        """
+        position = self._linear_probe(key, False)
+        self.total_probe_length -= self.distances[position]
+        self.count -= 1
+
+        next_position = (position + 1) % len(self.table)
+        while self.table[next_position] is not None and self.distances[next_position] > 0:
+            self.table[position] = self.table[next_position]
+            self.distances[position] = self.distances[next_position] - 1
+            self.total_probe_length -= 1
+            position = next_position
+            next_position = (position + 1) % len(self.table)
+
+        self.table[position] = None
+        self.distances[position] = 0
+        self._maybe_shrink()
+
+    def _resize(self, new_table_size: int) -> None:
+        """
+            Move every item into new arrays of size new_table_size
+            Time complexity : Best = Worst = O(N + M) where N is the old and M the new tablesize
+        """
+        self.count = 0
+        self.total_probe_length = 0
+
+        temp = []
+        # Copy all the items from the previous hash table to temp array
+        for item in self.table:
+            if item is not None:
+                temp.append(item)
+
+        self.table = ArrayR(new_table_size)
+        self.distances = ArrayF(new_table_size, self.DISTANCE_TYPECODE)
+        self.tablesize = new_table_size
+
+        # Insert back all the items from the previous hash table to the new hash table after resizing
+        keys = [data[0] for data in temp]
+        for data, position in zip(temp, self.bulk_hash(keys)):
+            self._insert_hashed(data[0], data[1], position)
+
+
+class CompactProbeTable(LinearProbeTable[T]):
+    """
+        Linear Probe Table storing its slots as a structure of arrays instead of one (key, data) tuple per slot.
+        Setting an item allocates nothing, and each slot also caches the full hash of its key: probes compare
+        the cached hash before the strings, and rehashing places items from the cached hash without hashing
+        any key again. The full hash is the hash function applied with a range of 2^63 rather than the
+        tablesize, and it is reduced mod tablesize to get the position. Incremental rehashing is not supported.
+
+        The default hash function is the 64-bit FNV-1a, so the layout and the statistics are the same in
+        every run. "builtin" is faster as strings cache their builtin hash, but Python salts it
+        per process (unless PYTHONHASHSEED is set), so the layout then changes from run to run.
+
+        The key and data arrays are plain lists rather than ArrayR: a ctypes py_object array keeps a
+        reference to every object stored in it in a dictionary keyed by the index, which costs more
+        memory per slot than the tuple this class avoids.
+
+        attributes:
+            table: the key stored in each slot (None when empty, TOMBSTONE when deleted)
+            slot_values: the data stored in each slot
+            slot_hashes: the full hash of the key stored in each slot
+    """
+
+    # Hash function of the full hashes unless another one is given
+    FULL_HASH_FUNCTION = "fnv1a"
+
+    # Range of the full hashes, they fit the signed 64 bit integers of slot_hashes
+    FULL_HASH_RANGE = sys.maxsize + 1
+
+    def __init__(self, expected_size: int, tablesize_override: int = -1, max_load_factor: float = LinearProbeTable.MAX_LOAD_FACTOR,
+                 growth_factor: float = LinearProbeTable.GROWTH_FACTOR, min_load_factor: float = None,
+                 hash_function: str | HashFunction = FULL_HASH_FUNCTION) -> None:
+        """
+            Initialiser.
+            :param hash_function: see LinearProbeTable, it is called with FULL_HASH_RANGE as the tablesize
+            :param max_load_factor: see LinearProbeTable
+            :param growth_factor: see LinearProbeTable
+            :param min_load_factor: see LinearProbeTable
+        """
+        LinearProbeTable.__init__(self, expected_size, tablesize_override, hash_function=hash_function, max_load_factor=max_load_factor,
+                                  growth_factor=growth_factor, min_load_factor=min_load_factor)
+        self._allocate(self.tablesize)
+
+    def _allocate(self, tablesize: int) -> None:
+        """
+            Allocate empty parallel arrays for tablesize slots
+            :complexity: O(N) where N is tablesize
+        """
+        self.table = [None] * tablesize
+        self.slot_values = [None] * tablesize
+        self.slot_hashes = array('q', bytes(8 * tablesize))
+        self.tablesize = tablesize
+
+    def full_hash(self, key: str) -> int:
+        """
+        Hash of the key that does not depend on the tablesize, so it survives rehashing.
+        :Time complexity : Best Case = Worst Case = O(len(key)) for fnv1a, O(1) for builtin after the first
+                           call on a key as strings cache their builtin hash
+        """
+        return self.hash_function(key, self.FULL_HASH_RANGE)
+
+    def hash(self, key: str) -> int:
+        """
+        Hash a key for insertion into the hashtable.
+        :Time complexity : see full_hash
+        """
+        return self.full_hash(key) % self.tablesize
+
+    def bulk_hash(self, keys: list[str]) -> list[int]:
+        """
+        Returns the full hash of every key, _insert_hashed reduces it to a position
+        :Time complexity : Best Case = Worst Case = O(N) where N is the number of keys
+        """
+        return [self.full_hash(key) for key in keys]
+
+    def _linear_probe(self, key: str, is_insert: bool, key_hash: int = None) -> int:
+        """
+            Find the correct position for this key in the hash table using linear probing.
+            A slot is only compared with the key when its cached hash matches.
+            :param key_hash: the full hash of the key if it has already been computed
+            :complexity best: O(1) first position is empty
+            :complexity worst: O(N) when we've searched the entire table
+                            where N is the tablesize
+            :raises KeyError: When a position can't be found
+        """
+        if key_hash is None:
+            key_hash = self.full_hash(key)
+
+        if is_insert and self.is_full():
+            raise KeyError(key)
+
+        keys = self.table
+        hashes = self.slot_hashes
+        tablesize = self.tablesize
+        position = key_hash % tablesize
+        first_tombstone = None
+        tombstone_distance = 0
+
+        for distance in range(tablesize):  # start traversing
+            slot_key = keys[position]
+            if slot_key is None:  # found empty slot
+                if is_insert:
+                    if first_tombstone is not None:
+                        # the key is not in the table, reuse the first deleted slot
+                        self._record_probe(tombstone_distance)
+                        return first_tombstone
+                    self._record_probe(distance)
+                    return position
+                else:
+                    raise KeyError(key)  # so the key is not in
+            elif slot_key is self.TOMBSTONE:  # deleted item, the key may still be further along
+                if first_tombstone is None:
+                    first_tombstone = position
+                    tombstone_distance = distance
+            elif hashes[position] == key_hash and slot_key == key:  # found key
+                if is_insert:
+                    self._record_probe(distance)
+                return position
+
+            # there is something but not the key, try next
+            position = (position + 1) % tablesize
+
+        if is_insert and first_tombstone is not None:
+            self._record_probe(tombstone_distance)
+            return first_tombstone
+        raise KeyError(key)
+
+    def __getitem__(self, key: str) -> T:
+        """
+            Get the item at a certain key
+            :see: #self._linear_probe(key: str, is_insert: bool)
+            :raises KeyError: when the item doesn't exist
+        """
+        return self.slot_values[self._linear_probe(key, False)]
+
+    def __setitem__(self, key: str, data: T) -> None:
+        """
+            Set an (key, data) pair in our hash table
+            :see: #self._insert_hashed(key: str, data: T, key_hash: int)
+        """
+
+        # Rehash the table if the the number of items in the hash table is greater than max_load_factor of its capacity
+        if self._needs_growth():
+            self._rehash()
+
+        self._insert_hashed(key, data, self.full_hash(key))
+
+    def _insert_hashed(self, key: str, data: T, key_hash: int) -> None:
+        """
+            Set an (key, data) pair whose full hash has already been computed
+            :see: #self._linear_probe(key: str, is_insert: bool, key_hash: int)
+        """
+        position = self._linear_probe(key, True, key_hash)
+
+        slot_key = self.table[position]
+        if slot_key is None or slot_key is self.TOMBSTONE:
+            self.count += 1
+            if slot_key is self.TOMBSTONE:
+                self.tombstones -= 1
+
+        self.table[position] = key
+        self.slot_values[position] = data
+        self.slot_hashes[position] = key_hash
+
+    def __delitem__(self, key: str) -> None:
+        """
+            Delete the item with the given key, leaving a tombstone in its slot
+            :see: #LinearProbeTable.__delitem__(key: str)
+            :raises KeyError: when the item doesn't exist
+        """
+        position = self._linear_probe(key, False)
+        self.table[position] = self.TOMBSTONE
+        self.slot_values[position] = None
+        self.tombstones += 1
+        self.count -= 1
+
+        if self.tombstones > self.MAX_TOMBSTONE_RATIO * self.tablesize:
+            self._compact()
+        self._maybe_shrink()
+
+    def _live_slots(self) -> list[tuple[str, T, int]]:
+        """
+            Returns the (key, data, full hash) of every item in the table
+            :complexity: O(N) where N is the tablesize
+        """
+        slots = []
+        for x in range(len(self.table)):
+            slot_key = self.table[x]
+            if slot_key is not None and slot_key is not self.TOMBSTONE:
+                slots.append((slot_key, self.slot_values[x], self.slot_hashes[x]))
+        return slots
+
+    def _reinsert(self, slots: list[tuple[str, T, int]]) -> None:
+        """
+            Insert back items taken from _live_slots using their cached full hash
+            :complexity: O(M * P) where M is the number of items and P the probe length
+        """
+        self.count = 0
+        self.tombstones = 0
+        for key, data, key_hash in slots:
+            self._insert_hashed(key, data, key_hash)
+
+    def _compact(self) -> None:
+        """
+            Clear every tombstone by reinserting the items into new arrays of the same size
+            Time complexity : Best = Worst = O(N) where N is the tablesize
+        """
+        self.compaction_count += 1
+        slots = self._live_slots()
+        self._allocate(self.tablesize)
+        self._reinsert(slots)
+
+    def _resize(self, new_table_size: int) -> None:
+        """
+            Move every item into new arrays of size new_table_size, reusing the cached full hashes
+            Time complexity : Best = Worst = O(N + M) where N is the old and M the new tablesize
+        """
+        slots = self._live_slots()
+        self._allocate(new_table_size)
+        self._reinsert(slots)
+
+    def keys(self) -> list[str]:
+        """
+            Returns all keys in the hash table.
+        """
+        return [slot[0] for slot in self._live_slots()]
+
+    def values(self) -> list[T]:
+        """
+            Returns all values in the hash table.
+        """
+        return [slot[1] for slot in self._live_slots()]
+
+    def __str__(self) -> str:
+        """
+            Returns all they key/value pairs in our hash table (no particular
+            order).
+            :complexity: O(N) where N is the table size
+        """
+        result = ""
+        for key, value, _ in self._live_slots():
+            result += "(" + str(key) + "," + str(value) + ")\n"
+        return result
+
+
+class SnapshotSlots:
+    """
+        Read-only view of the slots of a snapshot written by LinearProbeTable.save, indexed like the table
+        of a LinearProbeTable. Items are decoded from the buffer every time they are accessed.
+
+        attributes:
+            buffer: the snapshot, a memory map or bytes
+            tablesize: number of slots
+            heap_offset: position of the string heap in the buffer
+    """
+
+    def __init__(self, buffer, tablesize: int) -> None:
+        """
+            Initialiser.
+            :raises ValueError: when the buffer is too short to hold the slot index
+        """
+        self.buffer = buffer
+        self.tablesize = tablesize
+        self.heap_offset = SNAPSHOT_HEADER.size + SNAPSHOT_SLOT.size * tablesize
+        if len(buffer) < self.heap_offset:
+            raise ValueError("truncated hash table snapshot")
+
+    def __len__(self) -> int:
+        """
+            Returns the number of slots
+            :complexity: O(1)
+        """
+        return self.tablesize
+
+    def record(self, position: int) -> tuple[int, int, int, int]:
+        """
+            Returns the (key_offset, key_length, value_offset, value_length) record of the slot
+            :complexity: O(1)
+        """
+        return SNAPSHOT_SLOT.unpack_from(self.buffer, SNAPSHOT_HEADER.size + SNAPSHOT_SLOT.size * position)
+
+    def key_bytes(self, record: tuple[int, int, int, int]) -> bytes:
+        """
+            Returns the UTF-8 key of an occupied slot record
+            :complexity: O(K) where K is the size of the key
+        """
+        start = self.heap_offset + record[0]
+        return self.buffer[start:start + record[1]]
+
+    def value(self, record: tuple[int, int, int, int]) -> object:
+        """
+            Returns the value of an occupied slot record
+            :complexity: O(V) where V is the size of the pickled value
+        """
+        start = self.heap_offset + record[2]
+        return pickle.loads(self.buffer[start:start + record[3]])
+
+    def __getitem__(self, position: int) -> tuple[str, object] | None:
+        """
+            Returns the (key, value) pair in the slot, None when it is empty and LinearProbeTable.TOMBSTONE when
+            its item was deleted
+            :complexity: O(K + V) where K is the size of the key and V the size of the pickled value
+        """
+        if not 0 <= position < self.tablesize:
+            raise IndexError(position)
+        record = self.record(position)
+        if record[1] == SNAPSHOT_EMPTY:
+            return None
+        if record[1] == SNAPSHOT_TOMBSTONE:
+            return LinearProbeTable.TOMBSTONE
+        return self.key_bytes(record).decode("utf-8", "surrogatepass"), self.value(record)
+
+    def close(self) -> None:
+        """
+            Release the memory map
+            :complexity: O(1)
+        """
+        if isinstance(self.buffer, mmap_module.mmap):
+            self.buffer.close()
+
+
+class MappedProbeTable(LinearProbeTable[T]):
+    """
+        Linear Probe Table returned by LinearProbeTable.load with mmap. Its table is the SnapshotSlots of the
+        memory-mapped snapshot until the first modification, which copies every item into an ArrayR and closes
+        the mapping. From then on it behaves exactly like a LinearProbeTable.
+
+        attributes:
+            table: SnapshotSlots while the table is mapped, then an ArrayR
+    """
+
+    def is_mapped(self) -> bool:
+        """
+            Returns whether the slots are still read from the snapshot
+            :complexity: O(1)
+        """
+        return isinstance(self.table, SnapshotSlots)
+
+    def _linear_probe(self, key: str, is_insert: bool, position: int = None) -> int:
+        """
+            Find the position of the key, comparing the encoded key against the keys of the snapshot without
+            decoding them while the table is mapped.
+            :see: LinearProbeTable._linear_probe
+            :raises KeyError: When a position can't be found
+        """
+        if is_insert or not self.is_mapped():
+            return LinearProbeTable._linear_probe(self, key, is_insert, position)
+
+        if position is None:
+            position = self.hash(key)
+        encoded = key.encode("utf-8", "surrogatepass")
+        for _ in range(self.tablesize):
+            record = self.table.record(position)
+            if record[1] == SNAPSHOT_EMPTY:
+                break
+            if record[1] == len(encoded) and self.table.key_bytes(record) == encoded:
+                return position
+            position = (position + 1) % self.tablesize
+        raise KeyError(key)
+
+    def __getitem__(self, key: str) -> T:
+        """
+            Get the item at a certain key, only unpickling its value while the table is mapped
+            :see: LinearProbeTable.__getitem__
+            :raises KeyError: when the item doesn't exist
+        """
+        if not self.is_mapped():
+            return LinearProbeTable.__getitem__(self, key)
+        return self.table.value(self.table.record(self._linear_probe(key, False)))
+
+    def materialize(self) -> None:
+        """
+            Copy every item of the snapshot into an ArrayR and close the memory map
+            :complexity: O(N + S) where N is the tablesize and S the size of the snapshot
+        """
+        if not self.is_mapped():
+            return
+        slots = self.table
+        self.table = ArrayR.from_iterable(slots)
+        slots.close()
+
+    def close(self) -> None:
+        """
+            Close the memory map, the table can no longer be used if it was not materialized
+            :complexity: O(1)
+        """
+        if self.is_mapped():
+            self.table.close()
+
+    def __setitem__(self, key: str, data: T) -> None:
+        """
+            Set an (key, data) pair, copying the snapshot into memory first
+            :see: LinearProbeTable.__setitem__
+        """
+        self.materialize()
+        LinearProbeTable.__setitem__(self, key, data)
+
+    def __delitem__(self, key: str) -> None:
+        """
+            Delete the item with the given key, copying the snapshot into memory first
+            :see: LinearProbeTable.__delitem__
+        """
+        self.materialize()
+        LinearProbeTable.__delitem__(self, key)
+
+    def bulk_insert(self, keys: Iterable[str], values: Iterable[T]) -> None:
+        """
+            Set every (key, value) pair, copying the snapshot into memory first
+            :see: LinearProbeTable.bulk_insert
+        """
+        self.materialize()
+        LinearProbeTable.bulk_insert(self, keys, values)
@@ -1,7 +1,8 @@
 """Max Heap implemented using an array"""
 from __future__ import annotations
-from typing import Generic
-from referential_array import ArrayR, T
+import operator
+from typing import Callable, Generic, Iterable
+from referential_array import ArrayR, ArrayF, T, HAS_NUMPY
 
 __author__ = "Brendon Taylor, modified by Jackson Goerner and Rachit Bhatia"
 __docformat__ = 'reStructuredText'
@@ -32,8 +33,7 @@ class MaxHeap(Generic[T]):
         if an_array is not None:
 
             # copy an_array to self.the_array (shift by 1)
-            for i in range(self.length):    #complexity: O(max_size)
-                self.the_array[i+1] = an_array[i]
+            self.the_array.copy_from(an_array, 0, 1, self.length)    #complexity: O(max_size)
                 
             # heapify every parent
             for i in range(max_size//2,0,-1):   #complexity: O(max_size/2)
@@ -139,6 +139,582 @@ class MaxHeap(Generic[T]):
             self.sink(1)
         return max_elt
 
+    def peek_max(self) -> T:
+        """ Returns the maximum element without removing it.
+            :raises IndexError: when the heap is empty
+            :complexity: O(1)
+        """
+        if self.length == 0:
+            raise IndexError
+        return self.the_array[1]
+
+    def replace_top(self, element: T) -> T:
+        """ Replaces the maximum element by a new element, with a single sink rather than a get_max
+            followed by an add.
+            :returns: the replaced element
+            :raises IndexError: when the heap is empty
+            :complexity: see MaxHeap.sink
+        """
+        if self.length == 0:
+            raise IndexError
+
+        replaced = self.the_array[1]
+        self.the_array[1] = element
+        self.sink(1)
+        return replaced
+
+
+class NumericMaxHeap(MaxHeap[T]):
+    """
+    Max Heap of 'key, value' elements whose keys are numbers. The keys are kept unboxed in an ArrayF
+    parallel to an ArrayR of the values, so no tuple is stored per node and the sift loops compare
+    plain floats. Elements are still added and returned as (key, value) tuples.
+
+    attributes:
+        keys: the key of each node, from index 1
+        the_array: the value of each node, from index 1
+    """
+
+    def __init__(self, max_size: int, an_array: ArrayR[tuple[float, T]] = None) -> None:
+        """
+        Creates a Numeric Max Heap object. If an array is passed as a parameter, a Bottom-up Max Heap is set up using the array.
+
+        :param max_size: the number of nodes to be created in the heap
+        :param an_array: the array of key, value pairs used for creation of a bottom-up heap
+        :complexity: Best-case = Worst-case = O(max_size)
+        """
+        self.keys = ArrayF(max(self.MIN_CAPACITY, max_size) + 1)
+        self.the_array = ArrayR(max(self.MIN_CAPACITY, max_size) + 1)
+        self.length = max_size
+
+        if an_array is not None:
+            elements = an_array[0:self.length]
+            self.keys[1:self.length + 1] = [element[0] for element in elements]
+            self.the_array[1:self.length + 1] = [element[1] for element in elements]
+
+            for i in range(max_size//2,0,-1):
+                self.sink(i)
+
+    def rise(self, k: int) -> None:
+        """
+        Rise element at index k to its correct position
+        :pre: 1 <= k <= self.length
+        :complexity: see MaxHeap.rise
+        """
+        keys = self.keys
+        key = keys[k]
+        value = self.the_array[k]
+        while k > 1 and key > keys[k // 2]:
+            keys[k] = keys[k // 2]
+            self.the_array[k] = self.the_array[k // 2]
+            k = k // 2
+        keys[k] = key
+        self.the_array[k] = value
+
+    def add(self, element: tuple[float, T]) -> None:
+        """
+        Adds a (key, value) element
+        :raises IndexError: when the heap is full
+        :complexity: see MaxHeap.add
+        """
+        if self.is_full():
+            raise IndexError
+
+        self.length += 1
+        self.keys[self.length] = element[0]
+        self.the_array[self.length] = element[1]
+        self.rise(self.length)
+
+    def largest_child(self, k: int) -> int:
+        """
+        Returns the index of k's child with greatest key.
+        :pre: 1 <= k <= self.length // 2
+        :complexity: Best-case = Worst-case = O(1)
+        """
+        if 2 * k == self.length or self.keys[2 * k] > self.keys[2 * k + 1]:
+            return 2 * k
+        else:
+            return 2 * k + 1
+
+    def sink(self, k: int) -> None:
+        """ Make the element at index k sink to the correct position.
+            :pre: 1 <= k <= self.length
+            :complexity: see MaxHeap.sink
+        """
+        keys = self.keys
+        key = keys[k]
+        value = self.the_array[k]
+
+        while 2 * k <= self.length:
+            max_child = self.largest_child(k)
+            if keys[max_child] <= key:
+                break
+            keys[k] = keys[max_child]
+            self.the_array[k] = self.the_array[max_child]
+            k = max_child
+
+        keys[k] = key
+        self.the_array[k] = value
+
+    def get_max(self) -> tuple[float, T]:
+        """ Remove (and return) the (key, value) element with the maximum key.
+            :raises IndexError: when the heap is empty
+            :complexity: see MaxHeap.get_max
+        """
+        if self.length == 0:
+            raise IndexError
+
+        max_elt = (self.keys[1], self.the_array[1])
+        self.length -= 1
+        if self.length > 0:
+            self.keys[1] = self.keys[self.length + 1]
+            self.the_array[1] = self.the_array[self.length + 1]
+            self.sink(1)
+        return max_elt
+
+    def peek_max(self) -> tuple[float, T]:
+        """ Returns the (key, value) element with the maximum key, without removing it.
+            :raises IndexError: when the heap is empty
+            :complexity: O(1)
+        """
+        if self.length == 0:
+            raise IndexError
+        return self.keys[1], self.the_array[1]
+
+    def replace_top(self, element: tuple[float, T]) -> tuple[float, T]:
+        """ Replaces the element with the maximum key by a new (key, value) element, with a single sink
+            rather than a get_max followed by an add.
+            In an IndexedMaxHeap the new element takes over the handle of the element it replaces.
+            :returns: the replaced (key, value) element
+            :raises IndexError: when the heap is empty
+            :complexity: see MaxHeap.sink
+        """
+        if self.length == 0:
+            raise IndexError
+
+        replaced = (self.keys[1], self.the_array[1])
+        self.keys[1] = element[0]
+        self.the_array[1] = element[1]
+        self.sink(1)
+        return replaced
+
+    def count_at_least(self, threshold: float) -> int:
+        """ Returns the number of elements whose key is at least threshold, scanning the keys with NumPy
+            when it is installed
+            :complexity: Best-case = Worst-case = O(N) where N is the number of nodes in the heap
+        """
+        if self.length == 0:
+            return 0
+        if HAS_NUMPY:
+            return int((self.keys.to_numpy()[1:self.length + 1] >= threshold).sum())
+        return sum(1 for key in self.keys[1:self.length + 1] if key >= threshold)
+
+
+class IndexedMaxHeap(NumericMaxHeap[T]):
+    """
+    Numeric Max Heap whose elements can be reached after they were added. Every element gets an
+    integer handle when it is added (the elements of the array given to the constructor get the
+    handles 0, 1, 2, ... in order), and the heap keeps the position of every handle up to date
+    while elements move, so the key of any element can be changed, or the element removed, with a
+    single rise or sink instead of a get_max followed by an add.
+    Handles of removed elements are handed out again by later adds.
+
+    attributes:
+        handles: the handle of the element of each node, from index 1
+        positions: the index of the node of each handle, 0 when the handle is not in the heap
+        free: the handles of the removed elements
+        next_handle: the number of handles handed out so far
+    """
+
+    HANDLE_TYPECODE = 'q'
+
+    def __init__(self, max_size: int, an_array: ArrayR[tuple[float, T]] = None) -> None:
+        """
+        Creates an Indexed Max Heap object. If an array is passed as a parameter, a Bottom-up Max Heap is set up using the array.
+
+        :param max_size: the number of nodes to be created in the heap
+        :param an_array: the array of key, value pairs used for creation of a bottom-up heap
+        :complexity: Best-case = Worst-case = O(max_size)
+        """
+        capacity = max(self.MIN_CAPACITY, max_size)
+        self.handles = ArrayF.from_iterable(range(-1, capacity), self.HANDLE_TYPECODE)
+        self.positions = ArrayF.from_iterable([h + 1 if h < max_size else 0 for h in range(capacity)], self.HANDLE_TYPECODE)
+        self.free = []
+        self.next_handle = max_size
+        NumericMaxHeap.__init__(self, max_size, an_array)
+
+    def __contains__(self, handle: int) -> bool:
+        """
+        Checks whether the element of handle is in the heap
+        :complexity: O(1)
+        """
+        return 0 <= handle < len(self.positions) and self.positions[handle] != 0
+
+    def position_of(self, handle: int) -> int:
+        """
+        Returns the index of the node of handle
+        :raises KeyError: when the handle is not in the heap
+        :complexity: O(1)
+        """
+        if handle not in self:
+            raise KeyError(handle)
+        return self.positions[handle]
+
+    def key_of(self, handle: int) -> float:
+        """
+        Returns the key of the element of handle
+        :raises KeyError: when the handle is not in the heap
+        :complexity: O(1)
+        """
+        return self.keys[self.position_of(handle)]
+
+    def place(self, k: int, key: float, value: T, handle: int) -> None:
+        """
+        Stores an element and its handle at index k
+        :complexity: O(1)
+        """
+        self.keys[k] = key
+        self.the_array[k] = value
+        self.handles[k] = handle
+        self.positions[handle] = k
+
+    def rise(self, k: int) -> None:
+        """
+        Rise element at index k to its correct position, moving the handles along
+        :pre: 1 <= k <= self.length
+        :complexity: see MaxHeap.rise
+        """
+        keys = self.keys
+        key, value, handle = keys[k], self.the_array[k], self.handles[k]
+        while k > 1 and key > keys[k // 2]:
+            self.place(k, keys[k // 2], self.the_array[k // 2], self.handles[k // 2])
+            k = k // 2
+        self.place(k, key, value, handle)
+
+    def sink(self, k: int) -> None:
+        """ Make the element at index k sink to the correct position, moving the handles along
+            :pre: 1 <= k <= self.length
+            :complexity: see MaxHeap.sink
+        """
+        keys = self.keys
+        key, value, handle = keys[k], self.the_array[k], self.handles[k]
+        while 2 * k <= self.length:
+            max_child = self.largest_child(k)
+            if keys[max_child] <= key:
+                break
+            self.place(k, keys[max_child], self.the_array[max_child], self.handles[max_child])
+            k = max_child
+        self.place(k, key, value, handle)
+
+    def add(self, element: tuple[float, T]) -> int:
+        """
+        Adds a (key, value) element
+        :returns: the handle of the element
+        :raises IndexError: when the heap is full
+        :complexity: see MaxHeap.add
+        """
+        if self.is_full():
+            raise IndexError
+
+        if len(self.free) > 0:
+            handle = self.free.pop()
+        else:
+            handle = self.next_handle
+            self.next_handle += 1
+
+        self.length += 1
+        self.place(self.length, element[0], element[1], handle)
+        self.rise(self.length)
+        return handle
+
+    def top_handle(self) -> int:
+        """ Returns the handle of the element with the maximum key.
+            :raises IndexError: when the heap is empty
+            :complexity: O(1)
+        """
+        if self.length == 0:
+            raise IndexError
+        return self.handles[1]
+
+    def get_max(self) -> tuple[float, T]:
+        """ Remove (and return) the (key, value) element with the maximum key, releasing its handle.
+            :raises IndexError: when the heap is empty
+            :complexity: see MaxHeap.get_max
+        """
+        return self.remove(self.top_handle())
+
+    def update(self, handle: int, new_key: float) -> None:
+        """ Changes the key of the element of handle and moves it to its new position: it rises when
+            the key increased and sinks when it decreased.
+            :raises KeyError: when the handle is not in the heap
+            :complexity: Best-case = O(1) when the element keeps its position
+                         Worst-case = O(log N) where N is the number of nodes in the heap
+        """
+        k = self.position_of(handle)
+        old_key = self.keys[k]
+        self.keys[k] = new_key
+        if new_key > old_key:
+            self.rise(k)
+        else:
+            self.sink(k)
+
+    def remove(self, handle: int) -> tuple[float, T]:
+        """ Removes (and returns) the (key, value) element of handle, the last node takes its place and
+            rises or sinks from there. The handle is released.
+            :raises KeyError: when the handle is not in the heap
+            :complexity: Best-case = O(1), Worst-case = O(log N) where N is the number of nodes in the heap
+        """
+        k = self.position_of(handle)
+        removed = (self.keys[k], self.the_array[k])
+        last = self.length
+        self.length -= 1
+        if k != last:
+            self.place(k, self.keys[last], self.the_array[last], self.handles[last])
+            if k > 1 and self.keys[k] > self.keys[k // 2]:
+                self.rise(k)
+            else:
+                self.sink(k)
+
+        self.the_array[last] = None
+        self.positions[handle] = 0
+        self.free.append(handle)
+        return removed
+
+
+class GrowableHeap(Generic[T]):
+    """
+    Heap without a fixed capacity: the arrays double when a node is added to a full heap, so add
+    takes amortised O(log N) time and never raises.
+    The elements themselves are stored, ordered by key(element), which is computed once when the
+    element is added and kept in an array parallel to the elements. Without a key function the
+    elements are compared directly. The element with the largest key is at the top, or the one
+    with the smallest key when min_heap is True.
+
+    attributes:
+        the_array: the element of each node, from index 1
+        keys: the key of each node, from index 1
+        length: the number of nodes in the heap
+        key: the key function, None to compare the elements directly
+        min_heap: whether the smallest key is at the top
+        higher: the comparison that is True when its first key belongs above the second one
+    """
+
+    MIN_CAPACITY = 1
+
+    def __init__(self, capacity: int = MIN_CAPACITY, key: Callable[[T], object] = None, min_heap: bool = False) -> None:
+        """
+        Creates an empty heap.
+
+        :param capacity: the number of nodes the heap holds before it first grows
+        :param key: the function computing the key of an element, None to compare the elements directly
+        :param min_heap: keep the element with the smallest key at the top instead of the largest
+        :complexity: Best-case = Worst-case = O(capacity)
+        """
+        self.the_array = ArrayR(max(self.MIN_CAPACITY, capacity) + 1)
+        self.keys = ArrayR(len(self.the_array))
+        self.length = 0
+        self.key = key
+        self.min_heap = min_heap
+        self.higher = operator.lt if min_heap else operator.gt
+
+    @classmethod
+    def from_iterable(cls, items: Iterable[T], key: Callable[[T], object] = None, min_heap: bool = False) -> GrowableHeap[T]:
+        """
+        Creates a heap of the items bottom-up, sinking every parent once.
+
+        :param key: see __init__
+        :param min_heap: see __init__
+        :complexity: Best-case = Worst-case = O(N) where N is the number of items
+        """
+        items = list(items)
+        heap = cls(len(items), key, min_heap)
+        heap.the_array[1:len(items) + 1] = items
+        heap.keys[1:len(items) + 1] = items if key is None else [key(item) for item in items]
+        heap.length = len(items)
+        for i in range(heap.length // 2, 0, -1):
+            heap.sink(i)
+        return heap
+
+    def __len__(self) -> int:
+        """
+        Return the number of nodes in the heap.
+        """
+        return self.length
+
+    def is_empty(self) -> bool:
+        """
+        Return True if the heap has no node, False otherwise.
+        """
+        return self.length == 0
+
+    def grow(self, capacity: int) -> None:
+        """
+        Makes room for capacity nodes, keeping the nodes in place
+        :complexity: O(capacity)
+        """
+        self.the_array.resize(capacity + 1)
+        self.keys.resize(capacity + 1)
+
+    def rise(self, k: int) -> None:
+        """
+        Rise element at index k to its correct position
+        :pre: 1 <= k <= self.length
+        :complexity: see MaxHeap.rise
+        """
+        keys = self.keys
+        key = keys[k]
+        item = self.the_array[k]
+        while k > 1 and self.higher(key, keys[k // 2]):
+            keys[k] = keys[k // 2]
+            self.the_array[k] = self.the_array[k // 2]
+            k = k // 2
+        keys[k] = key
+        self.the_array[k] = item
+
+    def add(self, element: T) -> None:
+        """
+        Adds an element, doubling the arrays first when they are full
+        :complexity: Best-case = O(1), Worst-case = O(log N) where N is the number of nodes in the heap,
+                     amortised over the growths of the heap
+        """
+        if self.length + 1 == len(self.the_array):
+            self.grow(2 * self.length)
+
+        self.length += 1
+        self.keys[self.length] = element if self.key is None else self.key(element)
+        self.the_array[self.length] = element
+        self.rise(self.length)
+
+    def top_child(self, k: int) -> int:
+        """
+        Returns the index of k's child whose key belongs higher.
+        :pre: 1 <= k <= self.length // 2
+        :complexity: Best-case = Worst-case = O(1)
+        """
+        if 2 * k == self.length or self.higher(self.keys[2 * k], self.keys[2 * k + 1]):
+            return 2 * k
+        else:
+            return 2 * k + 1
+
+    def sink(self, k: int) -> None:
+        """ Make the element at index k sink to the correct position.
+            :pre: 1 <= k <= self.length
+            :complexity: see MaxHeap.sink
+        """
+        keys = self.keys
+        key = keys[k]
+        item = self.the_array[k]
+
+        while 2 * k <= self.length:
+            child = self.top_child(k)
+            if not self.higher(keys[child], key):
+                break
+            keys[k] = keys[child]
+            self.the_array[k] = self.the_array[child]
+            k = child
+
+        keys[k] = key
+        self.the_array[k] = item
+
+    def peek_top(self) -> T:
+        """ Returns the element at the top of the heap without removing it.
+            :raises IndexError: when the heap is empty
+            :complexity: O(1)
+        """
+        if self.length == 0:
+            raise IndexError
+        return self.the_array[1]
+
+    def get_top(self) -> T:
+        """ Remove (and return) the element at the top of the heap, the largest one or the smallest one
+            in a min heap.
+            :raises IndexError: when the heap is empty
+            :complexity: see MaxHeap.get_max
+        """
+        if self.length == 0:
+            raise IndexError
+
+        top = self.the_array[1]
+        self.keys[1] = self.keys[self.length]
+        self.the_array[1] = self.the_array[self.length]
+        self.keys[self.length] = None
+        self.the_array[self.length] = None
+        self.length -= 1
+        if self.length > 0:
+            self.sink(1)
+        return top
+
+    def replace_top(self, element: T) -> T:
+        """ Replaces the element at the top of the heap by a new element with a single sink, see
+            NumericMaxHeap.replace_top. The key of the new element is computed now, so an element can
+            replace itself after its key changed.
+            :returns: the replaced element
+            :raises IndexError: when the heap is empty
+            :complexity: see MaxHeap.sink
+        """
+        if self.length == 0:
+            raise IndexError
+
+        replaced = self.the_array[1]
+        self.keys[1] = element if self.key is None else self.key(element)
+        self.the_array[1] = element
+        self.sink(1)
+        return replaced
+
+    def merge(self, other: GrowableHeap[T]) -> GrowableHeap[T]:
+        """ Creates a new heap of the elements of both heaps, bottom-up from their arrays without
+            computing any key again. Neither heap is changed.
+            :raises ValueError: when the heaps do not have the same key function and ordering
+            :complexity: Best-case = Worst-case = O(N + M) where N and M are the sizes of the heaps
+        """
+        if self.key is not other.key or self.min_heap != other.min_heap:
+            raise ValueError('Heaps with different keys or orderings cannot be merged')
+
+        heap = GrowableHeap(len(self) + len(other), self.key, self.min_heap)
+        heap.the_array[1:len(self) + 1] = self.the_array[1:len(self) + 1]
+        heap.keys[1:len(self) + 1] = self.keys[1:len(self) + 1]
+        heap.the_array[len(self) + 1:len(self) + len(other) + 1] = other.the_array[1:len(other) + 1]
+        heap.keys[len(self) + 1:len(self) + len(other) + 1] = other.keys[1:len(other) + 1]
+        heap.length = len(self) + len(other)
+        for i in range(heap.length // 2, 0, -1):
+            heap.sink(i)
+        return heap
+
+
+def heapify(items: Iterable[T], key: Callable[[T], object] = None, min_heap: bool = False) -> GrowableHeap[T]:
+    """
+    Creates a GrowableHeap of the items bottom-up, see GrowableHeap.from_iterable
+    :complexity: Best-case = Worst-case = O(N) where N is the number of items
+    """
+    return GrowableHeap.from_iterable(items, key, min_heap)
+
+
+def nlargest(n: int, items: Iterable[T], key: Callable[[T], object] = None) -> list[T]:
+    """
+    Returns the n items with the largest keys, largest first. A min heap of the n largest items seen
+    so far is kept, and an item larger than its top replaces it.
+    :complexity: Best-case = O(N) when the items come in decreasing order
+                 Worst-case = O(N*log(n)) where N is the number of items
+    """
+    if n <= 0:
+        return []
+
+    heap = GrowableHeap(n, key, min_heap=True)
+    for item in items:
+        if len(heap) < n:
+            heap.add(item)
+            continue
+
+        item_key = item if key is None else key(item)
+        if item_key > heap.keys[1]:
+            heap.keys[1] = item_key
+            heap.the_array[1] = item
+            heap.sink(1)
+
+    largest = [heap.get_top() for _ in range(len(heap))]
+    largest.reverse()
+    return largest
+
 
 if __name__ == '__main__':
     items = [ int(x) for x in input('Enter a list of numbers: ').strip().split() ]
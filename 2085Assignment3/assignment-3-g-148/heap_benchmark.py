@@ -0,0 +1,197 @@
+""" Benchmark of the heaps on the cave selection of MultiplayerGame.select_for_players
+
+For every number of caves C, the caves are given random materials, quantities and selling prices,
+and every one of --players players in turn takes the cave with the best emerald return, mines it
+and puts it back with its recalculated return, as select_for_players does. The report gives the
+time to build the heap and the time per player with each heap, the best of --repeats runs:
+
+    heapq: the standard library heapq on (-return, index, cave) tuples, with heapreplace
+    maxheap: heap.MaxHeap on (return, cave) tuples, with get_max followed by add
+    replace: heap.MaxHeap on (return, cave) tuples, with peek_max and replace_top, as select_for_players
+    numeric: heap.NumericMaxHeap on (return, cave) tuples, with peek_max and replace_top
+    indexed: heap.IndexedMaxHeap on (return, cave) tuples, with peek_max and replace_top
+    growable: heap.GrowableHeap holding the caves themselves, keyed by their return, with replace_top
+
+Every heap must end with the same total of emeralds, or the benchmark stops.
+
+Usage:
+    python heap_benchmark.py
+    python heap_benchmark.py --caves 100 10000 100000 --players 10000 --repeats 5
+"""
+
+from __future__ import annotations
+
+import argparse
+import heapq
+import random
+import time
+from typing import Callable
+
+from cave import Cave
+from constants import EPSILON
+from heap import MaxHeap, NumericMaxHeap, IndexedMaxHeap, GrowableHeap
+from material import Material
+
+__author__ = 'Tan Jun Yu'
+__docformat__ = 'reStructuredText'
+
+CAVES = [10 ** 2, 10 ** 3, 10 ** 4, 10 ** 5]
+PLAYERS = 10 ** 4
+HUNGER_BARS = 20
+REPEATS = 3
+
+
+def make_caves(size: int, seed: int = 2085) -> list[Cave]:
+    """
+    Creates size caves of random materials with a selling price each
+    :complexity: O(N) where N is size
+    """
+    generator = random.Random(seed)
+    materials = [Material("Material {0}".format(i), generator.uniform(1, 20)) for i in range(max(1, size // 10))]
+    for material in materials:
+        material.set_current_best_price_for_sold(generator.uniform(1, 10))
+    return [Cave("Cave {0}".format(i), generator.choice(materials), generator.uniform(0, 10)) for i in range(size)]
+
+
+def cave_return(cave: Cave) -> float:
+    """
+    Returns the emeralds made by mining the quantity last computed by mine
+    :complexity: O(1)
+    """
+    return cave.get_mined_quantity() * cave.material.get_current_best_price_for_sold()
+
+
+def mine(cave: Cave) -> float:
+    """
+    Computes the quantity of a cave a player can mine, see MultiplayerGame.calculate_cave_returns
+    :returns: the emeralds made by mining it
+    :complexity: O(1)
+    """
+    mineable = HUNGER_BARS / cave.material.get_mining_rate()
+    quantity = cave.get_temp_quantity() if cave.get_temp_quantity() <= mineable - EPSILON else mineable
+    cave.set_mined_quantity(quantity)
+    return cave_return(cave)
+
+
+def take(cave: Cave) -> None:
+    """
+    Removes the quantity a player mined from the cave
+    :complexity: O(1)
+    """
+    cave.set_temp_quantity(cave.get_temp_quantity() - cave.get_mined_quantity())
+
+
+def build_heapq(caves: list[Cave]) -> list[tuple[float, int, Cave]]:
+    """ Builds the heapq list of (-return, index, cave) tuples """
+    heap = [(-mine(cave), index, cave) for index, cave in enumerate(caves)]
+    heapq.heapify(heap)
+    return heap
+
+
+def select_heapq(heap: list[tuple[float, int, Cave]], players: int) -> float:
+    """ Runs the selection with heapq, see the module docstring """
+    total = 0
+    for _ in range(players):
+        best_return, index, cave = heap[0]
+        total -= best_return
+        take(cave)
+        heapq.heapreplace(heap, (-mine(cave), index, cave))
+    return total
+
+
+def build_tuples(heap_class: type) -> Callable[[list[Cave]], MaxHeap]:
+    """ Returns the function building a bottom-up heap_class of (return, cave) tuples """
+    return lambda caves: heap_class(len(caves), [(mine(cave), cave) for cave in caves])
+
+
+def select_get_max_add(heap: MaxHeap, players: int) -> float:
+    """ Runs the selection with get_max followed by add, see the module docstring """
+    total = 0
+    for _ in range(players):
+        best_return, cave = heap.get_max()
+        total += best_return
+        take(cave)
+        heap.add((mine(cave), cave))
+    return total
+
+
+def select_replace_top(heap: MaxHeap, players: int) -> float:
+    """ Runs the selection with peek_max and replace_top, see the module docstring """
+    total = 0
+    for _ in range(players):
+        best_return, cave = heap.peek_max()
+        total += best_return
+        take(cave)
+        heap.replace_top((mine(cave), cave))
+    return total
+
+
+def build_growable(caves: list[Cave]) -> GrowableHeap[Cave]:
+    """ Builds the GrowableHeap of the caves keyed by their return """
+    for cave in caves:
+        mine(cave)
+    return GrowableHeap.from_iterable(caves, key=cave_return)
+
+
+def select_growable(heap: GrowableHeap[Cave], players: int) -> float:
+    """ Runs the selection with GrowableHeap, see the module docstring """
+    total = 0
+    for _ in range(players):
+        cave = heap.peek_top()
+        total += cave_return(cave)
+        take(cave)
+        mine(cave)
+        heap.replace_top(cave)
+    return total
+
+
+HEAPS = {"heapq": (build_heapq, select_heapq),
+         "maxheap": (build_tuples(MaxHeap), select_get_max_add),
+         "replace": (build_tuples(MaxHeap), select_replace_top),
+         "numeric": (build_tuples(NumericMaxHeap), select_replace_top),
+         "indexed": (build_tuples(IndexedMaxHeap), select_replace_top),
+         "growable": (build_growable, select_growable)}
+
+
+def run_benchmark(build: Callable[[list[Cave]], object], select: Callable[[object, int], float], size: int,
+                  players: int, repeats: int = REPEATS) -> dict:
+    """
+    Times the heap construction and the selection separately on fresh caves, keeping the best of repeats runs
+    :returns: one row of the report
+    :complexity: O(repeats * (C + P*log(C))) where C is size and P is players
+    """
+    build_seconds, select_seconds, total = float("inf"), float("inf"), None
+    for _ in range(max(1, repeats)):
+        caves = make_caves(size)
+        start = time.perf_counter()
+        heap = build(caves)
+        middle = time.perf_counter()
+        total = select(heap, players)
+        end = time.perf_counter()
+        build_seconds = min(build_seconds, middle - start)
+        select_seconds = min(select_seconds, end - middle)
+    return {"build_ms": build_seconds * 1e3, "player_us": select_seconds / players * 1e6, "total": total}
+
+
+def main() -> None:
+    """ Parse the benchmark from the command line, run it and print the report. """
+    parser = argparse.ArgumentParser(description="Time the heaps on the multiplayer cave selection.")
+    parser.add_argument("--caves", nargs="+", type=int, default=CAVES)
+    parser.add_argument("--players", type=int, default=PLAYERS)
+    parser.add_argument("--heaps", nargs="+", choices=list(HEAPS), default=list(HEAPS))
+    parser.add_argument("--repeats", type=int, default=REPEATS, help="the best of this many runs is reported")
+    args = parser.parse_args()
+
+    print("{0:<9} {1:>9} {2:>10} {3:>10} {4:>16}".format("heap", "caves", "build ms", "player us", "emeralds"))
+    for size in args.caves:
+        totals = []
+        for name in args.heaps:
+            row = run_benchmark(*HEAPS[name], size, args.players, args.repeats)
+            totals.append(row["total"])
+            print("{0:<9} {1:>9} {2:>10.2f} {3:>10.2f} {4:>16.4f}".format(name, size, row["build_ms"], row["player_us"], row["total"]), flush=True)
+        if max(totals) - min(totals) > EPSILON * max(1, abs(max(totals))):
+            raise SystemExit("The heaps selected different caves for {0} caves".format(size))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,134 @@
+"""
+    Hash-based implementation of Set ADT.
+"""
+
+from __future__ import annotations
+from typing import Iterable, Iterator
+from set import *
+from hash_functions import HashFunction
+from hash_table import LinearProbeTable
+
+__author__ = 'Tan Jun Yu'
+__docformat__ = 'reStructuredText'
+
+
+class HSet(Set[T]):
+    """Set ADT stored as the keys of a LinearProbeTable, so add, remove and membership take expected
+    O(1) time and the table grows (rehashes) automatically instead of the set becoming full.
+
+    The builtin hash is used by default, so any hashable item can be stored. Python salts the builtin
+    hash of strings per process (unless PYTHONHASHSEED is set), so the iteration order of a set of
+    strings changes from run to run. A deterministic hash function of the LinearProbeTable, such as
+    "fnv1a", can be given for sets of strings that must iterate in the same order every run.
+
+    Attributes:
+        * table (LinearProbeTable[None]): table whose keys are the elements of the set
+        * capacity (int): number of elements the table is sized for when the set is cleared
+        * hash_function (str | HashFunction): hash function of the table
+    """
+
+    MIN_CAPACITY = 1
+    HASH_FUNCTION = "builtin"
+
+    def __init__(self, capacity: int = 1, hash_function: str | HashFunction = HASH_FUNCTION) -> None:
+        """ Initialization.
+        :param capacity: number of elements expected, the set grows past it when needed
+        :param hash_function: see LinearProbeTable
+        :complexity: O(capacity)
+        """
+        self.capacity = max(self.MIN_CAPACITY, capacity)
+        self.hash_function = hash_function
+        Set.__init__(self)
+
+    @classmethod
+    def from_iterable(cls, items: Iterable[T], hash_function: str | HashFunction = HASH_FUNCTION) -> HSet[T]:
+        """ Creates a set of the distinct items of iterable
+        :complexity: expected O(N) where N is the number of items
+        """
+        items = list(items)
+        res = cls(len(items), hash_function)
+        res.table.bulk_insert(items, [None] * len(items))
+        return res
+
+    def __len__(self) -> int:
+        """ Returns the number of elements in the set. """
+        return len(self.table)
+
+    def is_empty(self) -> bool:
+        """ True if the set is empty. """
+        return len(self) == 0
+
+    def __contains__(self, item: T) -> bool:
+        """ True if the set contains the item.
+        :complexity: expected O(1), O(N) in the worst case where N is the tablesize
+        """
+        return item in self.table
+
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the elements of the set, in no particular order.
+        :complexity: O(N) for the whole iteration where N is the tablesize
+        """
+        return iter(self.table.keys())
+
+    def clear(self) -> None:
+        """ Makes the set empty.
+        :complexity: O(capacity)
+        """
+        self.table = LinearProbeTable(self.capacity, hash_function=self.hash_function)
+
+    def add(self, item: T) -> None:
+        """ Adds an element to the set. An element already present in the set is not added again.
+        :complexity: expected O(1) amortised over the rehashes
+        """
+        self.table[item] = None
+
+    def remove(self, item: T) -> None:
+        """ Removes an element from the set.
+        :pre: the element should be present in the set
+        :raises KeyError: if no such element is found.
+        :complexity: expected O(1)
+        """
+        del self.table[item]
+
+    def union(self, other: HSet[T]) -> HSet[T]:
+        """ Creates a new set equal to the union with another one,
+        i.e. the result set should contains the elements of self and other.
+        :complexity: expected O(N + M) where N and M are the sizes of the sets
+        """
+        res = HSet(len(self) + len(other), self.hash_function)
+        for item in self:
+            res.add(item)
+        for item in other:
+            res.add(item)
+        return res
+
+    def intersection(self, other: Set[T]) -> HSet[T]:
+        """ Creates a new set equal to the intersection with another one,
+        i.e. the result set should contain the elements that are both in
+        self *and* other.
+        :complexity: expected O(N) where N is the size of self, when other also has O(1) membership
+        """
+        res = HSet(min(len(self), len(other)), self.hash_function)
+        for item in self:
+            if item in other:
+                res.add(item)
+        return res
+
+    def difference(self, other: Set[T]) -> HSet[T]:
+        """ Creates a new set equal to the difference with another one,
+        i.e. the result set should contain the elements of self that
+        *are not* in other.
+        :complexity: expected O(N) where N is the size of self, when other also has O(1) membership
+        """
+        res = HSet(len(self), self.hash_function)
+        for item in self:
+            if item not in other:
+                res.add(item)
+        return res
+
+    def __str__(self):
+        """ Magic method constructing a string representation of the set object. """
+        elems = []
+        for item in self:
+            elems.append(str(item) if type(item) != str else "'{0}'".format(item))
+        return '{' + ', '.join(elems) + '}'
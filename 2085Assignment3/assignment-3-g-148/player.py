@@ -1,7 +1,6 @@
 """ All logic and implementation related to the player in the game can be found here"""
 
 from __future__ import annotations
-from aset import ASet
 from avl import AVLTree
 from bst import BinarySearchTree
 
@@ -177,15 +176,15 @@ class Player():
 
     def select_food_and_caves(self) -> tuple[Food | None, float, list[tuple[Cave, float]]]:
         '''
-        Complexity : Worst-Case complexity = O(M + T + F*( C*logC + C*logC )) = O(M + T + F*C*logC)
-                     Best-Case complexity = O(M + T + F*C) 
+        Complexity : Worst-Case complexity = O(M + T + C*logC + F*( C + C*logC )) = O(M + T + F*C*logC)
+                     Best-Case complexity = O(M + T + C*logC + F*C) 
 
         The worst complexity is O(M + T + F*C*logC). O(M) is from the first for loop that is iterating through the list of materials and inside the loop only consists of O(1) operations.
         The same applies to O(T) that is from the second for loop iterating through the list of traders and inside the loop only consists of O(1) operations. O(F*C*log*C) is from 
         the third for loop that iterates through the list of food O(F) and consists of two nested for loop of O(C*log C) where log C is from inserting and removing caves from the
         AVL tree. 
 
-        The best case happens only when the operation of inserting the cave into the AVL tree is O(1) and also find_max_and_remove() function is O(1). These operations can be O(1)
+        The best case happens only when the operation of inserting the cave into the AVL tree is O(1) and also pop_max() function is O(1). These operations can be O(1)
         if and only if the there is only 1 cave in self.caves.
 
         Approach : The first for loop (line 293) is to iterate through the whole list of materials to reset the current_best_price_for_sold and emerald_per_hunger_bar attribute 
@@ -200,8 +199,8 @@ class Player():
         selling the material for each hunger bar used when mining.  
 
         The third for loop (line 310) is the main loop to choose the best choice of food and caves that will leave the highest balance at the end of the day.There is an if statement to check
-        if the player has enough balance to buy the food.If not, the main loop will proceed to the next food.The first nested for loop (line 322) inside this main loop is to insert every 
-        cave into an AVL tree which will sort the caves in accordance to the priority determined by the emerald per hunger bar of the material inside that cave. The second nested
+        if the player has enough balance to buy the food.If not, the main loop will proceed to the next food.Before this main loop, the caves are sorted once in accordance to the priority 
+        determined by the emerald per hunger bar of the material inside that cave, and inside this main loop an AVL tree is built from the sorted caves in O(C). The nested
         for loop (line 335) inside this main loop is to keep the game going. If the player's hunger bar is still not yet 0 , then the best cave which is the one that contains the material of the 
         highest emerald per hunger bar is retrieved from the AVL tree. Then, it will check if the player has enough hunger bar to mine the full quantity of material inside that cave. If no, 
         it will calculate the how much of the material can be mined by the player with the remaning hunger bar left. The balance of the player is then added with the price of selling
@@ -312,30 +311,30 @@ class Player():
 
             trader_material.set_emerald_per_hunger_bar(emerald_per_hunger_bar) # Set the material emerald_per_hunger_bar
 
+        # The caves sorted by the emerald per hunger bar of their material, which is the same for every food. The pairs are sorted once, so
+        # every food builds its AVL tree in O(C). Caves with the same emerald per hunger bar keep their order in the list, and the later
+        # cave is retrieved first
+        cave_pairs = []
+        for cave in self.caves_list : # O(C)
+
+            if cave.material.get_emerald_per_hunger_bar() is None: # This is a condition where the material inside this cave is not being bought by any of the traders
+                continue # Proceed to the next cave since there is no reason to mine the material of the cave that cannot be sold to the traders
+
+            cave_pairs.append((cave.material.get_emerald_per_hunger_bar(), cave))
+        cave_pairs.sort(key=lambda pair: pair[0]) # O(C*logC)
+
         # Find the food and list of caves that will give the most optimal result that is the highest amount of balance(emeralds) at the end of the day.
         for food in self.food_list : # O(F)
             
             # temporary values for every food
-            temp_avl = AVLTree()     
             temp_balance = self.balance - food.price
             temp_hunger_bars = food.hunger_bars
             temp_caves_selected = []
 
             if food.price <= self.balance - EPSILON:
-                # Add the caves into the Avl tree by using the emerald per hunger bar calculated as the key and cave as the item . AVL helps to sort the caves in order based on the 
+                # Build the Avl tree with the emerald per hunger bar calculated as the key and cave as the item . AVL helps to sort the caves in order based on the 
                 # emerald per hunger bar of material
-                key_constant = 0.0000000001
-                for cave in self.caves_list : # O(C)
-            
-                    if cave.material.get_emerald_per_hunger_bar() is None: # This is a condition where the material inside this cave is not being bought by any of the traders
-                        continue # Proceed to the next cave since there is no reason to mine the material of the cave that cannot be sold to the traders
-
-                    try:          
-                        temp_avl[cave.material.get_emerald_per_hunger_bar()] = cave  # O(log C) since AVL tree is always a balanced tree
-
-                    except ValueError:
-                        temp_avl[cave.material.get_emerald_per_hunger_bar() + key_constant] = cave # O(log C) since AVL tree is always a balanced tree
-                        key_constant += 0.0000000001
+                temp_avl = AVLTree.from_sorted(cave_pairs, multimap=True) # O(C)
 
                 # Retrive the caves in order starting from the cave that has the material of the highest emerald per hunger bar value. 
                 for cave in self.caves_list :# O(C)
@@ -347,7 +346,7 @@ class Player():
                     if 0 < temp_hunger_bars - EPSILON:
                         
                         # Retrieve the cave with the material of the highest emerald per hunger bar value
-                        current_cave_selected = temp_avl.find_max_and_remove().item # O(log C) since AVL tree is always a balanced tree
+                        current_cave_selected = temp_avl.pop_max().item # O(log C) since AVL tree is always a balanced tree
 
                         material_in_cave = current_cave_selected.material
                         number_of_material = current_cave_selected.quantity
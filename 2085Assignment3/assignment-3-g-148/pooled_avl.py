@@ -0,0 +1,402 @@
+""" AVL Tree whose nodes live in a pool of parallel arrays.
+
+A node is an integer index into the pool instead of an object: its key and item are kept in two
+lists and its left child, right child and size in arrays of 32 bit integers and its height in an
+array of bytes, so a node costs two references and 13 bytes of unboxed integers rather than a whole
+Python object.
+Index 0 is the empty tree (NIL), with height and size 0.
+"""
+from __future__ import annotations
+
+__author__ = 'Tan Jun Yu'
+__docformat__ = 'reStructuredText'
+
+from array import array
+from typing import TypeVar, Generic, Iterator, List
+
+K = TypeVar('K')
+I = TypeVar('I')
+
+
+class NodePool(Generic[K, I]):
+    """
+        Storage of the nodes of a PooledAVLTree, growing by doubling. Released nodes are put on a free
+        list and handed out again before the pool grows.
+
+        The keys and items are plain lists rather than ArrayR: a ctypes py_object array keeps a
+        reference to every object stored in it in a dictionary keyed by the index, which costs more
+        memory per slot than the node object this class avoids. The numbers are array.array rather
+        than ArrayF, since indexing an ArrayF goes through a Python method call on every access of
+        the tree walks.
+
+        attributes:
+            keys: the key of each node
+            items: the item of each node
+            left: the index of the left child of each node, NIL if none
+            right: the index of the right child of each node, NIL if none
+            height: the height of the sub-tree of each node
+            size: the number of nodes in the sub-tree of each node
+            free: the indices of the released nodes
+            used: the number of indices handed out so far, including NIL
+    """
+
+    NIL = 0
+    MIN_CAPACITY = 8
+    INDEX_TYPECODE = 'i'    # left, right and size, up to 2**31 - 1 nodes
+    HEIGHT_TYPECODE = 'B'   # an AVL tree of 2**31 nodes is less than 45 high
+
+    def __init__(self, capacity: int = MIN_CAPACITY) -> None:
+        """
+            Initialiser.
+            :param capacity: the number of nodes the pool holds before it first grows
+            :complexity: O(capacity)
+        """
+        capacity = max(self.MIN_CAPACITY, capacity + 1)
+        self.keys = [None] * capacity
+        self.items = [None] * capacity
+        self.left = array(self.INDEX_TYPECODE, [self.NIL]) * capacity
+        self.right = array(self.INDEX_TYPECODE, [self.NIL]) * capacity
+        self.height = array(self.HEIGHT_TYPECODE, [0]) * capacity
+        self.size = array(self.INDEX_TYPECODE, [0]) * capacity
+        self.free = []
+        self.used = 1
+
+    def __len__(self) -> int:
+        """
+            Returns the number of nodes in use
+            :complexity: O(1)
+        """
+        return self.used - 1 - len(self.free)
+
+    def capacity(self) -> int:
+        """
+            Returns the number of nodes the pool can hold without growing
+            :complexity: O(1)
+        """
+        return len(self.keys) - 1
+
+    def allocate(self, key: K, item: I) -> int:
+        """
+            Returns the index of a new leaf node holding key and item
+            :complexity: O(1) amortised over the growths of the pool
+        """
+        if len(self.free) > 0:
+            index = self.free.pop()
+        else:
+            if self.used == len(self.keys):
+                self.grow(2 * len(self.keys))
+            index = self.used
+            self.used += 1
+
+        self.keys[index] = key
+        self.items[index] = item
+        self.left[index] = self.NIL
+        self.right[index] = self.NIL
+        self.height[index] = 1
+        self.size[index] = 1
+        return index
+
+    def release(self, index: int) -> None:
+        """
+            Puts a node that is no longer in the tree on the free list
+            :complexity: O(1)
+        """
+        self.keys[index] = None
+        self.items[index] = None
+        self.free.append(index)
+
+    def grow(self, capacity: int) -> None:
+        """
+            Makes room for capacity nodes (including NIL), keeping every index valid
+            :complexity: O(capacity)
+        """
+        extra = capacity - len(self.keys)
+        self.keys.extend([None] * extra)
+        self.items.extend([None] * extra)
+        for numbers in (self.left, self.right, self.height, self.size):
+            numbers.frombytes(bytes(numbers.itemsize * extra))
+
+
+class PooledAVLTree(Generic[K, I]):
+    """
+        AVL tree with the same insertion, deletion and rebalancing as avl.AVLTree, storing its nodes
+        in a NodePool. Nodes are referred to by their index in the pool.
+
+        attributes:
+            pool: the NodePool holding the nodes
+            root: the index of the root node, NIL when the tree is empty
+            length: the number of nodes in the tree
+    """
+
+    def __init__(self, capacity: int = NodePool.MIN_CAPACITY) -> None:
+        """
+            Initialises an empty tree
+            :param capacity: the number of nodes expected, the pool grows past it when needed
+            :complexity: O(capacity)
+        """
+        self.pool = NodePool(capacity)
+        self.root = NodePool.NIL
+        self.length = 0
+
+    def __len__(self) -> int:
+        """ Returns the number of nodes in the tree. """
+        return self.length
+
+    def is_empty(self) -> bool:
+        """
+            Checks to see if the tree is empty
+            :complexity: O(1)
+        """
+        return self.root == NodePool.NIL
+
+    def find(self, key: K) -> int:
+        """
+            Returns the index of the node with the given key, NIL if there is none
+            :complexity: O(CompK * log(n)) where n is the number of nodes in the tree
+        """
+        keys = self.pool.keys
+        left = self.pool.left
+        right = self.pool.right
+        current = self.root
+        while current != NodePool.NIL:
+            current_key = keys[current]
+            if key == current_key:
+                return current
+            elif key < current_key:
+                current = left[current]
+            else:
+                current = right[current]
+        return NodePool.NIL
+
+    def __contains__(self, key: K) -> bool:
+        """
+            Checks to see if the key is in the tree
+            :complexity: see find
+        """
+        return self.find(key) != NodePool.NIL
+
+    def __getitem__(self, key: K) -> I:
+        """
+            Get the item of the node with the given key
+            :raises KeyError: when the key is not in the tree
+            :complexity: see find
+        """
+        index = self.find(key)
+        if index == NodePool.NIL:
+            raise KeyError('Key not found: {0}'.format(key))
+        return self.pool.items[index]
+
+    def __setitem__(self, key: K, item: I) -> None:
+        """
+            Inserts a new key, walking down iteratively and rebalancing on the way back up
+            :raises ValueError: when the key is already in the tree
+            :complexity: O(CompK * log(n)) where n is the number of nodes in the tree
+        """
+        pool = self.pool
+        path = []
+        current = self.root
+        while current != NodePool.NIL:
+            current_key = pool.keys[current]
+            path.append(current)
+            if key < current_key:
+                current = pool.left[current]
+            elif key > current_key:
+                current = pool.right[current]
+            else:
+                raise ValueError('Inserting duplicate item')
+
+        node = pool.allocate(key, item)
+        self.length += 1
+        if len(path) == 0:
+            self.root = node
+            return
+
+        parent = path[-1]
+        if key < pool.keys[parent]:
+            pool.left[parent] = node
+        else:
+            pool.right[parent] = node
+        self.root = self.retrace(path)
+
+    def __delitem__(self, key: K) -> None:
+        """
+            Deletes the node with the given key. A node with two children takes the key and item of its
+            successor, whose node is removed instead.
+            :raises ValueError: when the key is not in the tree
+            :complexity: O(CompK * log(n)) where n is the number of nodes in the tree
+        """
+        pool = self.pool
+        path = []
+        current = self.root
+        while current != NodePool.NIL and key != pool.keys[current]:
+            path.append(current)
+            if key < pool.keys[current]:
+                current = pool.left[current]
+            else:
+                current = pool.right[current]
+
+        if current == NodePool.NIL:
+            raise ValueError('Deleting non-existent item')
+
+        if pool.left[current] != NodePool.NIL and pool.right[current] != NodePool.NIL:
+            path.append(current)
+            succ = pool.right[current]
+            while pool.left[succ] != NodePool.NIL:
+                path.append(succ)
+                succ = pool.left[succ]
+            pool.keys[current] = pool.keys[succ]
+            pool.items[current] = pool.items[succ]
+            current = succ
+
+        replacement = pool.left[current] if pool.left[current] != NodePool.NIL else pool.right[current]
+        pool.release(current)
+        self.length -= 1
+        if len(path) == 0:
+            self.root = replacement
+            return
+
+        parent = path[-1]
+        if pool.left[parent] == current:
+            pool.left[parent] = replacement
+        else:
+            pool.right[parent] = replacement
+        self.root = self.retrace(path)
+
+    def update(self, index: int) -> None:
+        """
+            Recomputes the height and size of a node from its children
+            :complexity: O(1)
+        """
+        pool = self.pool
+        left, right = pool.left[index], pool.right[index]
+        pool.height[index] = max(pool.height[left], pool.height[right]) + 1
+        pool.size[index] = pool.size[left] + pool.size[right] + 1
+
+    def left_rotate(self, current: int) -> int:
+        """
+            Perform left rotation of the sub-tree of current, see AVLTree.left_rotate
+            :returns: the index of the new root of the sub-tree
+            :complexity: O(1)
+        """
+        pool = self.pool
+        new_root = pool.right[current]
+        pool.right[current] = pool.left[new_root]
+        pool.left[new_root] = current
+        self.update(current)
+        self.update(new_root)
+        return new_root
+
+    def right_rotate(self, current: int) -> int:
+        """
+            Perform right rotation of the sub-tree of current, see AVLTree.right_rotate
+            :returns: the index of the new root of the sub-tree
+            :complexity: O(1)
+        """
+        pool = self.pool
+        new_root = pool.left[current]
+        pool.left[current] = pool.right[new_root]
+        pool.right[new_root] = current
+        self.update(current)
+        self.update(new_root)
+        return new_root
+
+    def rebalance(self, current: int) -> int:
+        """
+            Rotates the sub-tree of current if it is unbalanced, see AVLTree.rebalance
+            :returns: the index of the new root of the sub-tree
+            :complexity: O(1)
+        """
+        pool = self.pool
+        balance = pool.height[pool.right[current]] - pool.height[pool.left[current]]
+        if balance >= 2:
+            child = pool.right[current]
+            if pool.height[pool.left[child]] > pool.height[pool.right[child]]:
+                pool.right[current] = self.right_rotate(child)
+            return self.left_rotate(current)
+
+        if balance <= -2:
+            child = pool.left[current]
+            if pool.height[pool.right[child]] > pool.height[pool.left[child]]:
+                pool.left[current] = self.left_rotate(child)
+            return self.right_rotate(current)
+
+        return current
+
+    def retrace(self, path: List[int]) -> int:
+        """
+            Walks back up the path of an insertion or deletion, see AVLTree.retrace
+            :returns: the index of the new root of the tree
+            :complexity: O(log(n)) where n is the number of nodes in the tree
+        """
+        pool = self.pool
+        balanced = False
+        for index in range(len(path) - 1, -1, -1):
+            current = path[index]
+            old_height = pool.height[current]
+            self.update(current)
+            if balanced:
+                continue
+
+            new_root = self.rebalance(current)
+            if new_root != current:
+                path[index] = new_root
+                if index > 0:
+                    parent = path[index - 1]
+                    if pool.left[parent] == current:
+                        pool.left[parent] = new_root
+                    else:
+                        pool.right[parent] = new_root
+            elif pool.height[current] == old_height:
+                balanced = True
+
+        return path[0]
+
+    def in_order_indices(self) -> Iterator[int]:
+        """
+            Yields the indices of the nodes in order of their keys, using an explicit stack
+            :complexity: O(n) for the whole walk where n is the number of nodes in the tree
+        """
+        pool = self.pool
+        stack = []
+        current = self.root
+        while current != NodePool.NIL or len(stack) > 0:
+            while current != NodePool.NIL:
+                stack.append(current)
+                current = pool.left[current]
+            current = stack.pop()
+            yield current
+            current = pool.right[current]
+
+    def __iter__(self) -> Iterator[K]:
+        """ Iterates over the keys in order. """
+        keys = self.pool.keys
+        return (keys[index] for index in self.in_order_indices())
+
+    def in_order(self) -> List[I]:
+        """
+            Returns the items sorted by their keys
+            :complexity: O(n) where n is the number of nodes in the tree
+        """
+        items = self.pool.items
+        return [items[index] for index in self.in_order_indices()]
+
+    def select(self, k: int) -> I:
+        """
+            Returns the item with the kth smallest key (from 0), see AVLTree.select
+            :raises IndexError: when k is not between 0 and len(self) - 1
+            :complexity: O(log(n)) where n is the number of nodes in the tree
+        """
+        if not 0 <= k < self.length:
+            raise IndexError('Index out of range: {0}'.format(k))
+
+        pool = self.pool
+        current = self.root
+        while True:
+            left_size = pool.size[pool.left[current]]
+            if k < left_size:
+                current = pool.left[current]
+            elif k > left_size:
+                k -= left_size + 1
+                current = pool.right[current]
+            else:
+                return pool.items[current]
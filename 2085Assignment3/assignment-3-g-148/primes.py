@@ -1,12 +1,158 @@
 """
-An iterator of the largest prime number to find the next greatest prime under a bound.
+Prime number utilities used to size the hash tables.
+
+Contains an iterator of the largest prime number to find the next greatest prime under a bound,
+together with the sieve and primality test that back it. The hash tables use the helpers in this
+module both to pick their initial size and to pick the next size every time they are rehashed.
 """
 
 from __future__ import annotations
 
+from functools import lru_cache
+from math import isqrt
+
 __author__ = 'Shyam Kamalesh Borkar'
 __docformat__ = 'reStructuredText'
 
+# Witnesses that make Miller-Rabin deterministic for every n < 3.317 * 10^24
+MILLER_RABIN_BASES = (2, 3, 5, 7, 11, 13, 17, 19, 23, 29, 31, 37, 41)
+
+# Width of every window scanned by the segmented sieve
+SEGMENT_SIZE = 1 << 15
+
+
+def is_prime(num: int) -> bool:
+    """ Deterministic Miller-Rabin primality test.
+    :param num: the number to be checked if it is prime or not
+    :returns: True if num is prime, False otherwise
+    :complexity: Best case O(1) when num is small or even.
+                 Worst case O(B * log(num)^3) where B is the number of witnesses in MILLER_RABIN_BASES
+    """
+    if num < 2:
+        return False
+    for small_prime in MILLER_RABIN_BASES:
+        if num % small_prime == 0:
+            return num == small_prime
+
+    # write num - 1 as d * 2^s with d odd
+    d = num - 1
+    s = 0
+    while d % 2 == 0:
+        d //= 2
+        s += 1
+
+    for base in MILLER_RABIN_BASES:
+        x = pow(base, d, num)
+        if x == 1 or x == num - 1:
+            continue
+        for _ in range(s - 1):
+            x = x * x % num
+            if x == num - 1:
+                break
+        else:
+            return False
+    return True
+
+
+@lru_cache(maxsize=64)
+def _base_sieve(limit: int) -> bytes:
+    """ Sieve of Eratosthenes over [0, limit] stored in a bytearray (1 marks a prime).
+    :pre: limit >= 2
+    :param limit: the largest number covered by the sieve
+    :complexity: Best and worst case O(limit * log(log(limit)))
+    """
+    flags = bytearray([1]) * (limit + 1)
+    flags[0] = flags[1] = 0
+    for candidate in range(2, isqrt(limit) + 1):
+        if flags[candidate]:
+            # cross off every multiple starting from candidate^2 with one slice assignment
+            flags[candidate * candidate::candidate] = bytes(len(range(candidate * candidate, limit + 1, candidate)))
+    return bytes(flags)
+
+
+def sieve(limit: int) -> list[int]:
+    """ Returns every prime smaller than or equal to limit.
+    :param limit: the upper bound (inclusive) of the primes returned
+    :complexity: Best and worst case O(limit * log(log(limit)))
+    """
+    if limit < 2:
+        return []
+    flags = _base_sieve(limit)
+    return [number for number in range(2, limit + 1) if flags[number]]
+
+
+def primes_in_range(low: int, high: int) -> list[int]:
+    """ Segmented sieve returning every prime p with low <= p < high.
+    Only the base primes up to sqrt(high) are kept in memory, the range itself
+    is marked in a bytearray of size (high - low).
+    :param low: the lower bound (inclusive) of the range
+    :param high: the upper bound (exclusive) of the range
+    :complexity: Best and worst case O(sqrt(high) * log(log(high)) + (high - low) * log(log(high)))
+    """
+    low = max(low, 2)
+    if high <= low:
+        return []
+
+    segment = bytearray([1]) * (high - low)
+    for prime in sieve(isqrt(high - 1)):
+        # first multiple of prime inside the segment, never crossing off the prime itself
+        start = max(prime * prime, (low + prime - 1) // prime * prime)
+        if start >= high:
+            continue
+        segment[start - low::prime] = bytes(len(range(start, high, prime)))
+    return [low + offset for offset, flag in enumerate(segment) if flag]
+
+
+@lru_cache(maxsize=None)
+def largest_prime_below(bound: int) -> int:
+    """ Returns the largest prime strictly smaller than bound.
+    The sieve is run on windows of SEGMENT_SIZE numbers walking down from the bound,
+    since prime gaps are tiny compared to the table sizes this almost always needs a single window.
+    :param bound: the bound under which the prime is searched
+    :raises ValueError: if there is no prime smaller than bound
+    :complexity: Best and worst case O(sqrt(bound) + SEGMENT_SIZE * log(log(bound))) per window scanned
+    """
+    if bound <= 2:
+        raise ValueError("There is no prime smaller than {0}".format(bound))
+
+    high = bound
+    while high > 2:
+        low = max(2, high - SEGMENT_SIZE)
+        primes = primes_in_range(low, high)
+        if primes:
+            return primes[-1]
+        high = low
+    raise ValueError("There is no prime smaller than {0}".format(bound))
+
+
+@lru_cache(maxsize=None)
+def next_prime(num: int) -> int:
+    """ Returns the smallest prime greater than or equal to num.
+    :param num: the number from which the search starts
+    :complexity: Best case O(is_prime) when num is already prime.
+                 Worst case O(G * is_prime) where G is the gap to the next prime
+    """
+    if num <= 2:
+        return 2
+    candidate = num if num % 2 == 1 else num + 1
+    while not is_prime(candidate):
+        candidate += 2
+    return candidate
+
+
+@lru_cache(maxsize=None)
+def growth_prime(tablesize: int, factor: int = 2) -> int:
+    """ Returns the size a hash table of size tablesize grows to on rehash.
+    This is the second value produced by LargestPrimeIterator(tablesize, factor), i.e. the
+    largest prime under factor times the largest prime under tablesize. The results are cached
+    so every table growing through the same chain of sizes shares the work.
+    :param tablesize: the current size of the table
+    :param factor: the growth factor, which may be fractional
+    :complexity: Best case O(1) when the size is already cached, otherwise O(largest_prime_below)
+    """
+    return largest_prime_below(int(largest_prime_below(tablesize) * factor))
+
+
 class LargestPrimeIterator():
     """ Iterator to find the next largest prime smaller than an upper bound."""
 
@@ -24,33 +170,21 @@ class LargestPrimeIterator():
         :complexity: Best and worst case O(1)
         """
         return self
-    
+
     def __next__(self):
         """Magic method to get the next item in the iterable object
-        :complexity: Best and worst case = O(largest_prime()) that is O(n^2)
+        :complexity: Best and worst case = O(largest_prime())
         """
         new_prime = self.largest_prime(self.upper_bound)
         self.upper_bound = new_prime * self.factor
-        
+
         return new_prime
 
 
     def largest_prime(self, number: int) -> int:
-        """ Using the sieve of eratosthenes get the largest prime number under bound
+        """ Using a segmented sieve of eratosthenes get the largest prime number under bound
         :param number: the bound under which the list of prime numbers are generated
         :returns: the largest prime under the bound
-        :complexity: Best and worst case O(n^2) where n is number, the upper bound
+        :complexity: Best and worst case O(sqrt(n) + SEGMENT_SIZE * log(log(n))) where n is number, the upper bound
         """
-
-        numbers = list(range(2, number))
-
-        for prime_candidate in numbers:
-            trial_prime = prime_candidate * prime_candidate
-            while trial_prime <= number:
-
-                if trial_prime in numbers:
-                    numbers.remove(trial_prime)
-                
-                trial_prime += prime_candidate
-        
-        return numbers[-1]
+        return largest_prime_below(number)
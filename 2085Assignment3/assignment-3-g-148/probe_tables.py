@@ -0,0 +1,399 @@
+""" Open addressing alternatives to Linear Probing
+
+Defines Hash Tables resolving conflicts with quadratic probing, double hashing and cuckoo hashing.
+They share the interface, statistics and resize policy of hash_table.ProbeTable so they can be compared
+with hash_table.LinearProbeTable on the same data.
+"""
+from __future__ import annotations
+
+__author__ = 'Tan Jun Yu'
+__docformat__ = 'reStructuredText'
+
+from abc import abstractmethod
+from typing import TypeVar
+
+from hash_functions import HashFunction, make_hash_function
+from hash_table import ProbeTable
+from referential_array import ArrayR
+
+T = TypeVar('T')
+
+
+class SequenceProbeTable(ProbeTable[T]):
+    """
+        Open addressing table visiting the slots of a key in a sequence starting at its hash. Subclasses
+        define the sequence with _probe_step and _next_position. Deleted items leave a tombstone.
+    """
+
+    def _probe_step(self, key: str) -> int:
+        """
+            Returns the value passed as step to _next_position for every slot of the probe sequence of key
+            :complexity: O(1)
+        """
+        return 0
+
+    @abstractmethod
+    def _next_position(self, position: int, step: int, distance: int) -> int:
+        """
+            Returns the slot visited after position, which is distance slots into the probe sequence
+            :complexity: O(1)
+        """
+        pass
+
+    def _probe(self, key: str, is_insert: bool, position: int = None) -> int:
+        """
+            Find the correct position for this key following its probe sequence.
+            Tombstones are skipped, an insert of a new key reuses the first tombstone it went past.
+            :param position: the hash of the key if it has already been computed
+            :complexity best: O(K) first position is empty
+                            where K is the size of the key
+            :complexity worst: O(K + N) when we've visited tablesize slots
+                            where N is the tablesize
+            :raises KeyError: When a position can't be found
+        """
+        if position is None:
+            position = self.hash(key)
+
+        if is_insert and self.is_full():
+            raise KeyError(key)
+
+        step = None
+        first_tombstone = None
+        tombstone_distance = 0
+
+        for distance in range(self.tablesize):
+            item = self.table[position]
+            if item is None:
+                if not is_insert:
+                    raise KeyError(key)
+                if first_tombstone is not None:
+                    self._record_probe(tombstone_distance)
+                    return first_tombstone
+                self._record_probe(distance)
+                return position
+            elif item is self.TOMBSTONE:
+                if first_tombstone is None:
+                    first_tombstone = position
+                    tombstone_distance = distance
+            elif item[0] == key:
+                if is_insert:
+                    self._record_probe(distance)
+                return position
+
+            if step is None:
+                step = self._probe_step(key)
+            position = self._next_position(position, step, distance)
+
+        if is_insert and first_tombstone is not None:
+            self._record_probe(tombstone_distance)
+            return first_tombstone
+        raise KeyError(key)
+
+    def keys(self) -> list[str]:
+        """
+            Returns all keys in the hash table.
+        """
+        return [item[0] for item in self.table if item is not None and item is not self.TOMBSTONE]
+
+    def values(self) -> list[T]:
+        """
+            Returns all values in the hash table.
+        """
+        return [item[1] for item in self.table if item is not None and item is not self.TOMBSTONE]
+
+    def __getitem__(self, key: str) -> T:
+        """
+            Get the item at a certain key
+            :see: #self._probe(key: str, is_insert: bool)
+            :raises KeyError: when the item doesn't exist
+        """
+        return self.table[self._probe(key, False)][1]
+
+    def __setitem__(self, key: str, data: T) -> None:
+        """
+            Set an (key, data) pair in our hash table
+            :see: #self._insert_hashed(key: str, data: T, position: int)
+        """
+        if self._needs_growth():
+            self._rehash()
+        self._insert_hashed(key, data, self.hash(key))
+
+    def _insert_hashed(self, key: str, data: T, position: int) -> None:
+        """
+            Set an (key, data) pair whose hash has already been computed. The tombstones count as used slots
+            for the load factor, as a probe sequence has to go past them: once items and tombstones fill
+            more than max_load_factor of the table it is compacted, which keeps the tablesize.
+            :see: #self._probe(key: str, is_insert: bool, position: int)
+        """
+        if self.tombstones > 0 and self.count + self.tombstones > self._growth_threshold():
+            self._compact()
+
+        position = self._probe(key, True, position)
+        item = self.table[position]
+        if item is None or item is self.TOMBSTONE:
+            self.count += 1
+            if item is self.TOMBSTONE:
+                self.tombstones -= 1
+        self.table[position] = (key, data)
+
+    def __delitem__(self, key: str) -> None:
+        """
+            Delete the item with the given key, leaving a tombstone in its slot
+            :see: LinearProbeTable.__delitem__
+            :raises KeyError: when the item doesn't exist
+        """
+        position = self._probe(key, False)
+        self.table[position] = self.TOMBSTONE
+        self.tombstones += 1
+        self.count -= 1
+
+        if self.tombstones > self.MAX_TOMBSTONE_RATIO * self.tablesize:
+            self._compact()
+        self._maybe_shrink()
+
+    def _compact(self) -> None:
+        """
+            Clear every tombstone by reinserting the items into a new table of the same size
+            Time complexity : Best = Worst = O(N) where N is the tablesize
+        """
+        self.compaction_count += 1
+        self._resize(self.tablesize)
+
+    def _resize(self, new_table_size: int) -> None:
+        """
+            Move every item into a new table of size new_table_size
+            Time complexity : Best = Worst = O(N + M) where N is the old and M the new tablesize
+        """
+        items = [item for item in self.table if item is not None and item is not self.TOMBSTONE]
+        self.table = ArrayR(new_table_size)
+        self.tablesize = new_table_size
+        self.count = 0
+        self.tombstones = 0
+
+        keys = [item[0] for item in items]
+        for item, position in zip(items, self.bulk_hash(keys)):
+            self._insert_hashed(item[0], item[1], position)
+
+
+class QuadraticProbeTable(SequenceProbeTable[T]):
+    """
+        Hash Table using quadratic probing: the i-th slot visited for a key is hash(key) + i^2.
+        Keys with different hashes follow different sequences, which avoids the primary clustering of linear
+        probing. With a prime tablesize the first (tablesize + 1) / 2 slots of a sequence are all different,
+        so an insert always finds a slot while at most half the table holds items or tombstones, which the
+        default max_load_factor of 0.5 guarantees. A larger max_load_factor is rejected.
+    """
+
+    # Largest load for which every insert is guaranteed a slot in the first half of its sequence
+    MAX_SAFE_LOAD_FACTOR = 0.5
+
+    def __init__(self, expected_size: int, tablesize_override: int = -1, hash_function: str | HashFunction = None,
+                 **policy) -> None:
+        """
+            Initialiser.
+            :param policy: max_load_factor, growth_factor and min_load_factor, see ProbeTable
+            :raises ValueError: when max_load_factor is greater than MAX_SAFE_LOAD_FACTOR, or see ProbeTable
+        """
+        if policy.get("max_load_factor", self.MAX_LOAD_FACTOR) > self.MAX_SAFE_LOAD_FACTOR:
+            raise ValueError("max_load_factor of a quadratic probing table must be at most {0}".format(self.MAX_SAFE_LOAD_FACTOR))
+        ProbeTable.__init__(self, expected_size, tablesize_override, hash_function, **policy)
+
+    def _next_position(self, position: int, step: int, distance: int) -> int:
+        """
+            (i + 1)^2 - i^2 = 2i + 1
+            :complexity: O(1)
+        """
+        return (position + 2 * distance + 1) % self.tablesize
+
+
+class DoubleHashTable(SequenceProbeTable[T]):
+    """
+        Hash Table using double hashing: the i-th slot visited for a key is hash(key) + i * step(key), where the
+        step comes from a second hash function and is in [1, tablesize - 1]. Keys with the same hash usually get
+        different steps, which avoids both primary and secondary clustering. With a prime tablesize every step
+        visits every slot.
+
+        attributes:
+            second_hash_function: the hash_functions.HashFunction giving the step
+    """
+
+    def __init__(self, expected_size: int, tablesize_override: int = -1, hash_function: str | HashFunction = None,
+                 second_hash_function: str | HashFunction = "fnv1a", **policy) -> None:
+        """
+            Initialiser.
+            :param second_hash_function: the name of a hash function registered in hash_functions, or a HashFunction,
+                                         giving the step of the probe sequence
+            :param policy: max_load_factor, growth_factor and min_load_factor, see ProbeTable
+        """
+        ProbeTable.__init__(self, expected_size, tablesize_override, hash_function, **policy)
+        if isinstance(second_hash_function, str):
+            second_hash_function = make_hash_function(second_hash_function)
+        self.second_hash_function = second_hash_function
+
+    def _probe_step(self, key: str) -> int:
+        """
+            Returns the step of the probe sequence of key, in [1, tablesize - 1]
+            :complexity: O(len(key)) for the hash functions of hash_functions
+        """
+        return 1 + self.second_hash_function(key, max(1, self.tablesize - 1))
+
+    def _next_position(self, position: int, step: int, distance: int) -> int:
+        """
+            :complexity: O(1)
+        """
+        return (position + step) % self.tablesize
+
+
+class CuckooTable(ProbeTable[T]):
+    """
+        Hash Table using cuckoo hashing: every key can only be in one of two slots, given by hash and by a second
+        hash function, so a lookup looks at no more than two slots. An insert into two occupied slots evicts the
+        item of the first one, which moves to its other slot, possibly evicting another item, and so on. When the
+        chain of evictions gets longer than MAX_DISPLACEMENTS (usually a cycle), the table grows.
+
+        Statistics: an insert is a conflict when its first slot is taken. Its probe distance is 1 if it used its
+        second slot, and 1 more for every item it evicted.
+
+        attributes:
+            second_hash_function: the hash_functions.HashFunction giving the second slot of a key
+    """
+
+    # Evictions allowed per insert at least, the limit also grows with the log of the tablesize
+    MAX_DISPLACEMENTS = 16
+
+    def __init__(self, expected_size: int, tablesize_override: int = -1, hash_function: str | HashFunction = None,
+                 second_hash_function: str | HashFunction = "fnv1a", **policy) -> None:
+        """
+            Initialiser.
+            :param second_hash_function: the name of a hash function registered in hash_functions, or a HashFunction,
+                                         giving the second slot of a key
+            :param policy: max_load_factor, growth_factor and min_load_factor, see ProbeTable
+            :raises ValueError: when both slots would come from the same hash function
+        """
+        ProbeTable.__init__(self, expected_size, tablesize_override, hash_function, **policy)
+        if isinstance(second_hash_function, str):
+            second_hash_function = make_hash_function(second_hash_function)
+        if self.hash_function is not None and str(self.hash_function) == str(second_hash_function):
+            raise ValueError("the two hash functions of a cuckoo table must differ")
+        self.second_hash_function = second_hash_function
+
+    def second_hash(self, key: str) -> int:
+        """
+            Returns the second slot of the key
+            :complexity: O(len(key)) for the hash functions of hash_functions
+        """
+        return self.second_hash_function(key, self.tablesize)
+
+    def _find(self, key: str) -> int:
+        """
+            Returns the slot holding the key
+            :complexity: O(K) where K is the size of the key
+            :raises KeyError: when the key is in neither of its slots
+        """
+        position = self.hash(key)
+        item = self.table[position]
+        if item is not None and item[0] == key:
+            return position
+        position = self.second_hash(key)
+        item = self.table[position]
+        if item is not None and item[0] == key:
+            return position
+        raise KeyError(key)
+
+    def keys(self) -> list[str]:
+        """
+            Returns all keys in the hash table.
+        """
+        return [item[0] for item in self.table if item is not None]
+
+    def values(self) -> list[T]:
+        """
+            Returns all values in the hash table.
+        """
+        return [item[1] for item in self.table if item is not None]
+
+    def __getitem__(self, key: str) -> T:
+        """
+            Get the item at a certain key
+            :complexity: O(K) where K is the size of the key
+            :raises KeyError: when the item doesn't exist
+        """
+        return self.table[self._find(key)][1]
+
+    def __setitem__(self, key: str, data: T) -> None:
+        """
+            Set an (key, data) pair in our hash table
+            :see: #self._insert_hashed(key: str, data: T, position: int)
+        """
+        if self._needs_growth():
+            self._rehash()
+        self._insert_hashed(key, data, self.hash(key))
+
+    def _insert_hashed(self, key: str, data: T, position: int) -> None:
+        """
+            Set an (key, data) pair whose first slot has already been computed. If the chain of evictions is too
+            long, the table grows and the item left without a slot is inserted again.
+            :complexity best: O(K) where K is the size of the key, one of its slots is free
+            :complexity worst: O(N) when the table has to grow, where N is the tablesize
+        """
+        second = self.second_hash(key)
+        for slot in (position, second):
+            item = self.table[slot]
+            if item is not None and item[0] == key:
+                self.table[slot] = (key, data)
+                return
+
+        self.count += 1
+        if self.table[position] is None:
+            self.table[position] = (key, data)
+            self._record_probe(0)
+            return
+        if self.table[second] is None:
+            self.table[second] = (key, data)
+            self._record_probe(1)
+            return
+
+        # Both slots are taken: evict from the first slot and move each evicted item to its other slot
+        homeless = (key, data)
+        slot = position
+        displacements = 0
+        limit = max(self.MAX_DISPLACEMENTS, 3 * self.tablesize.bit_length())
+        while displacements < limit:
+            homeless, self.table[slot] = self.table[slot], homeless
+            displacements += 1
+            first = self.hash(homeless[0])
+            slot = self.second_hash(homeless[0]) if slot == first else first
+            if self.table[slot] is None:
+                self.table[slot] = homeless
+                self._record_probe(1 + displacements)
+                return
+
+        # One item is left without a slot, it is inserted again once the table has grown
+        self._record_probe(1 + displacements)
+        self.count -= 1
+        self._rehash()
+        self._insert_hashed(homeless[0], homeless[1], self.hash(homeless[0]))
+
+    def __delitem__(self, key: str) -> None:
+        """
+            Delete the item with the given key. No tombstone is needed since a key has only two possible slots.
+            :complexity: O(K) where K is the size of the key, see _maybe_shrink
+            :raises KeyError: when the item doesn't exist
+        """
+        self.table[self._find(key)] = None
+        self.count -= 1
+        self._maybe_shrink()
+
+    def _resize(self, new_table_size: int) -> None:
+        """
+            Move every item into a new table of size new_table_size. Each item is hashed against the tablesize
+            when it is inserted, since inserting one may grow the table again.
+            Time complexity : Best = Worst = O(N + M) where N is the old and M the new tablesize
+        """
+        items = [item for item in self.table if item is not None]
+        self.table = ArrayR(new_table_size)
+        self.tablesize = new_table_size
+        self.count = 0
+
+        for key, data in items:
+            self._insert_hashed(key, data, self.hash(key))
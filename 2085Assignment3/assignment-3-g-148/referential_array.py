@@ -13,11 +13,21 @@ Note that while I do check the precondition in __init__ (noone else
 would), I do not check that of getitem or setitem, since that is already
 checked by self.array[index].
 """
+from __future__ import annotations
+
 __author__ = "Julian Garcia for the __init__ code, Maria Garcia de la Banda for the rest"
 __docformat__ = 'reStructuredText'
 
+from array import array
 from ctypes import py_object
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterable, Iterator
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+HAS_NUMPY = np is not None
 
 T = TypeVar('T')
 
@@ -31,7 +41,20 @@ class ArrayR(Generic[T]):
         if length <= 0:
             raise ValueError("Array length should be larger than 0.")
         self.array = (length * py_object)() # initialises the space
-        self.array[:] =  [None for _ in range(length)]
+        self.array[:] = [None] * length
+
+    @classmethod
+    def from_iterable(cls, iterable: Iterable[T]) -> ArrayR[T]:
+        """ Creates an array holding the items of iterable, without filling it with None first
+        :complexity: O(N) where N is the number of items
+        :pre: iterable has at least one item
+        """
+        items = list(iterable)
+        if len(items) == 0:
+            raise ValueError("Array length should be larger than 0.")
+        array = cls.__new__(cls)
+        array.array = (len(items) * py_object)(*items)
+        return array
 
     def __len__(self) -> int:
         """ Returns the length of the array
@@ -39,16 +62,189 @@ class ArrayR(Generic[T]):
         """
         return len(self.array)
 
-    def __getitem__(self, index: int) -> T:
-        """ Returns the object in position index.
-        :complexity: O(1)
+    def __getitem__(self, index: int | slice) -> T | list[T]:
+        """ Returns the object in position index, or a list of the objects in a slice.
+        :complexity: O(1) for an index, O(K) for a slice of K positions
         :pre: index in between 0 and length - self.array[] checks it
         """
         return self.array[index]
 
-    def __setitem__(self, index: int, value: T) -> None:
-        """ Sets the object in position index to value
-        :complexity: O(1)
+    def __setitem__(self, index: int | slice, value: T | Iterable[T]) -> None:
+        """ Sets the object in position index to value, or the positions of a slice to the items of value
+        :complexity: O(1) for an index, O(K) for a slice of K positions
         :pre: index in between 0 and length - self.array[] checks it
+        :pre: for a slice, value has exactly one item per position of the slice - self.array[] checks it
         """
         self.array[index] = value
+
+    def __iter__(self) -> Iterator[T]:
+        """ Iterates over the objects of the array
+        :complexity: O(length) for the whole iteration
+        """
+        return iter(self.array)
+
+    def fill(self, value: T, start: int = 0, end: int = None) -> None:
+        """ Sets every position from start up to (not including) end to value
+        :complexity: O(end - start)
+        :pre: 0 <= start <= end <= length
+        """
+        if end is None:
+            end = len(self.array)
+        self.array[start:end] = [value] * (end - start)
+
+    def copy_from(self, source: ArrayR[T] | list[T], source_start: int = 0, start: int = 0, length: int = None) -> None:
+        """ Copies length objects of source, starting at source_start, into this array starting at start
+        :param source: an ArrayR or any sequence supporting slicing
+        :param length: the number of objects to copy, defaults to everything from source_start to the end of source
+        :complexity: O(length)
+        :pre: both ranges are within their array
+        """
+        if length is None:
+            length = len(source) - source_start
+        if length > 0:
+            self.array[start:start + length] = source[source_start:source_start + length]
+
+    def resize(self, length: int) -> None:
+        """ Changes the length of the array, keeping the objects of the positions that are still in range.
+        New positions are set to None.
+        :complexity: O(length)
+        :pre: length > 0
+        """
+        if length <= 0:
+            raise ValueError("Array length should be larger than 0.")
+        kept = min(length, len(self.array))
+        array = (length * py_object)()
+        array[:kept] = self.array[:kept]
+        array[kept:] = [None] * (length - kept)
+        self.array = array
+
+
+class ArrayF:
+    """ Array of numbers stored unboxed in one contiguous buffer of a fixed C type, instead of one
+    reference to a Python object per position. A float takes 8 bytes instead of the 8 byte reference
+    plus the 24 byte object of an ArrayR. Reading a position creates a new Python number.
+
+    The buffer is an array.array, so it can be shared without copying through the buffer protocol
+    (memoryview(array.array) or the buffer method) and viewed as a NumPy array when NumPy is installed.
+    """
+
+    TYPECODE = 'd'
+
+    def __init__(self, length: int, typecode: str = TYPECODE) -> None:
+        """ Creates an array of the given length with every position set to 0
+        :param typecode: the array module typecode of the positions, 'd' (double) by default
+        :complexity: O(length) for best/worst case to initialise to 0
+        :pre: length > 0
+        """
+        if length <= 0:
+            raise ValueError("Array length should be larger than 0.")
+        self.array = array(typecode, bytes(array(typecode).itemsize * length))
+
+    @classmethod
+    def from_iterable(cls, iterable: Iterable[float], typecode: str = TYPECODE) -> ArrayF:
+        """ Creates an array holding the numbers of iterable
+        :complexity: O(N) where N is the number of numbers
+        :pre: iterable has at least one number
+        """
+        numbers = array(typecode, iterable)
+        if len(numbers) == 0:
+            raise ValueError("Array length should be larger than 0.")
+        result = cls.__new__(cls)
+        result.array = numbers
+        return result
+
+    @property
+    def typecode(self) -> str:
+        """ The array module typecode of the positions """
+        return self.array.typecode
+
+    def __len__(self) -> int:
+        """ Returns the length of the array
+        :complexity: O(1)
+        """
+        return len(self.array)
+
+    def __getitem__(self, index: int | slice) -> float | list[float]:
+        """ Returns the number in position index, or a list of the numbers in a slice.
+        :complexity: O(1) for an index, O(K) for a slice of K positions
+        :pre: index in between 0 and length - self.array[] checks it
+        """
+        if isinstance(index, slice):
+            return self.array[index].tolist()
+        return self.array[index]
+
+    def __setitem__(self, index: int | slice, value: float | Iterable[float]) -> None:
+        """ Sets the number in position index to value, or the positions of a slice to the numbers of value
+        :complexity: O(1) for an index, O(K) for a slice of K positions
+        :pre: index in between 0 and length - self.array[] checks it
+        :raises ValueError: when value does not have exactly one number per position of the slice
+        """
+        if isinstance(index, slice):
+            numbers = array(self.array.typecode, value)
+            if len(numbers) != len(range(*index.indices(len(self.array)))):
+                raise ValueError("Can only assign a sequence of the same length as the slice.")
+            self.array[index] = numbers
+        else:
+            self.array[index] = value
+
+    def __iter__(self) -> Iterator[float]:
+        """ Iterates over the numbers of the array
+        :complexity: O(length) for the whole iteration
+        """
+        return iter(self.array)
+
+    def buffer(self) -> memoryview:
+        """ Returns a writable view of the numbers sharing their memory, e.g. to hand to struct, a file or NumPy
+        :complexity: O(1)
+        """
+        return memoryview(self.array)
+
+    def __buffer__(self, flags: int) -> memoryview:
+        """ Buffer protocol (Python 3.12+), so memoryview(an_array_f) works like the buffer method """
+        return memoryview(self.array)
+
+    def to_numpy(self) -> np.ndarray:
+        """ Returns a NumPy array sharing the memory of this array, so writes through either are seen by both.
+        The view is invalidated by resize.
+        :complexity: O(1)
+        :raises ImportError: when NumPy is not installed
+        """
+        if not HAS_NUMPY:
+            raise ImportError("to_numpy requires NumPy")
+        return np.frombuffer(self.array, dtype=self.array.typecode)
+
+    def fill(self, value: float, start: int = 0, end: int = None) -> None:
+        """ Sets every position from start up to (not including) end to value
+        :complexity: O(end - start)
+        :pre: 0 <= start <= end <= length
+        """
+        if end is None:
+            end = len(self.array)
+        self.array[start:end] = array(self.array.typecode, [value]) * (end - start)
+
+    def copy_from(self, source: ArrayF | Iterable[float], source_start: int = 0, start: int = 0, length: int = None) -> None:
+        """ Copies length numbers of source, starting at source_start, into this array starting at start
+        :param source: an ArrayF or any sequence of numbers supporting slicing
+        :param length: the number of numbers to copy, defaults to everything from source_start to the end of source
+        :complexity: O(length)
+        :pre: both ranges are within their array
+        """
+        if length is None:
+            length = len(source) - source_start
+        if length > 0:
+            if isinstance(source, ArrayF):
+                source = source.array
+            self[start:start + length] = source[source_start:source_start + length]
+
+    def resize(self, length: int) -> None:
+        """ Changes the length of the array, keeping the numbers of the positions that are still in range.
+        New positions are set to 0. Any buffer or NumPy view of the array must be released first.
+        :complexity: O(length)
+        :pre: length > 0
+        """
+        if length <= 0:
+            raise ValueError("Array length should be larger than 0.")
+        if length < len(self.array):
+            del self.array[length:]
+        else:
+            self.array.frombytes(bytes(self.array.itemsize * (length - len(self.array))))
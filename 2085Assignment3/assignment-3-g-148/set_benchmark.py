@@ -0,0 +1,97 @@
+""" Benchmark of bitset.BitSet against aset.ASet
+
+For every size N, two sets holding about half of the integers 0 .. N - 1 each are built, and the
+report gives the time per add and per membership query, and the time of a union, an intersection
+and a difference. ASet scans its array on every add and membership query, so its set algebra is
+O(N * M): it is only run up to --aset-limit elements, larger sizes are reported as "-".
+Membership queries on ASet are sampled with --queries lookups.
+
+Usage:
+    python set_benchmark.py
+    python set_benchmark.py --sizes 1000 10000 100000 1000000 --aset-limit 10000 --queries 200
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from typing import Callable
+
+from aset import ASet
+from bitset import BitSet
+from set import Set
+
+__author__ = 'Tan Jun Yu'
+__docformat__ = 'reStructuredText'
+
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5, 10 ** 6]
+ASET_LIMIT = 10 ** 4
+QUERIES = 200
+
+
+def timed(function: Callable[[], object]) -> float:
+    """
+    Returns the seconds taken by one call of function
+    :complexity: that of function
+    """
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def fill(the_set: Set[int], items: list[int]) -> None:
+    """
+    Adds every item to the set
+    :complexity: O(N * add) where N is the number of items
+    """
+    for item in items:
+        the_set.add(item)
+
+
+def run_benchmark(set_class: type, size: int, queries: int, seed: int = 2085) -> dict:
+    """
+    Build two random sets of integers below size and time the set operations on them
+    :param queries: the number of membership queries timed
+    :returns: one row of the report, times in seconds and per operation times in nanoseconds
+    :complexity: O(N * add + queries * contains + union + intersection + difference) where N is size
+    """
+    generator = random.Random(seed)
+    items = [[item for item in range(size) if generator.random() < 0.5] for _ in range(2)]
+    probes = [generator.randrange(size) for _ in range(queries)]
+
+    first, second = set_class(size), set_class(size)
+    add_seconds = timed(lambda: fill(first, items[0]))
+    fill(second, items[1])
+    contains_seconds = timed(lambda: [probe in first for probe in probes])
+
+    return {"set": set_class.__name__, "size": size,
+            "add_ns": add_seconds / len(items[0]) * 1e9,
+            "contains_ns": contains_seconds / queries * 1e9,
+            "union": timed(lambda: first.union(second)),
+            "intersection": timed(lambda: first.intersection(second)),
+            "difference": timed(lambda: first.difference(second))}
+
+
+def main() -> None:
+    """ Parse the benchmark from the command line, run it and print the timings of every set and size. """
+    parser = argparse.ArgumentParser(description="Time BitSet against ASet for growing numbers of integers.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--aset-limit", type=int, default=ASET_LIMIT, help="largest size ASet is run for")
+    parser.add_argument("--queries", type=int, default=QUERIES, help="number of membership queries timed")
+    args = parser.parse_args()
+
+    print("{0:<8} {1:>9} {2:>12} {3:>12} {4:>12} {5:>14} {6:>12}".format(
+        "set", "size", "add ns", "contains ns", "union s", "intersection s", "difference s"))
+    for size in args.sizes:
+        for set_class in (ASet, BitSet):
+            if set_class is ASet and size > args.aset_limit:
+                print("{0:<8} {1:>9} {2:>12} {3:>12} {4:>12} {5:>14} {6:>12}".format("ASet", size, *"-" * 5))
+                continue
+            row = run_benchmark(set_class, size, args.queries)
+            print("{set:<8} {size:>9} {add_ns:>12.0f} {contains_ns:>12.0f} {union:>12.6f} {intersection:>14.6f} "
+                  "{difference:>12.6f}".format(**row), flush=True)
+
+
+if __name__ == "__main__":
+    main()
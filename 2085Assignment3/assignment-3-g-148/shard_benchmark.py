@@ -0,0 +1,90 @@
+""" Throughput benchmark of sharded_table.ShardedProbeTable
+
+Every thread of a pool runs the same mix of lookups and updates against one shared table loaded with a
+city dataset, and the throughput (operations per second over all threads) is reported for each
+combination of thread count and shard count. With a single shard every operation waits on the same lock,
+so comparing shard counts shows how much of the time threads spend blocked on each other. On a CPython
+build with the GIL only one thread runs Python code at a time, so the absolute scaling with thread count
+is limited by the interpreter rather than by the table.
+
+Usage:
+    python shard_benchmark.py
+    python shard_benchmark.py --dataset us --threads 1 2 4 8 16 --shards 1 16 --operations 200000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+from analysis import DATASETS, load_dataset
+from sharded_table import ShardedProbeTable
+
+__author__ = 'Tan Jun Yu'
+__docformat__ = 'reStructuredText'
+
+THREAD_COUNTS = [1, 2, 4, 8]
+SHARD_COUNTS = [1, 8, 32]
+
+
+def worker(table: ShardedProbeTable, keys: tuple[str, ...], operations: int, write_ratio: float, seed: int) -> int:
+    """
+    Run operations random lookups and updates against the table
+    :param write_ratio: fraction of the operations that set a key instead of reading it
+    :returns: the number of operations run
+    :complexity: O(operations * (L + P)) where L is the length of the longest key and P the probe length
+    """
+    generator = random.Random(seed)
+    for operation in range(operations):
+        key = keys[generator.randrange(len(keys))]
+        if generator.random() < write_ratio:
+            table[key] = operation
+        else:
+            _ = table[key]
+    return operations
+
+
+def run_benchmark(keys: tuple[str, ...], threads: int, shards: int, operations: int, write_ratio: float) -> dict:
+    """
+    Load the keys into a fresh table and split operations over a pool of threads
+    :returns: one row of the report
+    :complexity: O(operations * (L + P)) spread over the threads
+    """
+    table = ShardedProbeTable(len(keys), shard_count=shards)
+    table.bulk_insert(keys, range(len(keys)))
+
+    per_thread = operations // threads
+    start = time.perf_counter()
+    with ThreadPoolExecutor(max_workers=threads) as executor:
+        futures = [executor.submit(worker, table, keys, per_thread, write_ratio, seed) for seed in range(threads)]
+        done = sum(future.result() for future in futures)
+    seconds = time.perf_counter() - start
+
+    return {"threads": threads, "shards": shards, "operations": done, "seconds": seconds,
+            "operations_per_second": done / seconds}
+
+
+def main() -> None:
+    """ Parse the benchmark from the command line, run it and print the throughput of every configuration. """
+    parser = argparse.ArgumentParser(description="Throughput of ShardedProbeTable by thread count and shard count.")
+    parser.add_argument("--dataset", choices=list(DATASETS), default="us")
+    parser.add_argument("--threads", nargs="+", type=int, default=THREAD_COUNTS)
+    parser.add_argument("--shards", nargs="+", type=int, default=SHARD_COUNTS)
+    parser.add_argument("--operations", type=int, default=100000, help="total operations per configuration")
+    parser.add_argument("--write-ratio", type=float, default=0.1, help="fraction of the operations that are updates")
+    args = parser.parse_args()
+
+    keys = load_dataset(DATASETS[args.dataset])
+    for shards in args.shards:
+        baseline = None
+        for threads in args.threads:
+            row = run_benchmark(keys, threads, shards, args.operations, args.write_ratio)
+            baseline = baseline or row["operations_per_second"]
+            print("shards={0:<4} threads={1:<4} {2:>12.0f} ops/s  x{3:.2f}".format(
+                shards, threads, row["operations_per_second"], row["operations_per_second"] / baseline), flush=True)
+
+
+if __name__ == "__main__":
+    main()
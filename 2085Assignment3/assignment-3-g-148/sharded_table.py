@@ -0,0 +1,221 @@
+""" Sharded Hash Table
+
+Defines a thread-safe hash table partitioning its keys over independent Linear Probe Tables,
+each guarded by its own lock.
+"""
+from __future__ import annotations
+
+__author__ = 'Tan Jun Yu'
+__docformat__ = 'reStructuredText'
+
+import math
+import threading
+from typing import TypeVar, Generic, Iterable
+
+from hash_table import LinearProbeTable, TableStatistics
+
+T = TypeVar('T')
+
+
+class ShardedProbeTable(Generic[T]):
+    """
+        Hash table made of shard_count LinearProbeTable shards. A key always lives in the shard picked by
+        shard_of, and every access to a shard holds that shard's lock, so threads working on different
+        shards never wait for each other and a shard rehashes without blocking the others.
+        Methods covering every shard (len, keys, values, statistics) lock the shards one at a time, so they
+        see each shard in a consistent state but not all shards at the same instant.
+
+        attributes:
+            shards: the LinearProbeTable of each shard
+            locks: the lock of each shard
+    """
+
+    # Default number of shards
+    SHARD_COUNT = 8
+
+    def __init__(self, expected_size: int, shard_count: int = SHARD_COUNT, **table_kwargs) -> None:
+        """
+            Initialiser.
+            :param expected_size: the expected number of items over all shards
+            :param shard_count: the number of shards
+            :param table_kwargs: any other argument of the LinearProbeTable initialiser, used for every shard
+            :raises ValueError: when shard_count is not positive
+            :complexity: O(S + N) where S is shard_count and N is expected_size
+        """
+        if shard_count <= 0:
+            raise ValueError("shard_count must be positive")
+        shard_size = max(1, math.ceil(expected_size / shard_count))
+        self.shards = [LinearProbeTable(shard_size, **table_kwargs) for _ in range(shard_count)]
+        self.locks = [threading.Lock() for _ in range(shard_count)]
+
+    def shard_of(self, key: str) -> int:
+        """
+            Returns the index of the shard holding the key. The builtin hash is used so the shard does not
+            correlate with the position of the key inside the shard, and strings cache it.
+            :complexity: Best Case = O(1) when the hash of the key is cached, Worst Case = O(len(key))
+        """
+        return hash(key) % len(self.shards)
+
+    def __len__(self) -> int:
+        """
+            Returns number of elements in the hash table
+            :complexity: O(S) where S is the number of shards
+        """
+        total = 0
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                total += len(shard)
+        return total
+
+    def is_empty(self) -> bool:
+        """
+            Returns whether the hash table is empty
+            :complexity: O(S) where S is the number of shards
+        """
+        return len(self) == 0
+
+    def __contains__(self, key: str) -> bool:
+        """
+            Checks to see if the given key is in the Hash Table
+            :see: #self.__getitem__(self, key: str)
+        """
+        try:
+            _ = self[key]
+        except KeyError:
+            return False
+        else:
+            return True
+
+    def __getitem__(self, key: str) -> T:
+        """
+            Get the item at a certain key
+            :see: LinearProbeTable.__getitem__
+            :raises KeyError: when the item doesn't exist
+        """
+        index = self.shard_of(key)
+        with self.locks[index]:
+            return self.shards[index][key]
+
+    def __setitem__(self, key: str, data: T) -> None:
+        """
+            Set an (key, data) pair in our hash table
+            :see: LinearProbeTable.__setitem__
+        """
+        index = self.shard_of(key)
+        with self.locks[index]:
+            self.shards[index][key] = data
+
+    def __delitem__(self, key: str) -> None:
+        """
+            Delete the item with the given key
+            :see: LinearProbeTable.__delitem__
+            :raises KeyError: when the item doesn't exist
+        """
+        index = self.shard_of(key)
+        with self.locks[index]:
+            del self.shards[index][key]
+
+    def insert(self, key: str, data: T) -> None:
+        """
+            Utility method to call our setitem method
+            :see: #__setitem__(self, key: str, data: T)
+        """
+        self[key] = data
+
+    def bulk_insert(self, keys: Iterable[str], values: Iterable[T]) -> None:
+        """
+            Set every (key, value) pair, grouping the pairs by shard and inserting each group with a single
+            LinearProbeTable.bulk_insert under the shard's lock
+            :raises ValueError: when keys and values have different lengths
+            :complexity: O(N * (L + P)) where N is the number of keys, L is the length of the longest key and P is the probe length
+        """
+        keys = list(keys)
+        values = list(values)
+        if len(keys) != len(values):
+            raise ValueError("keys and values must have the same length")
+
+        shard_keys = [[] for _ in self.shards]
+        shard_values = [[] for _ in self.shards]
+        for key, value in zip(keys, values):
+            index = self.shard_of(key)
+            shard_keys[index].append(key)
+            shard_values[index].append(value)
+
+        for index in range(len(self.shards)):
+            if len(shard_keys[index]) > 0:
+                with self.locks[index]:
+                    self.shards[index].bulk_insert(shard_keys[index], shard_values[index])
+
+    def keys(self) -> list[str]:
+        """
+            Returns all keys in the hash table.
+            :complexity: O(N) where N is the total size of the shards
+        """
+        res = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                res.extend(shard.keys())
+        return res
+
+    def values(self) -> list[T]:
+        """
+            Returns all values in the hash table.
+            :complexity: O(N) where N is the total size of the shards
+        """
+        res = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                res.extend(shard.values())
+        return res
+
+    def shard_statistics(self) -> list[TableStatistics]:
+        """
+            Returns the statistics of every shard
+            :complexity: O(S) where S is the number of shards
+        """
+        res = []
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                res.append(shard.statistics())
+        return res
+
+    def statistics(self) -> TableStatistics:
+        """
+            Return the number of conflicts, total distance probed, length of longest probe and number of rehashes
+            summed over the shards, except the longest probe which is the longest of any shard.
+            The extras of LinearProbeTable.statistics are aggregated the same way: tombstones, compaction_count and
+            rehash_seconds are summed, load_factor is the number of items over the total tablesize, and
+            migration_progress is that of the least migrated shard. shard_count is also available.
+            :complexity: O(S) where S is the number of shards
+        """
+        shard_statistics = []
+        count = 0
+        tablesize = 0
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                shard_statistics.append(shard.statistics())
+                count += len(shard)
+                tablesize += shard.tablesize
+
+        return TableStatistics(sum(statistics[0] for statistics in shard_statistics),
+                               sum(statistics[1] for statistics in shard_statistics),
+                               max(statistics[2] for statistics in shard_statistics),
+                               sum(statistics[3] for statistics in shard_statistics),
+                               migration_progress=min(statistics.migration_progress for statistics in shard_statistics),
+                               tombstones=sum(statistics.tombstones for statistics in shard_statistics),
+                               compaction_count=sum(statistics.compaction_count for statistics in shard_statistics),
+                               load_factor=count / tablesize,
+                               rehash_seconds=sum(statistics.rehash_seconds for statistics in shard_statistics),
+                               shard_count=len(self.shards))
+
+    def __str__(self) -> str:
+        """
+            Returns all they key/value pairs in our hash table (no particular
+            order).
+            :complexity: O(N) where N is the total size of the shards
+        """
+        result = ""
+        for shard, lock in zip(self.shards, self.locks):
+            with lock:
+                result += str(shard)
+        return result
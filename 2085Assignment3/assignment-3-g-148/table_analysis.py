@@ -5,7 +5,8 @@ This hash table is used for the analysis. The hash function uses a static base i
 a dynamic base.
 """
 from __future__ import annotations
-from primes import LargestPrimeIterator
+from primes import is_prime, next_prime, growth_prime
+from bulk_hash import polynomial_hash
 
 __author__ = 'Brendon Taylor. Modified by Graeme Gange, Alexey Ignatiev, and Jackson Goerner'
 __docformat__ = 'reStructuredText'
@@ -14,7 +15,7 @@ __since__ = '14/05/2020'
 
 
 from referential_array import ArrayR
-from typing import TypeVar, Generic
+from typing import TypeVar, Generic, Iterable
 T = TypeVar('T')
 
 
@@ -32,17 +33,7 @@ class LinearProbeTable(Generic[T]):
         '''
         Function to check if the num is prime . Returns True or False
         '''
-        if num > 1:
-        # Iterate from 2 to n / 2
-            for i in range(2, int(num/2)+1):
-            # If num is divisible by any number between
-            # 2 and n / 2, it is not prime
-                if (num % i) == 0:
-                    return False
-            else:
-                return True
-        else:
-            return False
+        return is_prime(num)
 
 
     def __init__(self, expected_size: int, tablesize_override: int = -1) -> None:
@@ -55,15 +46,8 @@ class LinearProbeTable(Generic[T]):
 
         
         if tablesize_override == -1 :
-            # if expected_size is prime number, set the table_size to expected_size
-            if self.check_prime(expected_size) :
-                self.tablesize = expected_size
-            # if expected_size is not prime number
-            else : 
-                # Increment the expected_size by 1 untill it becomes a prime number then only set it as the table_size
-                while not self.check_prime(expected_size):
-                    expected_size += 1
-                self.tablesize = expected_size    
+            # Use the smallest prime greater than or equal to expected_size as the table_size
+            self.tablesize = next_prime(expected_size)
         else : 
             # Set the table_size to tablesize_override if tablesize_override is not -1
             self.tablesize = tablesize_override
@@ -82,6 +66,18 @@ class LinearProbeTable(Generic[T]):
             value = (value * self.base + ord(char)) % self.tablesize
         return value
 
+    def bulk_hash(self, keys: list[str]) -> list[int]:
+        """
+        Hash a batch of keys at once with NumPy, giving the same values as calling self.hash on every key.
+        Falls back to self.hash when NumPy is not installed or self.hash has been replaced.
+        """
+        if 'hash' not in self.__dict__ and type(self).hash is LinearProbeTable.hash:
+            longest = max((len(key) for key in keys), default=0)
+            hashes = polynomial_hash(keys, self.tablesize, [self.base] * longest)
+            if hashes is not None:
+                return hashes
+        return [self.hash(key) for key in keys]
+
 
     def statistics(self) -> tuple:
         return (self.conflict,self.total_distance_probed,self.length_longest_probe,self.rehashing_count)
@@ -93,16 +89,18 @@ class LinearProbeTable(Generic[T]):
         """
         return self.count
 
-    def _linear_probe(self, key: str, is_insert: bool) -> int:
+    def _linear_probe(self, key: str, is_insert: bool, position: int = None) -> int:
         """
             Find the correct position for this key in the hash table using linear probing
+            :param position: the hash of the key if it has already been computed
             :complexity best: O(K) first position is empty
                             where K is the size of the key
             :complexity worst: O(K + N) when we've searched the entire table
                             where N is the tablesize
             :raises KeyError: When a position can't be found
         """
-        position = self.hash(key)  # get the position using hash
+        if position is None:
+            position = self.hash(key)  # get the position using hash
 
         conflict_counted = False
 
@@ -216,18 +214,50 @@ class LinearProbeTable(Generic[T]):
         """
         self[key] = data
 
+    def bulk_insert(self, keys: Iterable[str], values: Iterable[T]) -> None:
+        """
+            Set every (key, value) pair, hashing the keys in batches with self.bulk_hash.
+            Gives the same positions and statistics as setting the items one at a time.
+            :raises ValueError: when keys and values have different lengths
+        """
+        keys = list(keys)
+        values = list(values)
+        if len(keys) != len(values):
+            raise ValueError("keys and values must have the same length")
+
+        start = 0
+        while start < len(keys):
+            # At least this many inserts can happen before the rehash check of __setitem__ triggers
+            batch_size = max(1, self.tablesize // 2 - self.count + 1)
+            batch = keys[start:start + batch_size]
+            for position in self.bulk_hash(batch):
+                if self.count > ( self.tablesize // 2):
+                    self._rehash()
+                    break   # the remaining hashes were computed for the old tablesize
+                self._insert_hashed(keys[start], values[start], position)
+                start += 1
+
+    def _insert_hashed(self, key: str, data: T, position: int) -> None:
+        """
+            Set an (key, data) pair whose hash has already been computed
+        """
+        position = self._linear_probe(key, True, position)
+
+        if self.table[position] is None:
+            self.count += 1
+
+        self.table[position] = (key, data)
+
     def _rehash(self) -> None:
         """
             Need to resize table and reinsert all values
-            Time complexity : Best = Worst = O(len(self.table) + len(self.table) + next() ) 
+            Time complexity : Best = Worst = O(len(self.table) + len(self.table) + growth_prime() ) 
         """
         self.rehashing_count += 1
         self.count = 0
 
         # Find the next biggest prime number with the upper bound of twice the value of the current table size 
-        prime_iterator = LargestPrimeIterator(self.tablesize,2)
-        next_1 = next(prime_iterator)
-        new_table_size = next(prime_iterator)
+        new_table_size = growth_prime(self.tablesize, 2)
 
         new_table = ArrayR(new_table_size)
         
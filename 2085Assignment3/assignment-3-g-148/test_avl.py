@@ -137,7 +137,162 @@ class TestAVL(unittest.TestCase):
         for num in numbers[:length]:
             tree[num] = num
 
-        self.assertEqual(tree.range_between(1, 5), [2, 3, 4, 5, 6], "Range between failed")
+        self.assertEqual(list(tree.range_between(1, 5)), [2, 3, 4, 5, 6], "Range between failed")
+
+    def check_size(self, current: AVLTreeNode) -> int:
+        if current is None:
+            return 0
+        size = 1 + self.check_size(current.left) + self.check_size(current.right)
+        self.assertEqual(current.size, size, 'Wrong size for key node ({0}, {1})'.format(current.key, current.item))
+        return size
+
+    def test_order_statistics(self):
+        generator = random.Random(2085)
+        tree = AVLTree()
+        keys = set()
+        for _ in range(2000):
+            key = generator.randrange(400)
+            if key in keys:
+                del tree[key]
+                keys.remove(key)
+            else:
+                tree[key] = key * 10
+                keys.add(key)
+        self.check_size(tree.root)
+
+        ordered = sorted(keys)
+        for k in range(len(ordered)):
+            self.assertEqual(tree.select(k), ordered[k] * 10)
+            self.assertEqual(tree.rank(ordered[k]), k)
+        self.assertEqual(tree.rank(-1), 0)
+        self.assertEqual(tree.rank(400), len(ordered))
+        self.assertRaises(IndexError, lambda: tree.select(len(ordered)))
+
+        for i, j in [(0, len(ordered) - 1), (3, 17), (10, 10), (5, 4), (len(ordered) - 2, len(ordered) + 5)]:
+            self.assertEqual(list(tree.range_between(i, j)), [key * 10 for key in ordered[i:j + 1]])
+
+        self.assertIn(tree.random_element(random.Random(1)) // 10, keys)
+        self.assertRaises(IndexError, lambda: AVLTree().random_element())
+
+    def testRandomOperations(self):
+        generator = random.Random(2085)
+        tree = AVLTree()
+        expected = {}
+        for _ in range(3000):
+            key = generator.randrange(500)
+            if key in expected:
+                del tree[key]
+                del expected[key]
+            else:
+                tree[key] = str(key)
+                expected[key] = str(key)
+        self.height = {}  # clearing the cache
+        self.assertEqual(len(tree), len(expected))
+        self.assertEqual([key for key in tree], sorted(expected))
+        self.assertTrue(all(tree[key] == str(key) for key in expected))
+        self.assertTrue(self.check_invariant(tree.root))
+        self.assertEqual(tree.root.height, self.get_height(tree.root))
+        self.assertRaises(ValueError, lambda: tree.__setitem__(next(iter(expected)), None))
+
+    def test_bulk_constructors(self):
+        numbers = list(range(1, 300))
+        random.Random(2085).shuffle(numbers)
+        tree = AVLTree.from_unsorted((num, str(num)) for num in numbers)
+        self.height = {}  # clearing the cache
+        self.assertEqual(len(tree), len(numbers))
+        self.assertEqual([key for key in tree], sorted(numbers))
+        self.assertEqual(tree.root.height, self.get_height(tree.root))
+        self.assertEqual(tree.root.height, math.ceil(math.log2(len(numbers) + 1)))
+        self.check_size(tree.root)
+        self.assertEqual(tree[150], "150")
+
+        # the tree is an ordinary AVL tree afterwards
+        tree[1000] = "1000"
+        del tree[150]
+        self.assertEqual(tree.select(len(tree) - 1), "1000")
+
+        self.assertEqual(len(AVLTree.from_sorted([])), 0)
+        self.assertRaises(ValueError, lambda: AVLTree.from_sorted([(2, 2), (1, 1)]))
+        self.assertRaises(ValueError, lambda: AVLTree.from_unsorted([(1, 1), (1, 1)]))
+
+    def test_merge(self):
+        evens = AVLTree.from_sorted((num, num) for num in range(0, 100, 2))
+        odds = AVLTree()
+        for num in range(1, 60, 2):
+            odds[num] = num
+        merged = evens.merge(odds)
+        self.assertEqual([key for key in merged], sorted(list(range(0, 100, 2)) + list(range(1, 60, 2))))
+        self.check_size(merged.root)
+        self.assertEqual(len(evens), 50)
+        self.assertEqual(len(odds), 30)
+        self.assertRaises(ValueError, lambda: evens.merge(evens))
+
+    def test_pop_extremes(self):
+        numbers = list(range(200))
+        random.Random(2085).shuffle(numbers)
+        tree = AVLTree.from_unsorted((num, str(num)) for num in numbers)
+        self.assertEqual(tree.peek_min().key, 0)
+        self.assertEqual(tree.peek_max().key, 199)
+
+        popped = []
+        while len(tree) > 100:
+            popped.append(tree.pop_max().key)
+            popped.append(tree.pop_min().key)
+            self.height = {}  # clearing the cache
+            self.assertTrue(self.check_balance(tree.root))
+        self.assertEqual(sorted(popped), list(range(50)) + list(range(150, 200)))
+        self.assertEqual([key for key in tree], list(range(50, 150)))
+        self.check_size(tree.root)
+        self.assertEqual(tree.root.height, self.get_height(tree.root))
+
+        node = tree.pop_max()
+        self.assertEqual((node.key, node.item, node.left, node.right), (149, "149", None, None))
+        self.assertEqual(tree.find_max_and_remove().key, 148)
+        self.assertIsNone(AVLTree().find_max_and_remove())
+        self.assertRaises(IndexError, lambda: AVLTree().pop_min())
+        self.assertRaises(IndexError, lambda: AVLTree().peek_max())
+
+    def test_multimap(self):
+        generator = random.Random(2085)
+        tree = AVLTree(multimap=True)
+        pairs = [(generator.randrange(20), i) for i in range(300)]
+        for key, item in pairs:
+            tree[key] = item
+        self.height = {}  # clearing the cache
+        self.check_size(tree.root)
+        self.assertEqual(tree.root.height, self.get_height(tree.root))
+
+        # duplicate keys are still rejected outside of multimap mode
+        unique = AVLTree()
+        unique[1] = 1
+        self.assertRaises(ValueError, lambda: unique.__setitem__(1, 2))
+        self.assertRaises(ValueError, lambda: AVLTree.from_sorted([(1, 1), (1, 2)]))
+
+        # equal keys keep their insertion order, the latest one is popped first
+        ordered = sorted(pairs, key=lambda pair: pair[0])
+        self.assertEqual(tree.in_order(tree.root), [item for _, item in ordered])
+        self.assertEqual(list(tree.get_all(7)), [item for key, item in pairs if key == 7])
+        last = tree.pop_max()
+        self.assertEqual((last.key, last.item), [pair for pair in pairs if pair[0] == 19][-1])
+
+        for key, item in pairs[:100]:
+            tree.remove_item(key, item)
+        remaining = [item for key, item in sorted(pairs[100:], key=lambda pair: pair[0]) if (key, item) != (last.key, last.item)]
+        self.assertEqual(tree.in_order(tree.root), remaining)
+        self.height = {}
+        self.check_size(tree.root)
+        self.assertEqual(tree.root.height, self.get_height(tree.root))
+        self.assertRaises(ValueError, lambda: tree.remove_item(*pairs[0]))
+
+        # delete_at removes by position
+        removed = tree.delete_at(0)
+        self.assertEqual(removed.item, remaining[0])
+        self.assertEqual(len(tree), len(remaining) - 1)
+
+        bulk = AVLTree.from_unsorted(pairs, multimap=True)
+        self.assertEqual(bulk.in_order(bulk.root), [item for _, item in ordered])
+        merged = bulk.merge(AVLTree.from_sorted([(0, "first"), (0, "second")], multimap=True))
+        self.assertEqual(list(merged.get_all(0)), [item for key, item in pairs if key == 0] + ["first", "second"])
 
 
 if __name__ == '__main__':
@@ -0,0 +1,62 @@
+"""
+    Unit test for BitSet, implemented via inheritance from TestSet.
+"""
+from test_set import *
+from bitset import *
+from aset import ASet
+from hset import HSet
+
+
+class TestBitSet(TestSet):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.SetType = BitSet
+
+    def test_growth(self):
+        s = self.SetType(10)
+        for i in (0, 9, 10, 1000):
+            s.add(i)
+        self.assertEqual(list(s), [0, 9, 10, 1000])
+        self.assertNotIn(-1, s)
+        self.assertNotIn(5000, s)
+        self.assertRaises(ValueError, lambda: s.add(-1))
+        self.assertRaises(KeyError, lambda: s.remove(5))
+
+    def test_contains_other_types(self):
+        s = BitSet.from_mask(0b1111)
+        for item in ("a", -1, -8, 1.5, None, (1,)):
+            self.assertNotIn(item, s)
+        self.assertIn(3, s)
+        self.assertRaises(KeyError, lambda: s.remove("a"))
+
+    def test_mask(self):
+        s = BitSet.from_mask(0b100101)
+        self.assertEqual(list(s), [0, 2, 5])
+        self.assertEqual(len(s), 3)
+        self.assertEqual(s.mask(), 0b100101)
+        self.assertEqual(str(s), "{0, 2, 5}")
+        self.assertTrue(BitSet.from_mask(0).is_empty())
+
+    def test_mixed_types(self):
+        s = BitSet.from_mask(0b1111)
+        for other_type in (ASet, HSet):
+            other = other_type(10)
+            for item in (2, 3, 7):
+                other.add(item)
+            self.assertEqual(list(s.union(other)), [0, 1, 2, 3, 7])
+            self.assertEqual(list(s.intersection(other)), [2, 3])
+            self.assertEqual(list(s.difference(other)), [0, 1])
+
+        others = HSet(10)
+        for item in (-1, "a", 1):
+            others.add(item)
+        self.assertEqual(list(s.intersection(others)), [1])
+        self.assertEqual(list(s.difference(others)), [0, 2, 3])
+        self.assertRaises(ValueError, lambda: s.union(others))
+
+
+if __name__ == '__main__':
+    testtorun = TestBitSet()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
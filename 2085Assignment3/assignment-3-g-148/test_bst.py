@@ -115,6 +115,39 @@ class TestBST(unittest.TestCase):
 
             self.assertEqual(array, sorted_array, 'In-Order traversal produces a wrong order: {0}'.format(array))
 
+    def testDegenerate(self):
+        # sorted keys make a linked list, deeper than the recursion limit
+        length = 5000
+        tree = BinarySearchTree()
+        for num in range(length):
+            tree[num] = num
+        self.assertEqual(len(tree), length)
+        self.assertEqual(tree[length - 1], length - 1)
+        self.assertEqual(tree.get_minimal(tree.root).key, 0)
+        for num in range(0, length, 2):
+            del tree[num]
+        self.assertEqual([key for key in tree], list(range(1, length, 2)))
+        self.assertRaises(ValueError, lambda: tree.__delitem__(0))
+
+    def testIterators(self):
+        numbers = list(range(0, 200, 3))
+        random.Random(2085).shuffle(numbers)
+        tree = BinarySearchTree()
+        for num in numbers:
+            tree[num] = str(num)
+
+        self.assertEqual(list(reversed(tree)), sorted(numbers, reverse=True))
+        self.assertEqual(list(tree.iter_items()), [str(num) for num in sorted(numbers)])
+        self.assertEqual(list(tree.iter_items(reverse=True)), [str(num) for num in sorted(numbers, reverse=True)])
+
+        # the iterators are lazy
+        largest = tree.iter_items(reverse=True)
+        self.assertEqual(next(largest), "198")
+
+        for lo, hi in [(10, 40), (9, 9), (-5, 5), (190, 500), (50, 20)]:
+            self.assertEqual(list(tree.items_between(lo, hi)), [str(num) for num in sorted(numbers) if lo <= num <= hi])
+        self.assertEqual(list(BinarySearchTree().items_between(0, 10)), [])
+
 
 if __name__ == '__main__':
     # seeding the pseudo-random generator
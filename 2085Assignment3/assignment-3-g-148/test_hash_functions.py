@@ -0,0 +1,73 @@
+"""
+Tests the registry of hash functions and the tables built with them.
+"""
+
+from hash_functions import HASH_FUNCTIONS, HashFunction, make_hash_function, register_hash_function
+from hash_table import LinearProbeTable, RobinHoodProbeTable
+import unittest
+
+NAMES = "Eva, Amy, Tim, Ron, Jan, Kim, Dot, Ann, Jim, Jon, Joe, Zoe, Melbourne, Kraków".split(", ")
+
+
+class FirstLetterHash(HashFunction):
+    """ Hash on the first letter only, like silly_hash in test_hash_table. """
+
+    name = "first_letter"
+
+    def __call__(self, key: str, tablesize: int) -> int:
+        return ord(key[0]) % tablesize
+
+
+class TestHashFunctions(unittest.TestCase):
+    """ Testing the hash function registry. """
+
+    def test_in_range(self):
+        for name in HASH_FUNCTIONS:
+            hash_function = make_hash_function(name)
+            for tablesize in (5, 19, 1009):
+                for key in NAMES + [""]:
+                    self.assertIn(hash_function(key, tablesize), range(tablesize), str(hash_function))
+                self.assertEqual(hash_function.bulk(NAMES, tablesize), [hash_function(key, tablesize) for key in NAMES])
+
+    def test_known_values(self):
+        # The universal hash is the default hash of LinearProbeTable
+        table = LinearProbeTable(10, tablesize_override=19)
+        self.assertEqual([make_hash_function("universal")(key, 19) for key in NAMES], [table.hash(key) for key in NAMES])
+        # The rolling hash is the polynomial hash computed with precomputed powers
+        for base in (1, 31, 9929):
+            polynomial = make_hash_function("polynomial", base=base)
+            rolling = make_hash_function("rolling", base=base)
+            self.assertEqual([polynomial(key, 1009) for key in NAMES], [rolling(key, 1009) for key in NAMES])
+        self.assertEqual(make_hash_function("polynomial", base=31)("ab", 1009), (97 * 31 + 98) % 1009)
+        # FNV-1a test vectors
+        self.assertEqual(make_hash_function("fnv1a")("", 2 ** 64 + 1), 0xcbf29ce484222325)
+        self.assertEqual(make_hash_function("fnv1a")("a", 2 ** 64 + 1), 0xaf63dc4c8601ec8c)
+
+    def test_registry(self):
+        self.assertRaises(KeyError, lambda: make_hash_function("md5"))
+        self.assertRaises(ValueError, lambda: register_hash_function("fnv1a", FirstLetterHash))
+        register_hash_function(FirstLetterHash.name, FirstLetterHash)
+        try:
+            table = LinearProbeTable(10, tablesize_override=19, hash_function="first_letter")
+            table.bulk_insert("Eva, Amy, Tim, Ron, Jan, Kim, Dot, Ann, Jim, Jon".split(", "), range(10))
+            self.assertEqual(table.statistics(), (4, 8, 3, 0))
+        finally:
+            del HASH_FUNCTIONS[FirstLetterHash.name]
+
+    def test_table_hash_function(self):
+        for name in HASH_FUNCTIONS:
+            for table_class in (LinearProbeTable, RobinHoodProbeTable):
+                table = table_class(11, hash_function=name)
+                for position, key in enumerate(NAMES):
+                    table[key] = position
+                # Rehashing keeps using the hash function
+                self.assertGreater(table.statistics()[3], 0)
+                self.assertEqual(table.hash("Eva"), table.hash_function("Eva", table.tablesize))
+                for position, key in enumerate(NAMES):
+                    self.assertEqual(table[key], position)
+
+
+if __name__ == '__main__':
+
+    # running all the tests
+    unittest.main()
@@ -2,7 +2,11 @@
 Tests basic functionality of the hash table methods, such as statistics.
 """
 
-from hash_table import LinearProbeTable
+from hash_table import LinearProbeTable, RobinHoodProbeTable, CompactProbeTable, MappedProbeTable
+from hash_functions import make_hash_function
+import os
+import sys
+import tempfile
 import unittest
 
 __author__ = "Jackson Goerner"
@@ -47,6 +51,248 @@ class TestHashTable(unittest.TestCase):
         self.assertGreaterEqual(probe_max, 3)    # Jon: 3  + Whatever rehash caused
         self.assertEqual(rehash, 1)              # 1 rehash
 
+    def test_incremental_rehash(self):
+        table = LinearProbeTable(10, tablesize_override=FIX_TABLESIZE, incremental_rehash=True, migration_step=2)
+        names = "Eva, Amy, Tim, Ron, Jan, Kim, Dot, Ann, Jim, Jon".split(", ")
+        for name in names:
+            table[name] = name + "-value"
+        self.assertEqual(table.statistics().migration_progress, 1.0)
+
+        # The 11th insert starts the migration instead of reinserting everything at once
+        table["Joe"] = "Joe-value"
+        self.assertTrue(table.is_migrating())
+        self.assertGreater(len(table.table), FIX_TABLESIZE)
+        self.assertEqual(table.statistics()[3], 1)
+        self.assertLess(table.statistics().migration_progress, 1.0)
+
+        # Lookups see both tables while migrating, updates of unmigrated keys are not lost
+        table["Jon"] = "Jon-new"
+        self.assertEqual(table["Eva"], "Eva-value")
+        self.assertEqual(table["Jon"], "Jon-new")
+        self.assertRaises(KeyError, lambda: table["Zed"])
+        self.assertEqual(len(table), 11)
+
+        while table.is_migrating():
+            _ = table["Joe"]
+        self.assertEqual(table.statistics().migration_progress, 1.0)
+        self.assertEqual(sorted(table.keys()), sorted(names + ["Joe"]))
+        self.assertEqual(table["Jon"], "Jon-new")
+        self.assertEqual(len(table), 11)
+
+    def test_bulk_insert(self):
+        names = "Eva, Amy, Tim, Ron, Jan, Kim, Dot, Ann, Jim, Jon, Joe, Eva, Zoe".split(", ")
+        one_at_a_time = LinearProbeTable(10, tablesize_override=FIX_TABLESIZE)
+        for name in names:
+            one_at_a_time[name] = name + "-value"
+
+        bulk = LinearProbeTable(10, tablesize_override=FIX_TABLESIZE)
+        bulk.bulk_insert(names, [name + "-value" for name in names])
+
+        # Same positions and statistics as inserting one at a time, including the rehash
+        self.assertEqual(bulk.statistics(), one_at_a_time.statistics())
+        self.assertEqual(list(bulk.table), list(one_at_a_time.table))
+        self.assertEqual(bulk.bulk_hash(names), [bulk.hash(name) for name in names])
+        self.assertEqual(len(bulk), 12)
+
+        table = LinearProbeTable.from_iterable((name, len(name)) for name in names)
+        self.assertEqual(table["Zoe"], 3)
+        self.assertRaises(ValueError, lambda: bulk.bulk_insert(["Ada"], []))
+
+    def test_bulk_insert_replaced_hash(self):
+        table = LinearProbeTable(10, tablesize_override=FIX_TABLESIZE)
+        table.hash = silly_hash
+        table.bulk_insert("Eva, Amy, Tim, Ron, Jan, Kim, Dot, Ann, Jim, Jon".split(", "), range(10))
+        self.assertEqual(table.statistics(), (4, 8, 3, 0))
+
+    def test_delete(self):
+        table = LinearProbeTable(10, tablesize_override=FIX_TABLESIZE)
+        table.hash = silly_hash
+        for name in "Eva, Amy, Tim, Ron, Jan, Kim, Dot, Ann, Jim, Jon".split(", "):
+            table[name] = name + "-value"
+
+        # Jan is in the middle of the J cluster, Jim and Jon must still be found through its tombstone
+        del table["Jan"]
+        self.assertEqual(len(table), 9)
+        self.assertRaises(KeyError, lambda: table["Jan"])
+        self.assertEqual(table["Jon"], "Jon-value")
+        self.assertEqual(table.statistics().tombstones, 1)
+        self.assertRaises(KeyError, lambda: table.__delitem__("Jan"))
+
+        # Updating a key behind the tombstone must not duplicate it, a new key reuses the tombstone
+        table["Jon"] = "Jon-new"
+        self.assertEqual(table.statistics().tombstones, 1)
+        table["Joe"] = "Joe-value"
+        self.assertEqual(table.statistics().tombstones, 0)
+        self.assertEqual(len(table), 10)
+        self.assertEqual(sorted(table.values()), sorted(["Eva-value", "Amy-value", "Tim-value", "Ron-value", "Joe-value",
+                                                          "Kim-value", "Dot-value", "Ann-value", "Jim-value", "Jon-new"]))
+
+    def test_compaction(self):
+        table = LinearProbeTable(10, tablesize_override=FIX_TABLESIZE)
+        table.hash = silly_hash
+        names = "Eva, Amy, Tim, Ron, Jan, Kim, Dot, Ann, Jim, Jon".split(", ")
+        for name in names:
+            table[name] = name + "-value"
+        for name in names[:5]:
+            del table[name]
+
+        # The 5th tombstone goes over a quarter of the 19 slots
+        statistics = table.statistics()
+        self.assertEqual(statistics.compaction_count, 1)
+        self.assertEqual(statistics.tombstones, 0)
+        self.assertEqual(statistics[3], 0)      # compaction does not grow the table
+        self.assertEqual(len(table.table), FIX_TABLESIZE)
+        self.assertEqual(sorted(table.keys()), sorted(names[5:]))
+        for name in names[5:]:
+            self.assertEqual(table[name], name + "-value")
+
+    def test_robin_hood(self):
+        table = RobinHoodProbeTable(10, tablesize_override=FIX_TABLESIZE)
+        table.hash = silly_hash
+        for name in "Eva, Amy, Tim, Ron, Jan, Kim, Dot, Ann, Jim, Jon".split(", "):
+            table[name] = name + "-value"
+        conflict, probe_total, probe_max, rehash = table.statistics()
+        self.assertEqual(conflict, 4)     # Tim, Ann, Jim, Jon
+        self.assertEqual(probe_total, 8)  # Same walk as linear probing
+        self.assertEqual(probe_max, 2)    # Jon displaces Jim, so nobody is 3 away from home
+        self.assertEqual(rehash, 0)
+
+        self.assertEqual(table["Jon"], "Jon-value")
+        self.assertRaises(KeyError, lambda: table["Joe"])
+
+        # Backward-shift deletion moves Jim and Jon one slot closer to home
+        del table["Jan"]
+        self.assertEqual(len(table), 9)
+        self.assertRaises(KeyError, lambda: table["Jan"])
+        self.assertEqual(table["Jim"], "Jim-value")
+        self.assertEqual(table["Jon"], "Jon-value")
+        self.assertEqual(table.distances[table._linear_probe("Jim", False)], 0)
+        self.assertEqual(table.statistics().average_probe_length, 5 / 9)    # Tim: 1, Ann: 2, Kim: 1, Jon: 1
+        self.assertRaises(KeyError, lambda: table.__delitem__("Jan"))
+
+    def test_robin_hood_rehash(self):
+        table = RobinHoodProbeTable(10, tablesize_override=FIX_TABLESIZE)
+        names = ["key" + str(i) for i in range(200)]
+        table.bulk_insert(names, range(200))
+        self.assertGreater(table.statistics()[3], 0)
+        for i, name in enumerate(names):
+            self.assertEqual(table[name], i)
+        for name in names[::2]:
+            del table[name]
+        self.assertEqual(sorted(table.keys()), sorted(names[1::2]))
+
+    def test_compact_storage(self):
+        table = CompactProbeTable(10, tablesize_override=FIX_TABLESIZE)
+        names = ["key" + str(i) for i in range(100)]
+        for i, name in enumerate(names):
+            table[name] = i
+        self.assertGreater(len(table.table), FIX_TABLESIZE)
+        self.assertEqual(len(table), 100)
+        for i, name in enumerate(names):
+            self.assertEqual(table[name], i)
+        self.assertRaises(KeyError, lambda: table["key100"])
+
+        # Each slot caches the full hash of its key
+        position = table._linear_probe("key42", False)
+        self.assertEqual(table.slot_hashes[position], table.full_hash("key42"))
+        # The default full hash is the deterministic 64-bit FNV-1a, not the salted builtin hash
+        self.assertEqual(table.full_hash("key42"), make_hash_function("fnv1a")("key42", CompactProbeTable.FULL_HASH_RANGE))
+        builtin = CompactProbeTable(10, hash_function="builtin")
+        self.assertEqual(builtin.full_hash("key42"), hash("key42") & sys.maxsize)
+
+        table["key42"] = "new"
+        del table["key7"]
+        self.assertEqual(len(table), 99)
+        self.assertEqual(table["key42"], "new")
+        self.assertNotIn("key7", table)
+        self.assertEqual(sorted(table.keys()), sorted(names[:7] + names[8:]))
+
+    def test_snapshot(self):
+        names = "Eva, Amy, Tim, Ron, Jan, Kim, Dot, Ann, Jim, Jon, Joe, Zoe, Kraków".split(", ")
+        table = LinearProbeTable(11, hash_function="fnv1a")
+        for position, name in enumerate(names):
+            table[name] = (name, position)
+        del table["Ron"]
+
+        with tempfile.TemporaryDirectory() as directory:
+            path = os.path.join(directory, "table.lpt")
+            table.save(path)
+
+            loaded = LinearProbeTable.load(path, mmap=False)
+            self.assertNotIsInstance(loaded, MappedProbeTable)
+            self.assertEqual(list(loaded.table), list(table.table))
+            self.assertEqual(loaded.statistics(), table.statistics())
+            self.assertEqual(loaded.statistics().tombstones, 1)
+
+            mapped = LinearProbeTable.load(path)
+            self.assertTrue(mapped.is_mapped())
+            self.assertEqual(len(mapped), len(table))
+            self.assertEqual(mapped.statistics(), table.statistics())
+            self.assertEqual(mapped["Kraków"], ("Kraków", 12))
+            self.assertNotIn("Ron", mapped)
+            self.assertRaises(KeyError, lambda: mapped["Bob"])
+            self.assertEqual(sorted(mapped.keys()), sorted(table.keys()))
+
+            # The first modification copies the snapshot into memory
+            mapped["Bob"] = ("Bob", 13)
+            self.assertFalse(mapped.is_mapped())
+            self.assertEqual(mapped["Eva"], ("Eva", 0))
+            self.assertEqual(mapped["Bob"], ("Bob", 13))
+
+            replaced = LinearProbeTable(10, tablesize_override=FIX_TABLESIZE)
+            replaced.hash = silly_hash
+            self.assertRaises(ValueError, lambda: replaced.save(path))
+            self.assertRaises(TypeError, lambda: RobinHoodProbeTable(10).save(path))
+
+    def test_load_factor_policy(self):
+        names = ["city{0}".format(i) for i in range(200)]
+        default = LinearProbeTable(11)
+        dense = LinearProbeTable(11, max_load_factor=0.75, growth_factor=4)
+        for name in names:
+            default[name] = name
+            dense[name] = name
+        self.assertLessEqual(len(default), default.tablesize * 0.5 + 1)
+        self.assertLess(dense.statistics()[3], default.statistics()[3])
+        self.assertGreater(dense.statistics().load_factor, default.statistics().load_factor)
+
+        # Every resize is recorded
+        self.assertEqual(len(default.rehash_log), default.statistics()[3])
+        self.assertEqual([record.old_tablesize for record in default.rehash_log[1:]],
+                         [record.new_tablesize for record in default.rehash_log[:-1]])
+        self.assertTrue(all(record.reason == "grow" and record.seconds >= 0 for record in default.rehash_log))
+
+        self.assertRaises(ValueError, lambda: LinearProbeTable(11, max_load_factor=1))
+        self.assertRaises(ValueError, lambda: LinearProbeTable(11, growth_factor=1))
+        self.assertRaises(ValueError, lambda: LinearProbeTable(11, min_load_factor=0.25))
+
+    def test_reserve(self):
+        names = ["city{0}".format(i) for i in range(1000)]
+        for table_class in (LinearProbeTable, RobinHoodProbeTable, CompactProbeTable):
+            table = table_class(11)
+            table.reserve(len(names))
+            self.assertEqual(table.statistics()[3], 1)
+            self.assertEqual(table.rehash_log[0].reason, "reserve")
+            for name in names:
+                table[name] = name
+            # No rehash once the table was reserved
+            self.assertEqual(table.statistics()[3], 1)
+            table.reserve(10)
+            self.assertEqual(table.statistics()[3], 1)
+
+    def test_shrink(self):
+        names = ["city{0}".format(i) for i in range(1000)]
+        for table_class in (LinearProbeTable, RobinHoodProbeTable, CompactProbeTable):
+            table = table_class(11, min_load_factor=0.1)
+            for name in names:
+                table[name] = name
+            grown = table.tablesize
+            for name in names[10:]:
+                del table[name]
+            self.assertLess(table.tablesize, grown)
+            self.assertGreaterEqual(table.tablesize, 11)
+            self.assertIn("shrink", [record.reason for record in table.rehash_log])
+            self.assertEqual(sorted(table.keys()), sorted(names[:10]))
+
 if __name__ == '__main__':
 
     # running all the tests
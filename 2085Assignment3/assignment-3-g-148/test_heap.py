@@ -0,0 +1,136 @@
+"""
+Tests the max heaps.
+"""
+
+from heap import MaxHeap, NumericMaxHeap, IndexedMaxHeap, GrowableHeap, heapify, nlargest
+import random
+import unittest
+
+
+class TestHeap(unittest.TestCase):
+    """ Testing Max Heap functionality. """
+
+    def test_numeric_heap(self):
+        generator = random.Random(2085)
+        elements = [(generator.random(), "item{0}".format(i)) for i in range(50)]
+        heap = NumericMaxHeap(len(elements), elements)
+        reference = MaxHeap(len(elements), elements)
+        self.assertEqual(heap.count_at_least(0.5), sum(1 for key, _ in elements if key >= 0.5))
+
+        for i in range(10):
+            self.assertEqual(heap.get_max(), reference.get_max())
+            element = (generator.random(), "extra{0}".format(i))
+            heap.add(element)
+            reference.add(element)
+        while len(reference) > 0:
+            self.assertEqual(heap.get_max(), reference.get_max())
+        self.assertEqual(len(heap), 0)
+        self.assertRaises(IndexError, heap.get_max)
+
+    def test_replace_top(self):
+        generator = random.Random(2085)
+        elements = [(generator.random(), "item{0}".format(i)) for i in range(50)]
+        for heap_class in (MaxHeap, NumericMaxHeap):
+            heap = heap_class(len(elements), elements)
+            keys = sorted(key for key, _ in elements)
+            for i in range(30):
+                self.assertEqual(heap.peek_max()[0], keys[-1])
+                element = (generator.random(), "new{0}".format(i))
+                self.assertEqual(heap.replace_top(element)[0], keys.pop())
+                keys.append(element[0])
+                keys.sort()
+            self.assertEqual([heap.get_max()[0] for _ in range(len(heap))], keys[::-1])
+            self.assertRaises(IndexError, heap.peek_max)
+            self.assertRaises(IndexError, lambda: heap.replace_top((0.0, None)))
+
+    def check_positions(self, heap: IndexedMaxHeap) -> None:
+        for k in range(1, len(heap) + 1):
+            self.assertEqual(heap.position_of(heap.handles[k]), k)
+            if k > 1:
+                self.assertLessEqual(heap.keys[k], heap.keys[k // 2])
+
+    def test_indexed_heap(self):
+        generator = random.Random(2085)
+        keys = {}
+        elements = []
+        for i in range(40):
+            keys[i] = generator.random()
+            elements.append((keys[i], "item{0}".format(i)))
+        heap = IndexedMaxHeap(len(elements), elements)
+        self.check_positions(heap)
+
+        # handles follow their elements through updates and removals
+        for _ in range(100):
+            handle = generator.choice(list(keys))
+            if generator.random() < 0.2:
+                self.assertEqual(heap.remove(handle), (keys.pop(handle), "item{0}".format(handle)))
+                self.assertNotIn(handle, heap)
+                self.assertRaises(KeyError, lambda: heap.update(handle, 0.5))
+            else:
+                keys[handle] = generator.random()
+                heap.update(handle, keys[handle])
+                self.assertEqual(heap.key_of(handle), keys[handle])
+            self.check_positions(heap)
+            self.assertEqual(heap.peek_max()[0], max(keys.values()))
+
+        # removed handles are handed out again
+        handle = heap.add((2.0, "new"))
+        self.assertNotIn(handle, keys)
+        self.assertEqual(heap.top_handle(), handle)
+        self.assertEqual(heap.replace_top((-1.0, "replaced")), (2.0, "new"))
+        self.assertEqual(heap.key_of(handle), -1.0)
+        self.check_positions(heap)
+
+        previous = float("inf")
+        while len(heap) > 0:
+            key, _ = heap.get_max()
+            self.assertLessEqual(key, previous)
+            previous = key
+        self.assertRaises(IndexError, heap.peek_max)
+        self.assertRaises(IndexError, lambda: heap.replace_top((0.0, None)))
+
+    def test_growable_heap(self):
+        generator = random.Random(2085)
+        words = ["word{0}".format(generator.randrange(1000)) for _ in range(200)]
+
+        # grows past its capacity, in both orderings
+        largest, smallest = GrowableHeap(), GrowableHeap(min_heap=True)
+        for word in words:
+            largest.add(word)
+            smallest.add(word)
+        self.assertEqual([largest.get_top() for _ in range(len(largest))], sorted(words, reverse=True))
+        self.assertEqual([smallest.get_top() for _ in range(len(smallest))], sorted(words))
+        self.assertTrue(largest.is_empty())
+        self.assertRaises(IndexError, largest.get_top)
+        self.assertRaises(IndexError, largest.peek_top)
+
+        # keyed elements, bottom-up and merged
+        heap = heapify(words[:150], key=len, min_heap=True)
+        self.assertEqual(len(heap.peek_top()), min(map(len, words)))
+        merged = heap.merge(heapify(words[150:], key=len, min_heap=True))
+        self.assertEqual([len(merged.get_top()) for _ in range(len(merged))], sorted(map(len, words)))
+        self.assertEqual(len(heap), 150)
+        self.assertRaises(ValueError, lambda: heap.merge(heapify(words)))
+
+        # an element replacing itself after its key changed
+        counts = {word: generator.random() for word in set(words)}
+        heap = heapify(counts, key=counts.get)
+        for _ in range(50):
+            word = heap.peek_top()
+            counts[word] /= 2
+            heap.replace_top(word)
+            self.assertEqual(counts[heap.peek_top()], max(counts.values()))
+
+    def test_nlargest(self):
+        generator = random.Random(2085)
+        numbers = [generator.randrange(100) for _ in range(300)]
+        self.assertEqual(nlargest(10, numbers), sorted(numbers, reverse=True)[:10])
+        self.assertEqual(nlargest(10, numbers, key=lambda number: -number), sorted(numbers)[:10])
+        self.assertEqual(nlargest(500, numbers), sorted(numbers, reverse=True))
+        self.assertEqual(nlargest(0, numbers), [])
+
+
+if __name__ == '__main__':
+
+    # running all the tests
+    unittest.main()
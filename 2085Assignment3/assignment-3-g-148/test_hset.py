@@ -0,0 +1,41 @@
+"""
+    Unit test for HSet, implemented via inheritance from TestSet.
+"""
+from test_set import *
+from hset import *
+
+
+class TestHSet(TestSet):
+
+    @classmethod
+    def setUpClass(cls):
+        cls.SetType = HSet
+
+    def test_growth(self):
+        capacity = 10
+        s = self.SetType(capacity)
+        for i in range(100 * capacity):
+            s.add(i)
+        self.assertEqual(len(s), 100 * capacity)
+        self.assertTrue(all(i in s for i in range(100 * capacity)))
+        conflict, probe_total, probe_max, rehash = s.table.statistics()
+        self.assertGreater(rehash, 0)
+
+    def test_remove_missing(self):
+        s = self.SetType(5)
+        s.add("Amy")
+        self.assertRaises(KeyError, lambda: s.remove("Tim"))
+        s.remove("Amy")
+        self.assertTrue(s.is_empty())
+
+    def test_from_iterable(self):
+        s = HSet.from_iterable(["Eva", "Amy", "Eva", "Tim"], hash_function="fnv1a")
+        self.assertEqual(len(s), 3)
+        self.assertEqual(sorted(s), ["Amy", "Eva", "Tim"])
+        self.assertEqual(str(HSet.from_iterable(["Jan"])), "{'Jan'}")
+
+
+if __name__ == '__main__':
+    testtorun = TestHSet()
+    suite = unittest.TestLoader().loadTestsFromModule(testtorun)
+    unittest.TextTestRunner().run(suite)
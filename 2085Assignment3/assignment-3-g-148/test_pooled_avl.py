@@ -0,0 +1,76 @@
+"""
+Tests the AVL tree storing its nodes in a pool of parallel arrays.
+"""
+
+from pooled_avl import PooledAVLTree, NodePool
+import math
+import random
+import unittest
+
+
+class TestPooledAVL(unittest.TestCase):
+    """ Testing PooledAVLTree functionality. """
+
+    def check_node(self, tree: PooledAVLTree, index: int) -> tuple[int, int]:
+        """ Checks the order, balance, height and size of the sub-tree and returns its height and size """
+        if index == NodePool.NIL:
+            return 0, 0
+        pool = tree.pool
+        left, right = pool.left[index], pool.right[index]
+        if left != NodePool.NIL:
+            self.assertLess(pool.keys[left], pool.keys[index])
+        if right != NodePool.NIL:
+            self.assertGreater(pool.keys[right], pool.keys[index])
+        left_height, left_size = self.check_node(tree, left)
+        right_height, right_size = self.check_node(tree, right)
+        self.assertIn(right_height - left_height, (-1, 0, 1))
+        self.assertEqual(pool.height[index], max(left_height, right_height) + 1)
+        self.assertEqual(pool.size[index], left_size + right_size + 1)
+        return pool.height[index], pool.size[index]
+
+    def test_random_operations(self):
+        generator = random.Random(2085)
+        tree = PooledAVLTree()
+        expected = {}
+        for _ in range(4000):
+            key = generator.randrange(600)
+            if key in expected:
+                del tree[key]
+                del expected[key]
+            else:
+                tree[key] = str(key)
+                expected[key] = str(key)
+
+        self.check_node(tree, tree.root)
+        self.assertEqual(len(tree), len(expected))
+        self.assertEqual(len(tree.pool), len(expected))
+        self.assertEqual(list(tree), sorted(expected))
+        self.assertEqual(tree.in_order(), [expected[key] for key in sorted(expected)])
+        self.assertEqual(tree.select(3), expected[sorted(expected)[3]])
+        self.assertTrue(all(tree[key] == item for key, item in expected.items()))
+        self.assertNotIn(600, tree)
+        self.assertRaises(KeyError, lambda: tree[600])
+        self.assertRaises(ValueError, lambda: tree.__delitem__(600))
+        self.assertRaises(ValueError, lambda: tree.__setitem__(next(iter(expected)), None))
+
+    def test_pool(self):
+        tree = PooledAVLTree(capacity=4)
+        for key in range(100):
+            tree[key] = key
+        self.assertGreaterEqual(tree.pool.capacity(), 100)
+        self.assertLessEqual(tree.pool.height[tree.root], 1.44 * math.log2(102))
+
+        capacity = tree.pool.capacity()
+        for key in range(50):
+            del tree[key]
+        for key in range(100, 150):
+            tree[key] = key
+        # released nodes are reused before the pool grows
+        self.assertEqual(tree.pool.capacity(), capacity)
+        self.assertEqual(list(tree), list(range(50, 150)))
+
+
+if __name__ == '__main__':
+
+    # running all the tests
+    unittest.main()
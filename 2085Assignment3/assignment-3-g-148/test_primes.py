@@ -0,0 +1,46 @@
+"""
+Tests the prime utilities used to size the hash tables.
+"""
+
+from primes import LargestPrimeIterator, is_prime, sieve, primes_in_range, largest_prime_below, next_prime, growth_prime
+import unittest
+
+
+class TestPrimes(unittest.TestCase):
+    """ Testing the sieve, primality test and prime iterator. """
+
+    def test_is_prime(self):
+        small_primes = sieve(1000)
+        self.assertEqual([n for n in range(1001) if is_prime(n)], small_primes)
+        self.assertTrue(is_prime(1000081))
+        self.assertFalse(is_prime(1000083))         # 1000083 = 3 * 333361
+        self.assertFalse(is_prime(3215031751))      # strong pseudoprime to bases 2, 3, 5 and 7
+
+    def test_segmented_sieve(self):
+        self.assertEqual(primes_in_range(0, 30), [2, 3, 5, 7, 11, 13, 17, 19, 23, 29])
+        self.assertEqual(primes_in_range(1000, 1100), [p for p in sieve(1099) if p >= 1000])
+        self.assertEqual(primes_in_range(50, 50), [])
+
+    def test_largest_prime_below(self):
+        self.assertEqual(largest_prime_below(3), 2)
+        self.assertEqual(largest_prime_below(19), 17)
+        self.assertEqual(largest_prime_below(20), 19)
+        self.assertEqual(largest_prime_below(1000081), 1000039)
+        self.assertRaises(ValueError, lambda: largest_prime_below(2))
+
+    def test_next_prime(self):
+        self.assertEqual(next_prime(1), 2)
+        self.assertEqual(next_prime(10), 11)
+        self.assertEqual(next_prime(19), 19)
+        self.assertEqual(next_prime(1000080), 1000081)
+
+    def test_iterator(self):
+        iterator = LargestPrimeIterator(19, 2)
+        self.assertEqual([next(iterator) for _ in range(4)], [17, 31, 61, 113])
+        # growth_prime is the second prime the iterator produces
+        self.assertEqual(growth_prime(19, 2), 31)
+
+if __name__ == '__main__':
+
+    # running all the tests
+    unittest.main()
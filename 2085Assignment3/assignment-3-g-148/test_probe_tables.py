@@ -0,0 +1,114 @@
+"""
+Tests the quadratic probing, double hashing and cuckoo tables against the shared ProbeTable interface.
+"""
+
+from hash_table import ProbeTable, LinearProbeTable
+from probe_tables import QuadraticProbeTable, DoubleHashTable, CuckooTable
+import random
+import unittest
+
+FIX_TABLESIZE = 19
+NAMES = "Eva, Amy, Tim, Ron, Jan, Kim, Dot, Ann, Jim, Jon".split(", ")
+
+
+def silly_hash(key):
+    return (ord(key[0]) % FIX_TABLESIZE)
+
+
+class TestProbeTables(unittest.TestCase):
+    """ Testing the open addressing alternatives. """
+
+    TABLE_CLASSES = (LinearProbeTable, QuadraticProbeTable, DoubleHashTable, CuckooTable)
+
+    def test_quadratic_statistics(self):
+        table = QuadraticProbeTable(10, tablesize_override=FIX_TABLESIZE)
+        table.hash = silly_hash
+        for name in NAMES:
+            table[name] = name + "-value"
+        # Same conflicts as linear probing, but Ann probes slots 8, 9, 12, 17 and 5
+        self.assertEqual(table.statistics(), (4, 10, 4, 0))   # Tim: 1, Ann: 4, Jim: 2, Jon: 3
+        self.assertEqual(table["Jon"], "Jon-value")
+        self.assertEqual(table.table[(silly_hash("Jon") + 9) % FIX_TABLESIZE], ("Jon", "Jon-value"))
+
+    def test_quadratic_load_factor(self):
+        # Beyond half full, a probe sequence may not reach any free slot
+        self.assertRaises(ValueError, lambda: QuadraticProbeTable(5, max_load_factor=0.9))
+        table = QuadraticProbeTable(5, max_load_factor=0.5)
+        generator = random.Random(1)
+        expected = {}
+        for i in range(200):
+            if len(expected) > 0 and generator.random() < 0.4:
+                key = generator.choice(list(expected))
+                del table[key]
+                del expected[key]
+            else:
+                table["k{0}".format(i)] = i
+                expected["k{0}".format(i)] = i
+        self.assertEqual(len(table), len(expected))
+        for key, value in expected.items():
+            self.assertEqual(table[key], value)
+
+    def test_double_hash_statistics(self):
+        table = DoubleHashTable(10, tablesize_override=FIX_TABLESIZE)
+        table.hash = silly_hash
+        for name in NAMES:
+            table[name] = name + "-value"
+        conflict, probe_total, probe_max, rehash = table.statistics()
+        self.assertEqual(conflict, 4)
+        self.assertGreaterEqual(probe_total, 4)
+        for name in NAMES:
+            self.assertEqual(table[name], name + "-value")
+
+    def test_cuckoo(self):
+        table = CuckooTable(10)
+        for position, name in enumerate(NAMES):
+            table[name] = position
+        self.assertEqual(len(table), len(NAMES))
+        self.assertEqual(sorted(table.keys()), sorted(NAMES))
+        self.assertEqual(sorted(table.values()), list(range(len(NAMES))))
+        # A lookup only looks at the two slots of a key, so every key must be in one of them
+        for position, name in enumerate(NAMES):
+            self.assertIn(name, table)
+            self.assertEqual(table[name], position)
+        self.assertNotIn("Bob", table)
+        self.assertRaises(ValueError, lambda: CuckooTable(10, hash_function="fnv1a"))
+
+    def test_interface(self):
+        generator = random.Random(2085)
+        names = ["city{0}".format(i) for i in range(3000)]
+        for table_class in self.TABLE_CLASSES:
+            table = table_class(11)
+            self.assertIsInstance(table, ProbeTable)
+            expected = {}
+            for _ in range(6000):
+                name = names[generator.randrange(len(names))]
+                if name in expected and generator.random() < 0.4:
+                    del table[name]
+                    del expected[name]
+                else:
+                    table[name] = name.upper()
+                    expected[name] = name.upper()
+            self.assertEqual(len(table), len(expected), table_class.__name__)
+            self.assertEqual(sorted(table.keys()), sorted(expected), table_class.__name__)
+            for name in names[:500]:
+                self.assertEqual(name in table, name in expected)
+            conflict, probe_total, probe_max, rehash = table.statistics()
+            self.assertGreater(rehash, 0)
+            self.assertLessEqual(conflict, probe_total)
+            self.assertLessEqual(table.statistics().load_factor, 0.5 + 1 / table.tablesize)
+
+    def test_bulk_insert(self):
+        names = ["city{0}".format(i) for i in range(1000)]
+        for table_class in self.TABLE_CLASSES:
+            one_at_a_time = table_class(11)
+            for name in names:
+                one_at_a_time[name] = name
+            bulk = table_class.from_iterable(((name, name) for name in names), expected_size=11)
+            self.assertEqual(bulk.statistics(), one_at_a_time.statistics(), table_class.__name__)
+            self.assertEqual(sorted(bulk.keys()), sorted(names))
+
+
+if __name__ == '__main__':
+
+    # running all the tests
+    unittest.main()
@@ -0,0 +1,101 @@
+"""
+Tests the bulk operations of ArrayR and the typed numeric ArrayF.
+"""
+
+from referential_array import ArrayR, ArrayF, HAS_NUMPY
+import struct
+import unittest
+
+
+class TestArrayR(unittest.TestCase):
+    """ Testing ArrayR functionality. """
+
+    def test_init(self):
+        array = ArrayR(4)
+        self.assertEqual(len(array), 4)
+        self.assertEqual(list(array), [None] * 4)
+        self.assertRaises(ValueError, lambda: ArrayR(0))
+
+        array = ArrayR.from_iterable(x * x for x in range(5))
+        self.assertEqual(list(array), [0, 1, 4, 9, 16])
+        self.assertRaises(ValueError, lambda: ArrayR.from_iterable([]))
+
+    def test_slices(self):
+        array = ArrayR.from_iterable(range(6))
+        self.assertEqual(array[1:4], [1, 2, 3])
+        self.assertEqual(array[::2], [0, 2, 4])
+        array[1:4] = ["a", "b", "c"]
+        self.assertEqual(list(array), [0, "a", "b", "c", 4, 5])
+        # The length of a fixed size array cannot change through a slice
+        self.assertRaises(ValueError, lambda: array.__setitem__(slice(0, 2), [1]))
+
+    def test_fill_and_copy(self):
+        array = ArrayR(6)
+        array.fill(7)
+        self.assertEqual(list(array), [7] * 6)
+        array.fill(None, 2, 4)
+        self.assertEqual(list(array), [7, 7, None, None, 7, 7])
+
+        array.copy_from(["x", "y", "z"], 1, 3)
+        self.assertEqual(list(array), [7, 7, None, "y", "z", 7])
+        array.copy_from(ArrayR.from_iterable([1, 2]), 0, 0, 1)
+        self.assertEqual(array[0], 1)
+
+    def test_resize(self):
+        array = ArrayR.from_iterable([1, 2, 3])
+        array.resize(5)
+        self.assertEqual(list(array), [1, 2, 3, None, None])
+        array.resize(2)
+        self.assertEqual(list(array), [1, 2])
+        self.assertRaises(ValueError, lambda: array.resize(0))
+
+
+class TestArrayF(unittest.TestCase):
+    """ Testing ArrayF functionality. """
+
+    def test_init(self):
+        array = ArrayF(3)
+        self.assertEqual(list(array), [0.0] * 3)
+        self.assertEqual(array.typecode, "d")
+        self.assertRaises(ValueError, lambda: ArrayF(0))
+
+        array = ArrayF.from_iterable(range(4), typecode="q")
+        self.assertEqual(array[1:3], [1, 2])
+        self.assertRaises(TypeError, lambda: array.__setitem__(0, 0.5))
+        self.assertRaises(ValueError, lambda: ArrayF.from_iterable([]))
+
+    def test_slices_fill_and_copy(self):
+        array = ArrayF(6)
+        array.fill(1.5)
+        array.fill(0.0, 2, 4)
+        self.assertEqual(list(array), [1.5, 1.5, 0.0, 0.0, 1.5, 1.5])
+        array[0:2] = [2.0, 3.0]
+        self.assertEqual(array[0], 2.0)
+        self.assertRaises(ValueError, lambda: array.__setitem__(slice(0, 2), [1.0]))
+
+        array.copy_from(ArrayF.from_iterable([7.0, 8.0, 9.0]), 1, 3)
+        self.assertEqual(list(array), [2.0, 3.0, 0.0, 8.0, 9.0, 1.5])
+        array.resize(7)
+        self.assertEqual(array[6], 0.0)
+        array.resize(2)
+        self.assertEqual(list(array), [2.0, 3.0])
+
+    def test_buffer(self):
+        array = ArrayF.from_iterable([1.0, 2.0])
+        view = array.buffer()
+        self.assertEqual(view.nbytes, 16)
+        self.assertEqual(struct.unpack("<2d", view), (1.0, 2.0))
+        view[1] = 5.0
+        self.assertEqual(array[1], 5.0)
+        view.release()
+
+        if HAS_NUMPY:
+            numbers = array.to_numpy()
+            numbers *= 2
+            self.assertEqual(list(array), [2.0, 10.0])
+
+
+if __name__ == '__main__':
+
+    # running all the tests
+    unittest.main()
@@ -0,0 +1,67 @@
+"""
+Tests the sharded hash table, including concurrent access.
+"""
+
+from sharded_table import ShardedProbeTable
+from concurrent.futures import ThreadPoolExecutor
+import unittest
+
+NAMES = ["city{0}".format(i) for i in range(2000)]
+
+
+class TestShardedTable(unittest.TestCase):
+    """ Testing Sharded Hash Table functionality. """
+
+    def test_operations(self):
+        table = ShardedProbeTable(10, shard_count=4)
+        self.assertTrue(table.is_empty())
+        for position, name in enumerate(NAMES):
+            table[name] = position
+        self.assertEqual(len(table), len(NAMES))
+        self.assertEqual(table["city42"], 42)
+        self.assertNotIn("Melbourne", table)
+        self.assertEqual(sorted(table.keys()), sorted(NAMES))
+
+        # Every key lives in its own shard
+        for index, shard in enumerate(table.shards):
+            self.assertTrue(all(table.shard_of(key) == index for key in shard.keys()))
+
+        del table["city42"]
+        self.assertNotIn("city42", table)
+        self.assertRaises(KeyError, lambda: table["city42"])
+        self.assertRaises(ValueError, lambda: ShardedProbeTable(10, shard_count=0))
+
+    def test_statistics(self):
+        table = ShardedProbeTable(10, shard_count=4)
+        table.bulk_insert(NAMES, range(len(NAMES)))
+        self.assertEqual(sorted(table.values()), list(range(len(NAMES))))
+
+        conflict, probe_total, probe_max, rehash = table.statistics()
+        shard_statistics = table.shard_statistics()
+        self.assertEqual(conflict, sum(statistics[0] for statistics in shard_statistics))
+        self.assertEqual(probe_total, sum(statistics[1] for statistics in shard_statistics))
+        self.assertEqual(probe_max, max(statistics[2] for statistics in shard_statistics))
+        self.assertEqual(rehash, sum(statistics[3] for statistics in shard_statistics))
+        # The shards rehash independently
+        self.assertGreater(rehash, 0)
+        self.assertEqual(table.statistics().shard_count, 4)
+        self.assertLessEqual(table.statistics().load_factor, 0.5)
+
+    def test_threads(self):
+        table = ShardedProbeTable(10, shard_count=4)
+
+        def insert(start: int) -> None:
+            for name in NAMES[start::8]:
+                table[name] = name
+                self.assertEqual(table[name], name)
+
+        with ThreadPoolExecutor(max_workers=8) as executor:
+            list(executor.map(insert, range(8)))
+        self.assertEqual(len(table), len(NAMES))
+        self.assertTrue(all(table[name] == name for name in NAMES))
+
+
+if __name__ == '__main__':
+
+    # running all the tests
+    unittest.main()
@@ -157,6 +157,19 @@ class TestTraders(unittest.TestCase):
         # check that the deal matches
         self.assertEqual(str(rando), "<HardTrader: Mr Barnes buying [Gunpowder: 8🍗/💎] for 2.01💰>", "Deal check failed")
 
+    def test_same_mining_rate(self):
+        # Materials sharing a mining rate are all kept in the inventory
+        t = RangeTrader("Mr Barnes")
+        coal, iron, gold = Material("Coal", 2), Material("Iron", 2), Material("Gold", 5)
+        t.set_all_materials([coal, gold])
+        t.add_material(iron)
+        self.assertEqual(len(t.inventory), 3)
+        self.assertEqual(t.materials_between(0, 2), [coal, iron, gold])
+
+        t.remove_material(coal)
+        self.assertEqual(t.materials_between(0, 1), [iron, gold])
+        self.assertRaises(ValueError, lambda: t.remove_material(coal))
+
 
 if __name__ == '__main__':
     # seeding the pseudo-random generator
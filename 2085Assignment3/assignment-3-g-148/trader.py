@@ -85,7 +85,7 @@ class Trader(ABC):
         """
 
         self.name = name
-        self.inventory = AVLTree() 
+        self.inventory = AVLTree(multimap=True)  # materials can share a mining rate
         self.active_deal = None
         self.trader_type = None
  
@@ -102,19 +102,17 @@ class Trader(ABC):
         Setting all the materials into the trader's inventory
         
         :param mats: The list of materials that the trader would sell
-        :complexity: The best and worst case complexity is O(N * log(n))
-        where N is the number of materials and n is the size of the inventory
+        :complexity: The best and worst case complexity is O(N * log(N)) for sorting the materials
+        by mining rate, the balanced inventory is then built in O(N) where N is the number of materials
         """
 
-        self.inventory = AVLTree()
-        for material in mats:
-            self.add_material(material)
+        self.inventory = AVLTree.from_unsorted(((material.mining_rate, material) for material in mats), multimap=True)
     
     def add_material(self, mat: Material) -> None:
         """
         Adding the material into the trader's inventory
         
-        :param mat: The material that is added to the trader's inventory
+        :param mat: The material that is added to the trader's inventory, kept alongside any material with the same mining rate
         :complexity: The best and worst case complexity is O(log(n)) where
         n is the number of items in the inventory (AVL tree).
         """
@@ -130,7 +128,7 @@ class Trader(ABC):
         n is the number of items in the inventory (AVL tree).
         """
 
-        del self.inventory[mat.mining_rate]
+        self.inventory.remove_item(mat.mining_rate, mat)
     
     def is_currently_selling(self) -> bool:
         """
@@ -214,12 +212,11 @@ class RandomTrader(Trader):
     def generate_deal(self) -> None:
         """
         Generating the deal of the material
-        :complexity: The best and worst case complexity is O(n) where 
+        :complexity: The best and worst case complexity is O(log(n)) where 
         n is the number of items in the trader's inventory.
         """
 
-        material_list = self.inventory.range_between(0, len(self.inventory) - 1)
-        material = RandomGen.random_choice(material_list)
+        material = self.inventory.random_element(RandomGen)
         price = self.generate_price()
         self.active_deal = (material, price)
     
@@ -251,15 +248,16 @@ class RangeTrader(Trader):
     def generate_deal(self) -> None:
         """
         Generating the deal of the material
-        :complexity: The best and worst case complexity is O(n) where 
+        :complexity: The best and worst case complexity is O(log(n)) where 
         n is the number of items in the trader's inventory.
         """
 
         i = RandomGen.randint(1, len(self.inventory))
         j = RandomGen.randint(i, len(self.inventory))
 
-        material_list = self.materials_between(i - 1, j - 1) # subtract 1 from i and j as index should start from 0
-        material = RandomGen.random_choice(material_list)
+        # a random choice among the materials between i and j, without listing them
+        # subtract 1 from i as index should start from 0
+        material = self.inventory.select(i - 1 + RandomGen.randint(0, j - i))
         price = self.generate_price()
         self.active_deal = (material, price)
 
@@ -269,12 +267,12 @@ class RangeTrader(Trader):
         
         :param i: the index of the easiest to mine in the list of materials
         :param j: the index of the easiest to mine in the list of materials
-        :complexity: The best and worst case complexity is O(N) where N 
+        :complexity: The best and worst case complexity is O(log(N) + j - i) where N 
         represents the number of items in the inventory.
         :return: Gets the list of materials between the index i and j
         """
 
-        return self.inventory.range_between(i, j)
+        return list(self.inventory.range_between(i, j))
     
     @classmethod
     def random_trader(cls) -> Trader:
@@ -306,13 +304,11 @@ class HardTrader(Trader):
         """
         Generating the deal of the material
 
-        :complexity: The best and worst case complexity is O(n) 
+        :complexity: The best and worst case complexity is O(log(n)) 
         where n is the size of the inventory.
         """
 
-        material_list = self.inventory.range_between(0, len(self.inventory) - 1)
-        material = material_list[-1]
-        self.remove_material(material)
+        material = self.inventory.pop_max().item # removes the material in the same walk down
         price = self.generate_price()
         self.active_deal = (material, price)
     
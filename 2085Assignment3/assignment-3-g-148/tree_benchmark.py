@@ -0,0 +1,101 @@
+""" Memory benchmark of the AVL tree node representations
+
+For every size N, builds a tree of N shuffled integer keys with each representation and reports the
+memory the tree allocates per node (traced with tracemalloc, the keys and items themselves are
+allocated beforehand and not counted) and the time per insertion:
+
+    dict: AVLTree with nodes carrying a per-instance __dict__, as node.AVLTreeNode did before __slots__
+    slots: AVLTree with the slotted node.AVLTreeNode
+    pool: pooled_avl.PooledAVLTree, nodes are indices into parallel arrays
+
+Usage:
+    python tree_benchmark.py
+    python tree_benchmark.py --sizes 1000 100000 1000000
+"""
+
+from __future__ import annotations
+
+import argparse
+import random
+import time
+import tracemalloc
+
+from avl import AVLTree
+from pooled_avl import PooledAVLTree
+
+__author__ = 'Tan Jun Yu'
+__docformat__ = 'reStructuredText'
+
+SIZES = [10 ** 3, 10 ** 4, 10 ** 5]
+
+
+class DictAVLTreeNode:
+    """ AVL tree node without __slots__, the attributes live in a per-instance __dict__ """
+
+    def __init__(self, key, item=None) -> None:
+        self.key = key
+        self.item = item
+        self.left = None
+        self.right = None
+        self.height = 1
+        self.size = 1
+
+
+class DictAVLTree(AVLTree):
+    """ AVLTree creating DictAVLTreeNode nodes """
+
+    def create_node(self, key, item) -> DictAVLTreeNode:
+        return DictAVLTreeNode(key, item)
+
+
+REPRESENTATIONS = {"dict": DictAVLTree, "slots": AVLTree, "pool": PooledAVLTree}
+
+
+def build(tree_class: type, keys: list[int]) -> object:
+    """
+    Inserts every key, with itself as the item, into a new tree
+    :complexity: O(N log N) where N is the number of keys
+    """
+    tree = tree_class()
+    for key in keys:
+        tree[key] = key
+    return tree
+
+
+def run_benchmark(tree_class: type, size: int, seed: int = 2085) -> dict:
+    """
+    Measures the memory per node and the time per insertion of one representation
+    :returns: one row of the report
+    :complexity: O(N log N) where N is size
+    """
+    keys = list(range(size))
+    random.Random(seed).shuffle(keys)
+
+    tracemalloc.start()
+    tree = build(tree_class, keys)
+    allocated, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tree
+
+    start = time.perf_counter()
+    build(tree_class, keys)
+    seconds = time.perf_counter() - start
+    return {"bytes_per_node": allocated / size, "insert_us": seconds / size * 1e6}
+
+
+def main() -> None:
+    """ Parse the benchmark from the command line, run it and print the report. """
+    parser = argparse.ArgumentParser(description="Memory per node of the AVL tree representations.")
+    parser.add_argument("--sizes", nargs="+", type=int, default=SIZES)
+    parser.add_argument("--representations", nargs="+", choices=list(REPRESENTATIONS), default=list(REPRESENTATIONS))
+    args = parser.parse_args()
+
+    print("{0:<6} {1:>9} {2:>14} {3:>10}".format("nodes", "size", "bytes/node", "insert us"))
+    for size in args.sizes:
+        for name in args.representations:
+            row = run_benchmark(REPRESENTATIONS[name], size)
+            print("{0:<6} {1:>9} {2:>14.1f} {3:>10.2f}".format(name, size, row["bytes_per_node"], row["insert_us"]), flush=True)
+
+
+if __name__ == "__main__":
+    main()